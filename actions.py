@@ -0,0 +1,521 @@
+"""Every legal action of a player, without asking the player anything.
+
+Player.legal_actions(gp, rnd) returns a list of Action objects. Every Action
+holds all the choices the action function would ask for (the planet, what
+to pay, the new structure, the technology tile etc.), so bots and search
+can look at all the options at once instead of trying actions and catching
+BackToActionSelection.
+
+Choices that only come after the action is paid are not part of an Action:
+the order of power gains, the research track of a technology tile that
+allows any track and placing the Lost Planet.
+"""
+
+from math import ceil
+
+import constants as C
+from scoring import ExtraRange, Terraform
+from technology import AdvancedTechnology
+
+# Terraforming steps between two home types. The home types are on a wheel,
+# so it's the shortest way around it in either direction.
+TERRAFORM_STEPS = {}
+for start, home_type in enumerate(C.HOME_TYPES):
+    for target, planet_type in enumerate(C.HOME_TYPES):
+        steps = abs(start - target)
+        TERRAFORM_STEPS[home_type, planet_type] = min(
+            steps, len(C.HOME_TYPES) - steps
+        )
+
+# (credits, ore) it costs to upgrade to a structure. Upgrading to a Trading
+# Station costs 3 credits instead of 6 when there is a neighbour.
+UPGRADE_COST = {
+    "Trading Station": (6, 2),
+    "Planetary Institute": (6, 4),
+    "Research Lab": (5, 3),
+    "Academy": (6, 6),
+}
+
+# What a structure can be upgraded to.
+UPGRADES = {
+    "Mine": ["Trading Station"],
+    "Trading Station": ["Planetary Institute", "Research Lab"],
+    "Research Lab": ["Academy"],
+}
+
+# Structure: start of the names of its Faction properties.
+BUILT = {
+    "Trading Station": "trading_station",
+    "Planetary Institute": "planetary_institute",
+    "Research Lab": "research_lab",
+    "Academy": "academy",
+}
+
+# Power actions that just exchange power. Number: (power, gain).
+POWER_ACTIONS = {
+    1: (7, "knowledge3"),
+    3: (4, "ore2"),
+    4: (4, "credits7"),
+    5: (4, "knowledge2"),
+    7: (3, "powertokens2"),
+}
+
+# Power actions that give terraforming steps for a mine.
+# Number: (power, terraforming steps).
+TERRAFORM_ACTIONS = {
+    2: (5, 2),
+    6: (3, 1),
+}
+
+
+class Action:
+    """One action with every choice already made.
+
+    kind is the action from the action selection:
+        mine: target is the Planet.
+        gaia: target is the Trans-dim Planet.
+        upgrade: target is the Planet, choice is the new structure or
+            "Left" / "Right" for the side of an Academy.
+        federation: target is the Federation, choice is the
+            FederationToken.
+        research: target is the index in Research.tech_tracks.
+        pq: target is the number of the Power/Q.I.C. action (1-10), choice
+            is the Planet for a mine or the FederationToken to score again.
+        special: target is the booster, technology tile or Academy string
+            from Player.special, choice is the Planet for a booster.
+        pass: target is the booster to take or False in the last round.
+        free: target is the key in Faction.free_actions.
+
+    tile is the technology tile that comes with a Research Lab, an Academy
+    or Power/Q.I.C. action 8. For an advanced tile it's
+    (advanced tile, standard tile to cover).
+
+    cost is a list of costs in the format of Player.resolve_cost, for
+    example ["qic1", "credits2", "ore3"].
+    """
+
+    def __init__(self, kind, target=False, choice=False, tile=False,
+                 cost=()):
+        self.kind = kind
+        self.target = target
+        self.choice = choice
+        self.tile = tile
+        self.cost = list(cost)
+
+    def __str__(self):
+        parts = [self.kind]
+        for part in (self.target, self.choice):
+            if part is not False:
+                parts.append(str(part))
+        if self.tile:
+            parts.append(f"tile: {self.tile}")
+        if self.cost:
+            parts.append(f"cost: {', '.join(self.cost)}")
+        return " | ".join(parts)
+
+
+def legal_actions(player, gp, rnd):
+    """Every action the player is able to take right now.
+
+    Args:
+        player: Player object.
+        gp: GaiaProject main game object.
+        rnd: Active Round object.
+
+    Returns:
+        List of Action objects.
+    """
+
+    found = []
+    for planet, cost in mine_targets(player, gp, "mine"):
+        found.append(Action("mine", planet, cost=cost))
+    found += gaia_actions(player, gp)
+    found += upgrade_actions(player, gp)
+    found += federation_actions(player, gp)
+    found += research_actions(player, gp)
+    found += pq_actions(player, gp)
+    found += special_actions(player, gp)
+    found += pass_actions(player, gp, rnd)
+    found += free_actions(player)
+    return found
+
+
+def by_place(planet):
+    # Sets of planets don't have an order, this keeps the results the same
+    # every time.
+    return planet.sector, planet.num
+
+
+def in_reach(player, max_range):
+    """Unowned planets within a range of the empire with their distance."""
+
+    reach = player.frontier.reach
+    planets = []
+    for distance in range(1, max_range + 1):
+        for planet in reach.get(distance, ()):
+            planets.append((planet, distance))
+    planets.sort(key=lambda found: by_place(found[0]))
+    return planets
+
+
+def mine_targets(player, gp, action, terraform_steps=0, extra_range=0):
+    """Planets the player can build a mine on and what it costs.
+
+    Follows the rules of Player.mine, with the planets Player.choose_planet
+    offers for the action.
+
+    Args:
+        player: Player object.
+        gp: GaiaProject main game object.
+        action (str): Name of the action, see Universe.action_types.
+        terraform_steps (int): Free terraforming steps. When there are any,
+            a planet of the player's home type isn't allowed.
+        extra_range (int): Range on top of the navigation level.
+
+    Returns:
+        List with (Planet, cost) tuples.
+    """
+
+    faction = player.faction
+    if faction.mine_built == faction.mine_max:
+        return []
+    if faction.credits < 2 or faction.ore < 1:
+        return []
+
+    targets = []
+    types = set(gp.universe.action_types(player, action))
+
+    # A planet with a Gaiaformer of the player only costs the mine.
+    gaiaformed = gp.universe.index.query(
+        owner=faction.name,
+        structure="Gaiaformer",
+        type_=[type_ for type_ in C.MINE_TYPES if type_ in types]
+    )
+    for planet in sorted(gaiaformed, key=by_place):
+        targets.append((planet, ["credits2", "ore1"]))
+
+    # Error is corrected at runtime so i can ignore this.
+    # pylint: disable=no-member
+    available_range = player.navigation.active + extra_range
+    terraform_cost = player.terraforming.active
+    for planet, distance in in_reach(
+        player, available_range + 2 * faction.qic
+    ):
+        if planet.type not in types:
+            continue
+
+        range_qic = max(0, ceil((distance - available_range) / 2))
+        ore = 0
+        if planet.type == "Gaia":
+            # One more Q.I.C. to build on a Gaia planet.
+            qic = range_qic + 1
+        elif planet.type in C.HOME_TYPES:
+            qic = range_qic
+            steps = TERRAFORM_STEPS[faction.home_type, planet.type]
+            if terraform_steps and not steps:
+                continue
+            ore = terraform_cost * max(0, steps - terraform_steps)
+        else:
+            # Trans-dim planets need a Gaia Project first.
+            continue
+
+        if qic > faction.qic or ore + 1 > faction.ore:
+            continue
+
+        cost = []
+        if qic:
+            cost.append(f"qic{qic}")
+        cost += ["credits2", f"ore{ore + 1}"]
+        targets.append((planet, cost))
+    return targets
+
+
+def gaia_targets(player, gp, extra_range=0):
+    """Trans-dim planets the player can start a Gaia Project on.
+
+    Returns:
+        List with (Planet, cost) tuples.
+    """
+
+    faction = player.faction
+    # Error is corrected at runtime so i can ignore this.
+    # pylint: disable=no-member
+    tokens = player.gaia_project.active
+    if not faction.gaiaformer > 0 or faction.count_powertokens() < tokens:
+        return []
+
+    targets = []
+    available_range = player.navigation.active + extra_range
+    for planet, distance in in_reach(
+        player, available_range + 2 * faction.qic
+    ):
+        if planet.type != "Trans-dim":
+            continue
+
+        cost = [f"powertoken{tokens}"]
+        qic = max(0, ceil((distance - available_range) / 2))
+        if qic:
+            cost.append(f"qic{qic}")
+        targets.append((planet, cost))
+    return targets
+
+
+def gaia_actions(player, gp):
+    return [
+        Action("gaia", planet, cost=cost)
+        for planet, cost in gaia_targets(player, gp)
+    ]
+
+
+def tile_choices(player, research_board):
+    """Technology tiles the player can take.
+
+    Returns:
+        List with tiles and (advanced tile, standard tile to cover) tuples,
+        or [False] if there is no tile left to take.
+    """
+
+    choices = []
+    green = "green" in [fed.state for fed in player.federations]
+    for tile in player.technology_tiles(research_board):
+        if not isinstance(tile, AdvancedTechnology):
+            choices.append(tile)
+        elif green:
+            for covered in player.standard_technology:
+                choices.append((tile, covered))
+    return choices or [False]
+
+
+def upgrade_actions(player, gp):
+    faction = player.faction
+    planets = (
+        gp.universe.index.query(
+            owner=faction.name,
+            structure=list(UPGRADES)
+        )
+        - gp.universe.index.query(type_="Lost Planet")
+    )
+
+    found = []
+    tiles = False  # Only looked up when a tile is needed.
+    for planet in sorted(planets, key=by_place):
+        for new in UPGRADES[planet.structure]:
+            built = BUILT[new]
+            if getattr(faction, f"{built}_built") \
+                    == getattr(faction, f"{built}_max"):
+                continue
+
+            credits_, ore = UPGRADE_COST[new]
+            if new == "Trading Station" and planet.neighbours:
+                credits_ = 3
+            if faction.credits < credits_ or faction.ore < ore:
+                continue
+            cost = [f"credits{credits_}", f"ore{ore}"]
+
+            if new == "Trading Station" or new == "Planetary Institute":
+                found.append(Action("upgrade", planet, new, cost=cost))
+                continue
+
+            if not tiles:
+                tiles = tile_choices(player, gp.research_board)
+
+            choices = [new]
+            if new == "Academy":
+                # Both sides are only available for the first Academy.
+                choices = []
+                if not faction.academy_income[0]:
+                    choices.append("Left")
+                if not faction.academy_special[0]:
+                    choices.append("Right")
+
+            for choice in choices:
+                for tile in tiles:
+                    found.append(
+                        Action("upgrade", planet, choice, tile, cost)
+                    )
+    return found
+
+
+def federation_actions(player, gp):
+    options = gp.universe.federation_solver.options(player)
+    if not options:
+        return []
+
+    tokens = [token for token in gp.federation_tokens if token.count > 0]
+    return [
+        Action(
+            "federation",
+            federation,
+            token,
+            cost=[f"powertoken{len(federation.satellites)}"]
+        )
+        for federation in options
+        for token in tokens
+    ]
+
+
+def researchable(player, track_number, research_board):
+    """Whether the player can go up on a research track.
+
+    Follows the rules of TechTrack.research.
+    """
+
+    level = [
+        player.terraforming,
+        player.navigation,
+        player.a_i,
+        player.gaia_project,
+        player.economy,
+        player.science,
+    ][track_number]
+    number = int(level.name[-1])
+
+    if number == 5:
+        return False
+    if number == 4:
+        track = research_board.tech_tracks[track_number]
+        if track.level5.players:
+            return False
+        return "green" in [fed.state for fed in player.federations]
+    return True
+
+
+def research_actions(player, gp):
+    if player.faction.knowledge < 4:
+        return []
+
+    return [
+        Action("research", number, cost=["knowledge4"])
+        for number in range(len(gp.research_board.tech_tracks))
+            if researchable(player, number, gp.research_board)
+    ]
+
+
+def pq_actions(player, gp):
+    faction = player.faction
+    available = gp.research_board.pq_actions
+
+    found = []
+    for number in range(1, 11):
+        if not available[number]:
+            continue
+
+        if number in POWER_ACTIONS:
+            power, gain = POWER_ACTIONS[number]
+            if faction.bowl3 < power:
+                continue
+
+            # Resources that are already at the maximum can't be gained.
+            resource = gain.rstrip("0123456789")
+            maximum = getattr(faction, f"{resource}_max", False)
+            if maximum and getattr(faction, resource) >= maximum:
+                continue
+            found.append(Action("pq", number, cost=[f"power{power}"]))
+
+        elif number in TERRAFORM_ACTIONS:
+            power, steps = TERRAFORM_ACTIONS[number]
+            if faction.bowl3 < power:
+                continue
+
+            for planet, cost in mine_targets(
+                player, gp, "pq", terraform_steps=steps
+            ):
+                found.append(
+                    Action("pq", number, planet, cost=[f"power{power}", *cost])
+                )
+
+        elif number == 8 and faction.qic >= 4:
+            for tile in tile_choices(player, gp.research_board):
+                found.append(Action("pq", number, tile=tile, cost=["qic4"]))
+
+        elif number == 9 and faction.qic >= 3:
+            for token in player.federations:
+                found.append(Action("pq", number, token, cost=["qic3"]))
+
+        elif number == 10 and faction.qic >= 2:
+            found.append(Action("pq", number, cost=["qic2"]))
+    return found
+
+
+def special_actions(player, gp):
+    found = []
+
+    booster = player.booster
+    if booster.special and not booster.used:
+        if isinstance(booster, Terraform):
+            targets = mine_targets(
+                player, gp, "boost_terraform", terraform_steps=1
+            )
+        elif isinstance(booster, ExtraRange):
+            targets = (
+                mine_targets(player, gp, "boost_range", extra_range=3)
+                + gaia_targets(player, gp, extra_range=3)
+            )
+        else:
+            targets = []
+
+        for planet, cost in targets:
+            found.append(Action("special", booster, planet, cost=cost))
+
+    for tile in player.standard_technology + player.advanced_technology:
+        if tile.when == "special" and not tile.used:
+            found.append(Action("special", tile))
+
+    academy = player.faction.academy_special
+    if academy[0] and not academy[2]:
+        found.append(Action("special", f"Academy: {academy[1]}"))
+    return found
+
+
+def pass_actions(player, gp, rnd):
+    # Passing isn't allowed after taking free actions.
+    if player.free_actions:
+        return []
+
+    # No new booster in the last round.
+    if gp.scoring_board.rounds.index(rnd) == 5:
+        return [Action("pass")]
+
+    return [Action("pass", booster) for booster in gp.scoring_board.boosters]
+
+
+def free_actions(player):
+    """Exchanges the player can afford.
+
+    Follows the rules of Player.free.
+    """
+
+    faction = player.faction
+    found = []
+    for key, exchange in faction.free_actions.items():
+        # A function, the discard action.
+        if not isinstance(exchange, str):
+            if faction.bowl2 > 1:
+                found.append(Action("free", key))
+            continue
+
+        # Nothing can be gained when the resource is at the maximum.
+        resource = exchange.rstrip("0123456789")
+        maximum = getattr(faction, f"{resource}_max", False)
+        if maximum and getattr(faction, resource) >= maximum:
+            continue
+
+        cost = key.rstrip("_")
+        if affordable(player, cost):
+            found.append(Action("free", key, exchange, cost=[cost]))
+    return found
+
+
+def affordable(player, cost):
+    """Whether Player.resolve_cost would be able to pay a cost."""
+
+    resource = cost.rstrip("0123456789")
+    amount = int(cost[len(resource):])
+    faction = player.faction
+    if resource == "power":
+        return faction.bowl3 >= amount
+    if resource == "powertoken":
+        return faction.count_powertokens() >= amount
+    if resource == "vp":
+        return player.vp >= amount
+    return getattr(faction, resource) >= amount
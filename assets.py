@@ -0,0 +1,217 @@
+import os
+import threading
+
+
+class SurfaceCache:
+    """Images that are loaded from disk once and converted for the display.
+
+    Surfaces are kept per display format and zoom level, because a surface
+    converted for one display format can't be reused on a display with
+    another format.
+    The cached surfaces are shared, so only ever blit them and never draw on
+    them.
+
+    Example:
+        self.surfaces = {
+            ("/.../Images/Mine/Terra Mine.png", (32, (...masks...)), 1):
+                Surface
+        }
+    """
+
+    def __init__(self):
+        self.surfaces = {}
+        self.atlas = False  # atlas.Atlas object when the atlas is used.
+        self.hits = 0  # Amount of loads that were answered from the cache.
+        self.misses = 0  # Amount of loads that had to read the file.
+
+        # Images that were decoded by the preloader but not converted yet.
+        # Path: Surface. The preloader runs on its own thread, so this
+        # dictionary has a lock.
+        self.decoded = {}
+        self.lock = threading.Lock()
+
+    def display_format(self):
+        """Bits per pixel and colour masks of the current display."""
+
+        import pygame
+
+        display = pygame.display.get_surface()
+        return display.get_bitsize(), display.get_masks()
+
+    def load(self, path, zoom=1):
+        """Get the converted surface of an image.
+
+        Every zoom level of an image is scaled once and then kept, so the
+        cache holds a pyramid of sizes for every image that is used.
+
+        Args:
+            path (str): Path to the image file.
+            zoom (float): Size of the surface compared to the image.
+
+        Returns:
+            pygame Surface with per pixel alpha in the display format.
+        """
+
+        key = (os.path.abspath(path), self.display_format(), zoom)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            import pygame
+
+            self.misses += 1
+            place = self.atlas and self.atlas.find(path)
+            if zoom != 1:
+                original = self.load(path)
+                width, height = original.get_size()
+                surface = pygame.transform.smoothscale(
+                    original, (round(width * zoom), round(height * zoom))
+                )
+            elif place:
+                # Cut the image out of its atlas page.
+                page, rect = place
+                surface = self.load(page).subsurface(rect)
+            else:
+                with self.lock:
+                    decoded = self.decoded.pop(key[0], None)
+                if decoded is None:
+                    decoded = pygame.image.load(path)
+                surface = decoded.convert_alpha()
+            self.surfaces[key] = surface
+        else:
+            self.hits += 1
+        return surface
+
+    def decode(self, path):
+        """Read and decode an image ahead of time. Safe to use on any thread.
+
+        Converting the image for the display is left to load, which only
+        runs on the main thread.
+
+        Args:
+            path (str): Path to the image file.
+        """
+
+        import pygame
+
+        # Images in the atlas come out of their page.
+        place = self.atlas and self.atlas.find(path)
+        if place:
+            path = place[0]
+
+        path = os.path.abspath(path)
+        with self.lock:
+            if path in self.decoded:
+                return
+
+        decoded = pygame.image.load(path)
+        with self.lock:
+            self.decoded[path] = decoded
+
+    def forget(self, path):
+        """Drop an image from the cache, for example after it was rewritten.
+
+        Args:
+            path (str): Path to the image file.
+        """
+
+        path = os.path.abspath(path)
+        for key in [key for key in self.surfaces if key[0] == path]:
+            del self.surfaces[key]
+        with self.lock:
+            self.decoded.pop(path, None)
+
+    def stats(self):
+        """Dictionary with the hits, misses and amount of cached surfaces."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self.surfaces),
+        }
+
+
+class ImageCache:
+    """PIL images that are decoded once and kept for the rest of the game.
+
+    Used to compose images like the setup overview. The setup is saved on a
+    background thread, so the cache has a lock. The cached images are
+    shared, so only ever paste them and never change them.
+
+    Example:
+        self.images = {"/.../Images/BOOnavpwr.png": Image}
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.atlas = False  # atlas.Atlas object when the atlas is used.
+        self.lock = threading.Lock()
+        self.hits = 0  # Amount of loads that were answered from the cache.
+        self.misses = 0  # Amount of loads that had to read the file.
+
+    def load(self, path):
+        """Get the decoded image.
+
+        Args:
+            path (str): Path to the image file.
+
+        Returns:
+            PIL Image.
+        """
+
+        path = os.path.abspath(path)
+        with self.lock:
+            image = self.images.get(path)
+            if image is not None:
+                self.hits += 1
+                return image
+
+        # Decoding happens outside the lock. If two threads decode the same
+        # image at once, the second one just replaces the first.
+        place = self.atlas and self.atlas.find(path)
+        if place:
+            # Cut the image out of its atlas page.
+            page, (x, y, width, height) = place
+            image = self.load(page).crop((x, y, x + width, y + height))
+        else:
+            from PIL import Image
+
+            with Image.open(path) as opened:
+                image = opened.copy()
+
+        with self.lock:
+            self.misses += 1
+            self.images[path] = image
+        return image
+
+
+def write_atomic(path, save, *args):
+    """Save a file under a temporary name and then rename it.
+
+    Nobody ever sees half a file that way, even when more than one process
+    writes the same file.
+
+    Args:
+        path (str): Final path of the file.
+        save: Function that saves to the path it gets as first argument.
+        args: Other arguments for save.
+    """
+
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    save(temporary, *args)
+    os.replace(temporary, path)
+
+
+def use_atlas(atlas):
+    """Let both caches cut images out of the atlas pages.
+
+    Args:
+        atlas: atlas.Atlas object.
+    """
+
+    surfaces.atlas = atlas
+    images.atlas = atlas
+
+
+# The caches used by the whole game. pygame and PIL are only imported when
+# something is loaded, so a headless game never imports pygame.
+surfaces = SurfaceCache()
+images = ImageCache()
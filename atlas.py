@@ -0,0 +1,208 @@
+"""Pack the images of the game into a few big atlas images.
+
+Run this file after changing anything in Images/:
+
+    python atlas.py
+
+That writes the atlas pages and an index to atlas/. When the index exists,
+assets.surfaces and assets.images cut the images out of the pages instead of
+opening every image file on its own.
+"""
+
+import json
+import os
+
+import assets
+
+ROOT = os.path.dirname(__file__)
+IMAGES = os.path.join(ROOT, "images")
+ATLAS_DIR = os.path.join(ROOT, "atlas")
+INDEX = "index.json"
+
+# Width and maximum height of an atlas page in pixels.
+PAGE_SIZE = 2048
+
+# Empty pixels around every image so scaling a page never mixes neighbours.
+PADDING = 1
+
+# Folders with images that the game never loads.
+SKIP = ["Github Images", "Raw renders"]
+
+
+def find_images(images_dir=IMAGES):
+    """Find all images the game can load.
+
+    Returns:
+        Sorted list with the paths relative to images_dir, with / between the
+        folders on every platform.
+    """
+
+    found = []
+    for folder, folders, files in os.walk(images_dir):
+        folders[:] = [name for name in folders if name not in SKIP]
+        for name in files:
+            if name.lower().endswith(".png"):
+                path = os.path.relpath(os.path.join(folder, name), images_dir)
+                found.append(path.replace(os.sep, "/"))
+    return sorted(found)
+
+
+def pack(sizes, page_size=PAGE_SIZE):
+    """Place rectangles on pages in rows (shelves).
+
+    The highest rectangles go first, so every row wastes little height.
+
+    Args:
+        sizes (dict): Name: (width, height).
+        page_size (int): Width and maximum height of a page.
+
+    Returns:
+        (places, pages) where places is a dictionary with
+        name: (page, x, y) and pages is a list with the (width, height) every
+        page needs.
+    """
+
+    places = {}
+    pages = []
+    page = -1
+    x = y = row_height = page_size  # Forces a new page for the first one.
+
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], name))
+    for name in order:
+        width, height = sizes[name]
+        width += 2 * PADDING
+        height += 2 * PADDING
+        if width > page_size or height > page_size:
+            raise ValueError(f"{name} doesn't fit on an atlas page.")
+
+        # Next row.
+        if x + width > page_size:
+            x = 0
+            y += row_height
+            row_height = 0
+
+        # Next page.
+        if y + height > page_size:
+            page += 1
+            pages.append((0, 0))
+            x = y = row_height = 0
+
+        places[name] = (page, x + PADDING, y + PADDING)
+        row_height = max(row_height, height)
+        x += width
+        pages[page] = (
+            max(pages[page][0], x),
+            max(pages[page][1], y + row_height),
+        )
+
+    return places, pages
+
+
+def build(images_dir=IMAGES, atlas_dir=ATLAS_DIR, page_size=PAGE_SIZE):
+    """Build the atlas pages and the index.
+
+    Returns:
+        The index that was written. See Atlas for what's in it.
+    """
+
+    from PIL import Image
+
+    names = find_images(images_dir)
+    images = {}
+    for name in names:
+        with Image.open(os.path.join(images_dir, name)) as image:
+            images[name] = image.convert("RGBA")
+
+    places, sizes = pack(
+        {name: image.size for name, image in images.items()}, page_size
+    )
+
+    os.makedirs(atlas_dir, exist_ok=True)
+    pages = []
+    for page, size in enumerate(sizes):
+        canvas = Image.new("RGBA", size, (0, 0, 0, 0))
+        for name, (on_page, x, y) in places.items():
+            if on_page == page:
+                canvas.paste(images[name], (x, y))
+
+        file_name = f"atlas_{page}.png"
+        assets.write_atomic(os.path.join(atlas_dir, file_name), canvas.save, "png")
+        pages.append(file_name)
+
+    index = {
+        "pages": pages,
+        "images": {
+            name: [page, x, y, *images[name].size]
+            for name, (page, x, y) in sorted(places.items())
+        },
+    }
+
+    # The index goes last, so it never points to pages that aren't there.
+    def save_index(path):
+        with open(path, "w") as file:
+            json.dump(index, file, indent=1)
+
+    assets.write_atomic(os.path.join(atlas_dir, INDEX), save_index)
+    return index
+
+
+class Atlas:
+    """Index of the images in the atlas pages.
+
+    The index file looks like this:
+        {
+            "pages": ["atlas_0.png", "atlas_1.png"],
+            "images": {"Mine/Terra Mine.png": [page, x, y, width, height]}
+        }
+    """
+
+    def __init__(self, atlas_dir=ATLAS_DIR, images_dir=IMAGES):
+        with open(os.path.join(atlas_dir, INDEX)) as file:
+            index = json.load(file)
+
+        # Paths of the atlas pages.
+        self.pages = [
+            os.path.join(atlas_dir, page) for page in index["pages"]
+        ]
+
+        # Real path of every image: (page path, (x, y, width, height)).
+        self.images = {}
+        for name, (page, x, y, width, height) in index["images"].items():
+            path = self.key(os.path.join(images_dir, name))
+            self.images[path] = (self.pages[page], (x, y, width, height))
+
+    def key(self, path):
+        return os.path.normcase(os.path.realpath(path))
+
+    def find(self, path):
+        """Where an image is in the atlas.
+
+        Args:
+            path (str): Path to the original image file.
+
+        Returns:
+            (page path, (x, y, width, height)) or False if the image isn't
+            in the atlas.
+        """
+
+        return self.images.get(self.key(path), False)
+
+
+def load(atlas_dir=ATLAS_DIR, images_dir=IMAGES):
+    """Read the atlas index.
+
+    Returns:
+        Atlas object or False if the atlas wasn't built.
+    """
+
+    if not os.path.exists(os.path.join(atlas_dir, INDEX)):
+        return False
+    return Atlas(atlas_dir, images_dir)
+
+
+if __name__ == "__main__":
+    index = build()
+    print(
+        f"Packed {len(index['images'])} images into "
+        f"{len(index['pages'])} atlas pages in {ATLAS_DIR}."
+    )
@@ -1,7 +1,9 @@
 import itertools
 import random
 
+import constants as C
 import exceptions as e
+from journal import Journaled
 
 
 class Card:
@@ -20,7 +22,7 @@ class Card:
             f"booster: {self.booster} | vp: {self.vp}"
         )
 
-class Automa:
+class Automa(Journaled):
 
     def __init__(self, faction, difficulty):
         self.faction = select_faction(faction.lower())()
@@ -33,6 +35,10 @@ class Automa:
 
         self.empire = []  # List of owned planets
 
+        # Unowned planets within reach of the empire. This property is set
+        # during setup.
+        self.frontier = False
+
         # Only matters for the “Most Satellites” final scoring tile.
         self.satellites = 0
 
@@ -255,11 +261,10 @@ class Automa:
 
         # Automa places a mine on a home type that is closest to the center
         # space of the board.
-        valid_options = [
-            planet for planet in gp.universe.planets.values()
-                if planet.type == self.faction.home_type
-                    and planet not in self.empire
-        ]
+        valid_options = list(
+            gp.universe.index.query(type_=self.faction.home_type)
+            - gp.universe.index.query(owner=self.faction.name)
+        )
 
         # Figure out what the shortest distance to the center is of all
         # valid options.
@@ -302,17 +307,9 @@ class Automa:
             all_cards = self.current_deck + self.remaining_deck
             random_card = random.choice(all_cards)
 
-            if random_card.support[2] == "left":
-                reverse = True
-            else:
-                reverse = False
-
-            for _, selection_planet in sorted(
-                gp.universe.planets.items(), reverse=reverse
-            ):
-                if selection_planet in valid_options:
-                    planet = selection_planet
-                    break
+            planet = gp.universe.directional_selection(
+                valid_options, random_card.support[2]
+            )
         else:
             planet = valid_options[0]
 
@@ -322,7 +319,7 @@ class Automa:
         )
 
         gp.universe.place_structure(
-            gp.screen, planet, self.faction.home_type, "Mine"
+            gp.renderer, planet, self.faction.home_type, "Mine"
         )
 
         planet.owner = self.faction.name
@@ -574,18 +571,9 @@ class Automa:
         if len(valid_options) > 1:
             # 3e. Directional selection.
             direction = self.support_card.support[2]
-
-            if direction == 'left':
-                reverse = True
-            else:
-                reverse = False
-
-            for _, selection_planet in sorted(
-                gp.universe.planets.items(), reverse=reverse
-            ):
-                if selection_planet in valid_options:
-                    valid_options = [selection_planet]
-                    break
+            valid_options = [
+                gp.universe.directional_selection(valid_options, direction)
+            ]
 
         planet = valid_options[0]
 
@@ -596,7 +584,7 @@ class Automa:
         )
 
         gp.universe.place_structure(
-            gp.screen, planet, self.faction.home_type, "Mine"
+            gp.renderer, planet, self.faction.home_type, "Mine"
         )
 
         planet.owner = self.faction.name
@@ -620,127 +608,7 @@ class Automa:
             A list with all the found planets.
         """
 
-        valid_options = []
-        for planet in self.empire:
-            start_x = planet.location[0]
-            start_y = planet.location[1]
-            coords_to_check = self.coords_to_check(
-                start_x, start_y, max_range
-            )
-
-            for location in coords_to_check:
-                # Coordinate is a Space or is outside of the universe.
-                if not location in gp.universe.planets:
-                    continue
-
-                planet = gp.universe.planets[location]
-
-                # Already found planet.
-                if planet in valid_options:
-                    continue
-
-                # Planet is already owned.
-                if planet.owner:
-                    continue
-                else:
-                    valid_options.append(planet)
-
-        return valid_options
-
-    def coords_to_check(self, start_x, start_y, max_range):
-        """
-        Provide a list of coordinates that need to be checked
-        with a given range.
-
-        Args:
-            start_x (int): x coord of Planet
-            start_y (int): y coord of Planet
-            max_range (int): Maximum distance the Automa can go.
-
-        """
-        # Coordinates to check.
-        range2 = [
-            # First ring.
-            (start_x, start_y - 2),
-            (start_x - 1, start_y - 1),
-            (start_x - 1, start_y + 1),
-            (start_x, start_y + 2),
-            (start_x + 1, start_y + 1),
-            (start_x + 1, start_y - 1),
-
-            # Second ring.
-            (start_x, start_y - 4),
-            (start_x - 1, start_y - 3),
-            (start_x - 2, start_y - 2),
-            (start_x - 2, start_y),
-            (start_x - 2, start_y + 2),
-            (start_x - 1, start_y + 3),
-            (start_x, start_y + 4),
-            (start_x + 1, start_y + 3),
-            (start_x + 2, start_y + 2),
-            (start_x + 2, start_y),
-            (start_x + 2, start_y - 2),
-            (start_x + 1, start_y - 3),
-        ]
-
-        range3 = [
-            # Third ring.
-            (start_x, start_y - 6),
-            (start_x - 1, start_y - 5),
-            (start_x - 2, start_y - 4),
-            (start_x - 3, start_y - 3),
-            (start_x - 3, start_y - 1),
-            (start_x - 3, start_y + 1),
-            (start_x - 3, start_y + 3),
-            (start_x - 2, start_y + 4),
-            (start_x - 1, start_y + 5),
-            (start_x, start_y + 6),
-            (start_x + 1, start_y + 5),
-            (start_x + 2, start_y + 4),
-            (start_x + 3, start_y + 3),
-            (start_x + 3, start_y + 1),
-            (start_x + 3, start_y - 1),
-            (start_x + 3, start_y - 3),
-            (start_x + 2, start_y - 4),
-            (start_x + 1, start_y - 5),
-        ]
-
-        range4 = [
-            # Fourth ring.
-            (start_x, start_y - 8),
-            (start_x - 1, start_y - 7),
-            (start_x - 2, start_y - 6),
-            (start_x - 3, start_y - 5),
-            (start_x - 4, start_y - 4),
-            (start_x - 4, start_y - 2),
-            (start_x - 4, start_y),
-            (start_x - 4, start_y + 2),
-            (start_x - 4, start_y + 4),
-            (start_x - 3, start_y + 5),
-            (start_x - 2, start_y + 6),
-            (start_x - 1, start_y + 7),
-            (start_x, start_y + 8),
-            (start_x + 1, start_y + 7),
-            (start_x + 2, start_y + 6),
-            (start_x + 3, start_y + 5),
-            (start_x + 4, start_y + 4),
-            (start_x + 4, start_y + 2),
-            (start_x + 4, start_y),
-            (start_x + 4, start_y - 2),
-            (start_x + 4, start_y - 4),
-            (start_x + 3, start_y - 5),
-            (start_x + 2, start_y - 6),
-            (start_x + 1, start_y - 7),
-        ]
-
-        if max_range == 2:
-            coords_to_check = range2
-        elif max_range == 3:
-            coords_to_check = range2 + range3
-        else:
-            coords_to_check = range2 + range3 + range4
-
-        return coords_to_check
+        return self.frontier.within(max_range)
 
     def gaia(self, gp):
         # Automa can't do a Gaia Project action.
@@ -846,18 +714,9 @@ class Automa:
             # b. Directional selection tiebreaker.
             else:
                 direction = self.support_card.support[2]
-
-                if direction == 'left':
-                    reverse = True
-                else:
-                    reverse = False
-
-                for _, selection_planet in sorted(
-                    gp.universe.planets.items(), reverse=reverse
-                ):
-                    if selection_planet in closest_planets:
-                        planet = selection_planet
-                        break
+                planet = gp.universe.directional_selection(
+                    closest_planets, direction
+                )
 
         a_an = "a"
         if structure_upgrade == "Academy":
@@ -868,7 +727,7 @@ class Automa:
         )
 
         gp.universe.place_structure(
-            gp.screen,
+            gp.renderer,
             planet,
             self.faction.home_type,
             structure_upgrade
@@ -890,32 +749,21 @@ class Automa:
             All the planets that are closest to the opponent.
         """
 
-        closest_distance = 43  # Abitrarily high so found distance is lower.
         for opponent in gp.players:
             if opponent is self:
                 continue
 
-            # Check all valid_options. Reset the closest_planets list if a
-            # planet is found that is closer than the current closest and
-            # append to the list if the distance is the same as the current
-            # closest planet.
-            for planet in valid_options:
-                for opponent_planet in opponent.empire:
-                    startx = planet.location[0]
-                    starty = planet.location[1]
-
-                    targetx = opponent_planet.location[0]
-                    targety = opponent_planet.location[1]
-
-                    distance = gp.universe.distance(
-                        startx, starty, targetx, targety
-                    )
-                    if distance < closest_distance:
-                        closest_distance = distance
-                        closest_planets = [planet]
-                    elif distance == closest_distance:
-                        closest_planets.append(planet)
-
+            # The distance field of the opponent's frontier knows the distance
+            # of every planet to the opponent's closest planet.
+            distances = [
+                opponent.frontier.distance(planet) for planet in valid_options
+            ]
+            closest_distance = min(distances)
+
+            closest_planets = [
+                planet for planet, distance in zip(valid_options, distances)
+                    if distance == closest_distance
+            ]
             return closest_planets
 
     def federation(self):
@@ -948,12 +796,7 @@ class Automa:
 
             # First filter out the tracks that the automa can't go up on
             # because those will be skipped.
-
-            # If there is still an advanced technology tile and if the
-            # opponent or the Automa is not on level 5, the Automa can go up
-            # this track.
-            if research_track.advanced \
-                    or not research_track.level5.players:
+            if self.can_research(research_track):
 
                 # If the track is currently the highest up, reset the list.
                 if int(current_level_num) > highest_level_num:
@@ -982,69 +825,80 @@ class Automa:
                     highest_track = [track]
                     break
 
-        chosen_track = highest_track[0]
-
-        # Alter the chosen_track name to be in the same format as the automa
-        # research level variable format.
-        chosen_track_name = chosen_track.name.lower().replace(' ', '_')
-
-        # Remove automa from the current level's list of players.
-        current_level = eval(f"self.{chosen_track_name}")
-        current_level.remove(self.faction.name)
-
-        # Add the Automa to the next level on the level's list of players.
-        exec(
-            f"chosen_track.level{highest_level_num + 1}.add(self.faction.name)"
-        )
+        if not highest_track:
+            print("\nThe Automa can't go up on any research track.")
+            return
 
-        # Add the level to the Automa object's corresponding research
-        # property.
-        exec(
-            f"self.{chosen_track_name} "
-            f"= chosen_track.level{highest_level_num + 1}")
+        chosen_track = highest_track[0]
+        self.research_track(chosen_track, highest_level_num + 1)
 
         print(research_board)
-        print(f"Automa has researched {track.name}.")
+        print(f"Automa has researched {chosen_track.name}.")
 
     def random_research(self, research_board):
         direction = self.support_card.support[3][:-1]
         amount = int(self.support_card.support[3][-1])
 
-        research_tracks = research_board.tech_tracks
+        # A copy, reversing the board's own list would mix up the track
+        # numbers for everyone. Tracks the Automa can't go up on are skipped.
+        research_tracks = [
+            track for track in research_board.tech_tracks
+            if self.can_research(track)
+        ]
+        if not research_tracks:
+            print("\nThe Automa can't go up on any research track.")
+            return
 
         if direction == "left":
             research_tracks.reverse()
 
-        for i, track in enumerate(research_tracks, start=1):
+        # Keep cycling the tracks until the Numbered Selection number is
+        # reached.
+        for i, track in enumerate(itertools.cycle(research_tracks), start=1):
             if i == amount:
                 chosen_track = track
                 break
 
-        # Alter the chosen_track name to be in the same format as the automa
-        # research level variable format.
-        chosen_track_name = chosen_track.name.lower().replace(' ', '_')
+        current_level = getattr(self, C.TRACK_ATTRIBUTES[chosen_track.name])
+        self.research_track(chosen_track, int(current_level.name[-1]) + 1)
 
-        if chosen_track_name == "artificial_intelligence":
-            chosen_track_name = "a_i"
+        print(research_board)
+        print(f"Automa has researched {chosen_track.name}.")
 
-        # Remove automa from the current level's list of players.
-        current_level = eval(f"self.{chosen_track_name}")
-        current_level.remove(self.faction.name)
+    def can_research(self, track):
+        """Check if the Automa can go up on a research track.
 
-        # Add the Automa to the next level on the level's list of players.
-        exec(
-            f"chosen_track.level{int(current_level.name[-1]) + 1}"
-            ".add(self.faction.name)"
-        )
+        Args:
+            track: TechTrack object.
 
-        # Add the level to the Automa object's corresponding research
-        # property.
-        exec(
-            f"self.{chosen_track_name} "
-            f"= chosen_track.level{int(current_level.name[-1]) + 1}")
+        Returns:
+            True if the Automa isn't at the top yet and level 5 is still free
+            when it's going there.
+        """
 
-        print(research_board)
-        print(f"Automa has researched {track.name}.")
+        level_num = int(getattr(self, C.TRACK_ATTRIBUTES[track.name]).name[-1])
+        if level_num == 5:
+            return False
+        return level_num < 4 or not track.level5.players
+
+    def research_track(self, track, level_num):
+        """Move the Automa up to a level of a research track.
+
+        Args:
+            track: TechTrack object the Automa goes up on.
+            level_num (int): Number of the level the Automa goes to.
+        """
+
+        attribute = C.TRACK_ATTRIBUTES[track.name]
+
+        # Remove automa from the current level's list of players.
+        getattr(self, attribute).remove(self.faction.name)
+
+        # Add the Automa to the next level on the level's list of players and
+        # to the Automa object's corresponding research property.
+        next_level = getattr(track, f"level{level_num}")
+        next_level.add(self.faction.name)
+        setattr(self, attribute, next_level)
 
     def pq(self, research_board):
         # Check if there are any Power/Q.I.C. actions still open
@@ -1216,7 +1070,7 @@ class Automa:
         pass
 
 
-class Faction:
+class Faction(Journaled):
     """Class for all faction specific parameters.
 
     For subclasses to override everything that differs.
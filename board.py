@@ -0,0 +1,182 @@
+import numpy as np
+
+import constants as C
+
+# Every field is stored as a number. These lists turn the numbers back into
+# the values the rest of the game uses.
+TYPES = C.PLANETS + ["Lost Planet", "Space"]
+STRUCTURES = [
+    False,
+    "Mine",
+    "Trading Station",
+    "Research Lab",
+    "Academy",
+    "Planetary Institute",
+    "Gaiaformer",
+]
+
+NO_OWNER = 0
+NO_STRUCTURE = 0
+GAIAFORMER = STRUCTURES.index("Gaiaformer")
+GAIA = TYPES.index("Gaia")
+
+
+class Board:
+    """The universe as a structure of arrays.
+
+    Every hex of the universe has a cell number, which is the same number as
+    in Universe.hex_index. self.type[cell], self.owner[cell] etc. hold the
+    value of the hex as a number. Planet objects that are attached to the
+    board don't store their owner, type, structure and federation
+    themselves, they read and write them here (see universe.Stored). That
+    way questions about the whole board can be answered with array
+    operations instead of loops over Planet objects.
+
+    Example:
+        self.type = array([0, 8, 9, 9, ...])  # Terra, Trans-dim, Space...
+        self.owner = array([0, 1, 0, 0, ...])  # self.owners[1] owns cell 1.
+    """
+
+    def __init__(self, universe):
+        """Create the arrays and attach all the planets of the universe.
+
+        Args:
+            universe: Universe object. Its distance table has to be built
+                already.
+        """
+
+        size = len(universe.hex_locations)
+        self.hex_index = universe.hex_index
+
+        self.type = np.full(size, TYPES.index("Space"), dtype=np.int8)
+        self.owner = np.zeros(size, dtype=np.int8)
+        self.structure = np.zeros(size, dtype=np.int8)
+        self.sector = np.zeros(size, dtype=np.int8)
+        self.federation = np.zeros(size, dtype=bool)
+        self.x = np.array(
+            [x for x, _ in universe.hex_locations], dtype=np.int16
+        )
+        self.y = np.array(
+            [y for _, y in universe.hex_locations], dtype=np.int16
+        )
+
+        # Faction names that own something. The number of a faction is its
+        # place in this list.
+        self.owners = [False]
+
+        # Planet object on every cell or None for a Space.
+        self.planets = [None] * size
+
+        for sector in universe.sectors.values():
+            for circle in sector.hexes:
+                for hex_ in circle:
+                    self.sector[self.hex_index[hex_.location]] = sector.number
+
+        for planet in universe.planet_list:
+            self.attach(planet)
+
+    def attach(self, planet):
+        """Move the fields of a planet into the arrays.
+
+        Args:
+            planet: Planet or LostPlanet object.
+        """
+
+        cell = self.hex_index[planet.location]
+        self.planets[cell] = planet
+        for field in ["type", "owner", "structure", "federation"]:
+            self.set(cell, field, getattr(planet, field))
+
+        planet.cell = cell
+        planet.board = self
+
+    def owner_code(self, owner):
+        """Number of a faction. A new faction gets the next number."""
+
+        if owner not in self.owners:
+            self.owners.append(owner)
+        return self.owners.index(owner)
+
+    def get(self, cell, field):
+        """Value of a field of a cell the way the Planet object has it."""
+
+        return self.decode(field, getattr(self, field)[cell])
+
+    def decode(self, field, code):
+        """Turn the number of a field back into the value."""
+
+        if field == "type":
+            return TYPES[code]
+        elif field == "owner":
+            return self.owners[code]
+        elif field == "structure":
+            return STRUCTURES[code]
+        return bool(code)
+
+    def set(self, cell, field, value):
+        """Store the value of a field of a cell as a number."""
+
+        if field == "type":
+            code = TYPES.index(value)
+        elif field == "owner":
+            code = self.owner_code(value)
+        elif field == "structure":
+            code = STRUCTURES.index(value)
+        else:
+            code = bool(value)
+        getattr(self, field)[cell] = code
+
+    def structures_of(self, owner):
+        """Mask of the cells with a structure of a faction.
+
+        A Gaiaformer isn't a structure.
+        """
+
+        if owner not in self.owners:
+            return np.zeros(len(self.type), dtype=bool)
+        return (
+            (self.owner == self.owners.index(owner))
+            & (self.structure != NO_STRUCTURE)
+            & (self.structure != GAIAFORMER)
+        )
+
+    def end_scoring(self, owner):
+        """Amounts used by the end scoring tiles for a faction.
+
+        Returns:
+            Dictionary with structures, planet_types, gaia_planets and
+            sectors.
+        """
+
+        mask = self.structures_of(owner)
+        return {
+            "structures": int(mask.sum()),
+            "planet_types": len(np.unique(self.type[mask])),
+            "gaia_planets": int((mask & (self.type == GAIA)).sum()),
+            "sectors": len(np.unique(self.sector[mask])),
+        }
+
+    def valid_planets(self, owner, sector, types, free=True):
+        """Planets of certain types in a sector.
+
+        Args:
+            owner (str): Faction name of the player looking for planets.
+            sector (int): Number of the sector.
+            types (list): Allowed planet types.
+            free (bool): Only planets without an owner, or with a Gaiaformer
+                of the player on it.
+
+        Returns:
+            List of Planet objects.
+        """
+
+        type_codes = [TYPES.index(type_) for type_ in types]
+        mask = (self.sector == sector) & np.isin(self.type, type_codes)
+        if free:
+            own_gaiaformer = (self.structure == GAIAFORMER)
+            if owner in self.owners:
+                own_gaiaformer &= self.owner == self.owners.index(owner)
+            else:
+                own_gaiaformer[:] = False
+            mask &= (self.owner == NO_OWNER) | own_gaiaformer
+        return [self.planets[cell] for cell in np.flatnonzero(mask)]
@@ -1,4 +1,112 @@
-SECTORS_2P = ["1", "2", "3", "4", "5", "6", "7"]
+# Planets on the front side of every sector tile. Hex number: planet type.
+# See Sector for the way the hexes are numbered.
+SECTORS = {
+    1: {
+        4: "Desert",
+        5: "Swamp",
+        11: "Terra",
+        16: "Trans-dim",
+        17: "Oxide",
+        18: "Volcanic"
+    },
+    2: {
+        2: "Volcanic",
+        3: "Titanium",
+        9: "Swamp",
+        11: "Ice",
+        13: "Oxide",
+        16: "Desert",
+        18: "Trans-dim"
+    },
+    3: {
+        3: "Trans-dim",
+        5: "Gaia",
+        13: "Terra",
+        15: "Ice",
+        16: "Titanium",
+        17: "Desert"
+    },
+    4: {
+        3: "Titanium",
+        4: "Ice",
+        6: "Oxide",
+        9: "Volcanic",
+        15: "Swamp",
+        19: "Terra"
+    },
+    5: {
+        3: "Ice",
+        5: "Gaia",
+        12: "Trans-dim",
+        13: "Volcanic",
+        16: "Oxide",
+        17: "Desert"
+    },
+    6: {
+        5: "Swamp",
+        7: "Trans-dim",
+        11: "Terra",
+        14: "Gaia",
+        18: "Trans-dim",
+        19: "Desert"
+    },
+    7: {
+        1: "Trans-dim",
+        6: "Oxide",
+        7: "Swamp",
+        9: "Gaia",
+        15: "Gaia",
+        17: "Titanium"
+    },
+    8: {
+        3: "Terra",
+        6: "Ice",
+        9: "Volcanic",
+        12: "Trans-dim",
+        13: "Trans-dim",
+        15: "Titanium"
+    },
+    9: {
+        2: "Volcanic",
+        7: "Trans-dim",
+        8: "Swamp",
+        9: "Titanium",
+        12: "Ice",
+        15: "Gaia"
+    },
+    10: {
+        5: "Desert",
+        7: "Trans-dim",
+        8: "Terra",
+        12: "Trans-dim",
+        13: "Oxide",
+        15: "Gaia"
+    },
+}
+# In a 2 player game sectors 5, 6 and 7 are played on their back side.
+SECTORS_BACK = {
+    5: {
+        3: "Ice",
+        5: "Gaia",
+        12: "Trans-dim",
+        13: "Volcanic",
+        16: "Oxide"
+    },
+    6: {
+        7: "Trans-dim",
+        11: "Terra",
+        14: "Gaia",
+        18: "Trans-dim",
+        19: "Desert"
+    },
+    7: {
+        1: "Trans-dim",
+        6: "Gaia",
+        9: "Gaia",
+        15: "Swamp",
+        17: "Titanium"
+    },
+}
 PLANETS = [
     "Terra",
     "Oxide",
@@ -54,3 +162,13 @@ DIFFICULTY = [
     "Ultoma",
     "Alptrauma"
 ]
+# Name of every research track: the property of the players that holds their
+# level on it.
+TRACK_ATTRIBUTES = {
+    "Terraforming": "terraforming",
+    "Navigation": "navigation",
+    "Artificial Intelligence": "a_i",
+    "Gaia Project": "gaia_project",
+    "Economy": "economy",
+    "Science": "science",
+}
@@ -0,0 +1,192 @@
+"""Decisions the game asks the players to make.
+
+Every question goes through ask (or one of the helpers below it) instead of
+calling input() directly. The question is passed to the active channel as a
+Decision with the list of answers that are allowed at that moment. The
+channel decides where the answer comes from:
+
+    ConsoleChannel: a human typing in the console (the default).
+    ScriptedChannel: a list of answers, for tests and replaying a game.
+    BotChannel: a function, for bots that play the game.
+
+The answers are the same text a human would type ("1", "y" etc.), so the
+game handles every channel the same way.
+"""
+
+from collections import deque
+
+import exceptions as e
+
+
+class Option:
+    """One of the allowed answers to a decision."""
+
+    def __init__(self, answer, label="", value=None):
+        self.answer = answer  # What a human would type, for example "1".
+        self.label = label  # Text shown next to the answer.
+        self.value = value  # Object the answer stands for, if there is one.
+
+    def __str__(self):
+        return f"{self.answer}. {self.label}"
+
+
+class Decision:
+    """A question with its allowed answers.
+
+    kind is one of:
+        menu: Pick one of the numbered options.
+        yes_no: Answer y or n.
+        number: Type a whole number. There are no options.
+        continue: Nothing to decide, any answer continues the game.
+    """
+
+    def __init__(self, kind, prompt, options):
+        self.kind = kind
+        self.prompt = prompt  # Text shown when asking a human.
+        self.options = options  # List of Option objects.
+
+    def answers(self):
+        return [option.answer for option in self.options]
+
+
+class ConsoleChannel:
+    """Ask a human in the console."""
+
+    # True if the player may take back their previous turn. A bot would
+    # only go back and forth.
+    can_undo = True
+
+    def answer(self, decision):
+        return input(decision.prompt)
+
+
+class ScriptedChannel:
+    """Answer from a list of answers, in order.
+
+    Example:
+        decisions.use(ScriptedChannel(["1", "y", "3"]))
+    """
+
+    # A replayed game has the turns that were taken back in it as well.
+    can_undo = True
+
+    def __init__(self, answers):
+        self.answers = deque(answers)
+
+    def answer(self, decision):
+        if not self.answers:
+            raise e.NoMoreAnswersError(decision.prompt)
+        return self.answers.popleft()
+
+
+class BotChannel:
+    """Answer with a function.
+
+    Example:
+        decisions.use(BotChannel(lambda decision: decision.options[0]))
+    """
+
+    can_undo = False
+
+    def __init__(self, decide):
+        # Function that gets a Decision and returns one of its Options (or
+        # the answer as text).
+        self.decide = decide
+
+    def answer(self, decision):
+        choice = self.decide(decision)
+        if isinstance(choice, Option):
+            return choice.answer
+        return choice
+
+
+# Channel every decision goes through.
+channel = ConsoleChannel()
+
+
+def use(new_channel):
+    """Let every decision from now on go through another channel."""
+
+    global channel
+    channel = new_channel
+
+
+def ask(kind, options, prompt="--> "):
+    """Ask for a decision.
+
+    Args:
+        kind (str): See Decision.
+        options (list): Allowed answers as Option objects.
+        prompt (str): Text shown when asking a human.
+
+    Returns:
+        The answer as text.
+    """
+
+    return channel.answer(Decision(kind, prompt, options))
+
+
+def numbered(values, start=1):
+    """Options numbered from start, one for every value.
+
+    Args:
+        values (iterable): Objects the options stand for.
+        start (int): Number of the first option.
+
+    Returns:
+        List of Option objects.
+    """
+
+    return [
+        Option(str(number), str(value), value)
+        for number, value in enumerate(values, start=start)
+    ]
+
+
+def menu(values, extra=(), prompt="--> "):
+    """Ask to pick one of the numbered values.
+
+    Args:
+        values (iterable): Objects shown as 1, 2, 3 etc.
+        extra (list): Extra Options, for example to go back.
+        prompt (str): Text shown when asking a human.
+
+    Returns:
+        The answer as text.
+    """
+
+    return ask("menu", numbered(values) + list(extra), prompt)
+
+
+def yes_no(prompt="--> "):
+    """Ask a yes or no question.
+
+    Returns:
+        The answer as text ("y" or "n" when the answer is valid).
+    """
+
+    return ask(
+        "yes_no",
+        [Option("y", "Yes", True), Option("n", "No", False)],
+        prompt
+    )
+
+
+def number(prompt="--> "):
+    """Ask for a whole number.
+
+    Returns:
+        The answer as text.
+    """
+
+    return ask("number", [], prompt)
+
+
+def wait(prompt):
+    """Wait until the player wants to continue.
+
+    Args:
+        prompt (str): Text shown when asking a human.
+    """
+
+    ask("continue", [Option("", "Continue")], prompt)
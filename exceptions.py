@@ -22,6 +22,10 @@ class NoFederationGreenError(Exception):
     pass
 
 
+class NoFederationPossibleError(Exception):
+    pass
+
+
 class NoResearchPossibleError(Exception):
     pass
 
@@ -64,3 +68,11 @@ class NoValidSpacesError(Exception):
 
 class ExtraRangeError(Exception):
     pass
+
+
+class NoMoreAnswersError(Exception):
+    pass
+
+
+class StateRestoreError(Exception):
+    pass
@@ -1,4 +1,7 @@
-class Faction:
+from journal import Journaled
+
+
+class Faction(Journaled):
     """General faction board."""
 
     def __init__(self):
@@ -1,4 +1,19 @@
-class FederationToken:
+import heapq
+
+import constants as C
+from journal import Journaled
+
+# Offsets from a hex to its 6 neighbours on the universe grid.
+NEIGHBOURS = [(0, -2), (0, 2), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+# Power value the structures of a federation need to add up to.
+FEDERATION_POWER = 7
+
+# Used as infinity for the cost of a tree that doesn't exist.
+INFINITE = float("inf")
+
+
+class FederationToken(Journaled):
 
     def __init__(self, img, count, reward, state):
         self.img = img
@@ -9,3 +24,542 @@ class FederationToken:
     def __str__(self):
         # TODO make printing this better.
         return f"Reward: {self.reward} | Side: {self.state}"
+
+
+class Federation:
+    """A federation that a player is able to form."""
+
+    def __init__(self, planets, satellites, power):
+        self.planets = planets  # Planets with a structure in the federation.
+        self.satellites = satellites  # Spaces that need a satellite.
+        self.power = power  # Total power value of the structures.
+
+    def __str__(self):
+        planets = ", ".join(
+            f"{planet.sector}-{planet.num}" for planet in self.planets
+        )
+        return (
+            f"Satellites: {len(self.satellites)} | Power value: {self.power} "
+            f"| Planets (sector-number): {planets}"
+        )
+
+
+class FederationSolver:
+    """Find the federations a player can form with the fewest satellites.
+
+    The structures of a player that are next to each other form a cluster.
+    A cluster always joins a federation as a whole, because every structure
+    next to a federation becomes part of it. Connecting a group of clusters
+    with the fewest satellites is a Steiner tree problem on the hexes of the
+    universe, where every Space costs 1 satellite and a cluster costs
+    nothing. It's solved with the Dreyfus-Wagner algorithm:
+    self.tree_costs(player, mask)[node] is the cost of the cheapest tree
+    that connects the clusters in mask and node.
+
+    A player never has enough Power Tokens for more satellites than the
+    limit the graph is built for, so only the Spaces within that distance of
+    the clusters are part of it. And only the smallest groups of clusters
+    that reach the power value are connected. The results are remembered per
+    player for as long as the player's own structures, federations and
+    satellites stay the same, the other players don't change any of it.
+    """
+
+    def __init__(self, universe):
+        self.universe = universe
+
+        # Faction name: (the player's pieces, remembered results). See
+        # self.remembered.
+        self.memo = {}
+
+        # (Amount of planets, {location: Planet or Space}). Only the Lost
+        # Planet changes the hexes of the universe.
+        self.hex_cache = (0, {})
+
+    def remembered(self, player, limit=0):
+        """Results remembered for the player's current pieces on the board.
+
+        Args:
+            player: Player object.
+            limit (int): Highest amount of satellites the results have to be
+                right for.
+
+        Returns:
+            Dictionary to remember results in. memo["limit"] is the amount of
+            satellites the graph was built for.
+        """
+
+        name = player.faction.name
+        pieces = self.pieces(player)
+        saved_pieces, memo = self.memo.get(name, (False, {"limit": -1}))
+        if saved_pieces != pieces or memo["limit"] < limit:
+            memo = {"limit": limit}
+            self.memo[name] = (pieces, memo)
+        return memo
+
+    def pieces(self, player):
+        """Everything about the player on the board the results depend on."""
+
+        home_type = player.faction.home_type
+        planets = self.universe.index.query(owner=player.faction.name)
+        return (
+            len(self.universe.planet_list),
+            tuple(sorted(
+                (planet.location, planet.structure, planet.federation)
+                for planet in planets
+            )),
+            tuple(
+                location for location, hex_ in self.hexes().items()
+                    if hex_.type == "Space" and home_type in hex_.satellites
+            ),
+        )
+
+    def power_values(self, player):
+        """Power value of every structure of the player in a federation."""
+
+        values = dict(C.STRUCTURE_POWER_VALUES)
+        for standard_tech in player.standard_technology:
+            if standard_tech.when == "worth4power":
+                values["Academy"] = 4
+                values["Planetary Institute"] = 4
+        return values
+
+    def hexes(self):
+        """Dictionary with location: Planet or Space of the whole universe."""
+
+        count, hexes = self.hex_cache
+        if count != len(self.universe.planet_list):
+            hexes = {}
+            for sector in self.universe.sectors.values():
+                for circle in sector.hexes:
+                    for hex_ in circle:
+                        hexes[hex_.location] = hex_
+            self.hex_cache = (len(self.universe.planet_list), hexes)
+        return hexes
+
+    def neighbours(self, location):
+        x, y = location
+        return [(x + dx, y + dy) for dx, dy in NEIGHBOURS]
+
+    def distance(self, start, target):
+        """Distance between two locations on the universe grid."""
+
+        universe = self.universe
+        return universe.distances[universe.hex_index[start]][
+            universe.hex_index[target]
+        ]
+
+    def federated(self, player, memo=False):
+        """Find the structures that are part of one of the player's federations.
+
+        A structure that was built next to a federation after it was formed
+        is also part of it.
+
+        Args:
+            player: Player object.
+            memo: Dictionary from self.remembered, if it's already known.
+
+        Returns:
+            A set with the locations of those structures and of the player's
+            satellites.
+        """
+
+        if not memo:
+            memo = self.remembered(player)
+        if "federated" in memo:
+            return memo["federated"]
+
+        hexes = self.hexes()
+        structures = self.structures(player)
+        home_type = player.faction.home_type
+
+        federated = {
+            location for location in structures
+                if hexes[location].federation
+        }
+        federated |= {
+            location for location, hex_ in hexes.items()
+                if hex_.type == "Space" and home_type in hex_.satellites
+        }
+
+        # Spread out to the structures next to the federations.
+        todo = list(federated)
+        while todo:
+            for neighbour in self.neighbours(todo.pop()):
+                if neighbour in structures and neighbour not in federated:
+                    federated.add(neighbour)
+                    todo.append(neighbour)
+
+        memo["federated"] = federated
+        return federated
+
+    def structures(self, player):
+        """Locations of all the structures of the player.
+
+        A Gaiaformer isn't a structure.
+        """
+
+        index = self.universe.index
+        return {
+            planet.location for planet in (
+                index.query(owner=player.faction.name)
+                - index.query(structure="Gaiaformer")
+            )
+        }
+
+    def graph(self, player, memo):
+        """Build the graph the Steiner tree search runs on.
+
+        A Space further away from the clusters than memo["limit"] can't be
+        part of a federation, so it's left out.
+
+        Args:
+            player: Player object.
+            memo: Dictionary from self.remembered.
+
+        Returns:
+            A dictionary with:
+                clusters: List with a list of Planet objects per cluster.
+                nodes: Cluster numbers first, followed by the locations of
+                    the Spaces that can get a satellite.
+                weight: Amount of satellites needed for every node.
+                edges: List of neighbouring nodes for every node.
+                gaps: gaps[i][j] is the least amount of hexes between
+                    cluster i and cluster j.
+        """
+
+        if "graph" in memo:
+            return memo["graph"]
+
+        hexes = self.hexes()
+        federated = self.federated(player, memo)
+        structures = self.structures(player) - federated
+
+        # A new federation can't touch one of the player's other federations.
+        blocked = set(federated)
+        for location in federated:
+            blocked.update(self.neighbours(location))
+
+        # Group the free structures into clusters of neighbouring structures.
+        cluster_of = {}
+        clusters = []
+        for start in sorted(structures):
+            if start in cluster_of:
+                continue
+
+            number = len(clusters)
+            members = [start]
+            cluster_of[start] = number
+            for location in members:
+                for neighbour in self.neighbours(location):
+                    if neighbour in structures \
+                            and neighbour not in cluster_of:
+                        cluster_of[neighbour] = number
+                        members.append(neighbour)
+
+            clusters.append([hexes[location] for location in sorted(members)])
+
+        # Spaces where the player can place a satellite. Every hex on the way
+        # from a Space to the nearest cluster needs a satellite too.
+        limit = memo["limit"]
+        spaces = [
+            location for location, hex_ in sorted(hexes.items())
+                if hex_.type == "Space"
+                and location not in blocked
+                and player.faction.home_type not in hex_.satellites
+                and any(
+                    self.distance(location, structure) <= limit
+                    for structure in structures
+                )
+        ]
+
+        nodes = list(range(len(clusters))) + spaces
+        node_of = dict(cluster_of)
+        for i, location in enumerate(spaces, start=len(clusters)):
+            node_of[location] = i
+
+        weight = [0] * len(clusters) + [1] * len(spaces)
+
+        edges = [set() for _ in nodes]
+        for location, node in node_of.items():
+            for neighbour in self.neighbours(location):
+                other = node_of.get(neighbour)
+                if other is not None and other != node:
+                    edges[node].add(other)
+        edges = [sorted(neighbours) for neighbours in edges]
+
+        gaps = [
+            [
+                min(
+                    self.distance(planet.location, other.location)
+                    for planet in cluster for other in other_cluster
+                ) - 1
+                for other_cluster in clusters
+            ]
+            for cluster in clusters
+        ]
+        # A tree can go through other clusters for free, so the gap is the
+        # shortest way through any of them (Floyd-Warshall).
+        for k in range(len(clusters)):
+            for i in range(len(clusters)):
+                for j in range(len(clusters)):
+                    if gaps[i][k] + gaps[k][j] < gaps[i][j]:
+                        gaps[i][j] = gaps[i][k] + gaps[k][j]
+
+        graph = {
+            "clusters": clusters,
+            "nodes": nodes,
+            "weight": weight,
+            "edges": edges,
+            "gaps": gaps,
+        }
+        memo["graph"] = graph
+        return graph
+
+    def tree_costs(self, player, mask, memo):
+        """Cheapest trees that connect a group of clusters.
+
+        Trees with more satellites than memo["limit"] are left out.
+
+        Args:
+            player: Player object.
+            mask (int): Bit i is set if cluster i is part of the group.
+            memo: Dictionary from self.remembered the graph is in.
+
+        Returns:
+            (cost, back) where cost[node] is the amount of satellites of the
+            cheapest tree that connects the clusters in mask and node, and
+            back[node] tells how that tree was made. Both are dictionaries
+            with only the nodes that have a tree.
+        """
+
+        if mask in memo:
+            return memo[mask]
+
+        limit = memo["limit"]
+        graph = memo["graph"]
+        weight = graph["weight"]
+        edges = graph["edges"]
+        cost = {}
+        back = {}
+
+        members = [i for i in range(mask.bit_length()) if mask >> i & 1]
+        if fewest_satellites(members, graph["gaps"]) > limit:
+            memo[mask] = (cost, back)
+            return cost, back
+
+        lowest = mask & -mask
+        if mask == lowest:
+            # A single cluster. Clusters are the first nodes of the graph.
+            node = lowest.bit_length() - 1
+            cost[node] = 0
+            back[node] = None
+        else:
+            # Split the group in two and join the trees of both halves. Only
+            # the splits where the first half has the lowest cluster are
+            # needed, the others are the same splits mirrored.
+            rest = mask ^ lowest
+            sub = rest
+            while True:
+                first = lowest | sub
+                if first != mask:
+                    second = mask ^ first
+                    cost_first = self.tree_costs(player, first, memo)[0]
+                    cost_second = self.tree_costs(player, second, memo)[0]
+                    for node in cost_first.keys() & cost_second.keys():
+                        joined = cost_first[node] + cost_second[node] \
+                            - weight[node]
+                        if joined < cost.get(node, INFINITE) \
+                                and joined <= limit:
+                            cost[node] = joined
+                            back[node] = ("split", first, second)
+                if not sub:
+                    break
+                sub = (sub - 1) & rest
+
+        # Grow the trees along the graph (Dijkstra).
+        queue = [(node_cost, node) for node, node_cost in cost.items()]
+        heapq.heapify(queue)
+        while queue:
+            node_cost, node = heapq.heappop(queue)
+            if node_cost > cost[node]:
+                continue
+            for neighbour in edges[node]:
+                new_cost = node_cost + weight[neighbour]
+                if new_cost <= limit \
+                        and new_cost < cost.get(neighbour, INFINITE):
+                    cost[neighbour] = new_cost
+                    back[neighbour] = ("edge", node)
+                    heapq.heappush(queue, (new_cost, neighbour))
+
+        memo[mask] = (cost, back)
+        return cost, back
+
+    def tree_nodes(self, player, mask, node, memo):
+        """Collect the nodes of the cheapest tree for mask and node."""
+
+        nodes = set()
+        todo = [(mask, node)]
+        while todo:
+            mask, node = todo.pop()
+            nodes.add(node)
+            step = self.tree_costs(player, mask, memo)[1][node]
+            if step is None:
+                continue
+            if step[0] == "edge":
+                todo.append((mask, step[1]))
+            else:
+                todo.append((step[1], node))
+                todo.append((step[2], node))
+        return nodes
+
+    def groups(self, powers, gaps, limit):
+        """Smallest groups of clusters that reach the federation power value.
+
+        A group that still reaches the power value without one of its
+        clusters is skipped, since adding a cluster never makes a federation
+        cheaper. So are groups that are too far apart for the satellites.
+
+        Args:
+            powers (list): Power value of every cluster.
+            gaps (list): See self.graph.
+            limit (int): Highest amount of satellites.
+
+        Returns:
+            List of lists with cluster numbers.
+        """
+
+        groups = []
+
+        def grow(group, power, first):
+            if power >= FEDERATION_POWER:
+                if power - min(powers[i] for i in group) < FEDERATION_POWER \
+                        and fewest_satellites(group, gaps) <= limit:
+                    groups.append(group)
+                return
+            for i in range(first, len(powers)):
+                if all(gaps[i][j] <= limit for j in group):
+                    grow(group + [i], power + powers[i], i + 1)
+
+        grow([], 0, 0)
+        return groups
+
+    def options(self, player):
+        """Find every federation the player can form right now.
+
+        Args:
+            player: Player object.
+
+        Returns:
+            List of Federation objects. Federations with the fewest
+            satellites come first.
+        """
+
+        # Power Tokens and technology tiles change without the board changing.
+        tokens = player.faction.count_powertokens()
+        values = self.power_values(player)
+        memo = self.remembered(player, tokens)
+        key = ("options", tokens, tuple(values.items()))
+        if key in memo:
+            return memo[key]
+
+        hexes = self.hexes()
+        graph = self.graph(player, memo)
+        clusters = graph["clusters"]
+        powers = [
+            sum(values[planet.structure] for planet in cluster)
+            for cluster in clusters
+        ]
+
+        found = {}
+        for members in self.groups(powers, graph["gaps"], tokens):
+            # The tree that connects the other clusters and the first one
+            # connects them all, the whole group never has to be split.
+            first, *others = members
+            if others:
+                mask = sum(1 << i for i in others)
+                cost = self.tree_costs(player, mask, memo)[0].get(
+                    first, INFINITE
+                )
+                if cost > tokens:
+                    continue
+                nodes = self.tree_nodes(player, mask, first, memo)
+            else:
+                cost = 0
+                nodes = {first}
+
+            # Clusters next to a satellite join the federation as well.
+            joined = {node for node in nodes if node < len(clusters)}
+            for node in nodes:
+                if node >= len(clusters):
+                    joined.update(
+                        other for other in graph["edges"][node]
+                            if other < len(clusters)
+                    )
+
+            planets = [
+                planet for i in sorted(joined) for planet in clusters[i]
+            ]
+            satellites = [
+                hexes[graph["nodes"][node]] for node in sorted(nodes)
+                    if node >= len(clusters)
+            ]
+            federation_key = tuple(planet.location for planet in planets)
+            if federation_key in found \
+                    and len(found[federation_key].satellites) <= cost:
+                continue
+
+            found[federation_key] = Federation(
+                planets,
+                satellites,
+                sum(powers[i] for i in joined)
+            )
+
+        options = sorted(
+            found.values(),
+            key=lambda fed: (len(fed.satellites), -fed.power, len(fed.planets))
+        )
+        memo[key] = options
+        return options
+
+    def form(self, player, federation):
+        """Mark the planets and place the satellites of a federation.
+
+        Args:
+            player: Player object.
+            federation: Federation object from self.options.
+        """
+
+        for planet in federation.planets:
+            planet.federation = True
+
+        for space in federation.satellites:
+            space.satellites.append(player.faction.home_type)
+        player.satellites += len(federation.satellites)
+
+
+def fewest_satellites(group, gaps):
+    """Least amount of satellites that can connect a group of clusters.
+
+    Every cluster needs a satellite for every hex between it and the rest,
+    and going around the tree of a federation passes every satellite twice
+    while visiting every cluster. So the tree needs at least the biggest gap
+    and at least half of the shortest tree over the gaps (Prim).
+
+    Args:
+        group (list): Cluster numbers.
+        gaps (list): See FederationSolver.graph.
+
+    Returns:
+        The amount of satellites the group needs at the very least.
+    """
+
+    nearest = {i: gaps[group[0]][i] for i in group[1:]}
+    biggest = max(nearest.values(), default=0)
+    total = 0
+    while nearest:
+        closest = min(nearest, key=nearest.get)
+        total += nearest.pop(closest)
+        for i in nearest:
+            nearest[i] = min(nearest[i], gaps[closest][i])
+            biggest = max(biggest, gaps[closest][i])
+    return max(biggest, (total + 1) // 2)
@@ -0,0 +1,151 @@
+from journal import journal
+
+
+class Frontier:
+    """Unowned planets within reach of the empire of one player.
+
+    For every unowned planet the distance to the nearest planet of the
+    empire is remembered and the planets are grouped by that distance. When
+    the empire grows only the distances that got shorter are changed and
+    when a planet gets claimed it is simply dropped, so nothing ever needs
+    to be recalculated from scratch.
+
+    On top of that self.field holds the distance from every hex on the map
+    (planets and spaces) to the nearest planet of the empire. It is indexed
+    the same way as Universe.distances.
+
+    Example:
+        self.nearest = {Planet: 2, Planet: 3}
+        self.reach = {2: {Planet}, 3: {Planet}}
+        self.field = [5, 4, 4, 3, 2, 2, 1, 0, ...]
+    """
+
+    def __init__(self, universe, faction_name):
+        """Build the frontier of a faction.
+
+        Args:
+            universe: The universe object used in the main GaiaProject class.
+            faction_name (str): Name of the faction of the player.
+        """
+
+        self.universe = universe
+        self.faction_name = faction_name
+
+        self.empire = set()  # Planets that the range is measured from.
+        self.nearest = {}  # Unowned planet: distance to the empire.
+        self.reach = {}  # Distance: set of unowned planets.
+
+        # Distance from every hex to the empire. Nothing is in reach until
+        # the first planet is added to the empire.
+        self.field = [float("inf")] * len(universe.hex_locations)
+
+        for planet in universe.planet_list:
+            self.planet_changed(planet)
+
+    def planet_changed(self, planet):
+        """Update the frontier after a planet was added or changed.
+
+        Args:
+            planet: Planet object that was added to or changed in the
+                Universe.
+        """
+
+        journal.keep(self)
+
+        # A claimed planet is no longer a valid option for anyone.
+        if planet.owner:
+            self.drop(planet)
+
+        # Planets with only a Gaiaformer don't count for range.
+        if (
+            planet.owner == self.faction_name
+            and planet.structure
+            and planet.structure != "Gaiaformer"
+            and planet not in self.empire
+        ):
+            self.expand(planet)
+
+    def snapshot(self):
+        """Everything the frontier knows, to restore it later.
+
+        Returns:
+            (empire, nearest, field). The field is never changed in place, so
+            it doesn't need to be copied.
+        """
+
+        return frozenset(self.empire), tuple(self.nearest.items()), self.field
+
+    def restore(self, snapshot):
+        """Go back to a snapshot made by the snapshot method."""
+
+        empire, nearest, field = snapshot
+        self.empire = set(empire)
+        self.nearest = dict(nearest)
+        self.reach = {}
+        for planet, distance in nearest:
+            self.reach.setdefault(distance, set()).add(planet)
+        self.field = list(field)
+
+    def drop(self, planet):
+        """Stop looking at a planet because it was claimed.
+
+        Args:
+            planet: Planet object that got an owner.
+        """
+
+        distance = self.nearest.pop(planet, None)
+        if distance is not None:
+            self.reach[distance].discard(planet)
+
+    def expand(self, planet):
+        """Add a planet to the empire and bring its surroundings in reach.
+
+        Args:
+            planet: Planet object that now belongs to the empire.
+        """
+
+        self.empire.add(planet)
+
+        row = self.universe.distances[
+            self.universe.hex_index[planet.location]
+        ]
+        self.field = [min(old, new) for old, new in zip(self.field, row)]
+
+        rings = self.universe.rings[planet.location]
+        for distance, ring in enumerate(rings):
+            for candidate in ring:
+                if candidate.owner:
+                    continue
+
+                old = self.nearest.get(candidate)
+                if old is not None:
+                    if old <= distance:
+                        continue
+                    self.reach[old].discard(candidate)
+
+                self.nearest[candidate] = distance
+                self.reach.setdefault(distance, set()).add(candidate)
+
+    def within(self, max_range):
+        """Return all unowned planets within range of the empire.
+
+        Args:
+            max_range (int): Maximum distance from the empire.
+
+        Returns:
+            A list with all the found planets.
+        """
+
+        planets = []
+        for distance in range(1, max_range + 1):
+            planets.extend(self.reach.get(distance, ()))
+        return planets
+
+    def distance(self, hex_):
+        """Return the distance from a hex to the nearest planet of the empire.
+
+        Args:
+            hex_: Planet, LostPlanet or Space object.
+        """
+
+        return self.field[self.universe.hex_index[hex_.location]]
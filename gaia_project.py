@@ -1,41 +1,53 @@
+import hashlib
 import os
 import random
 import sys
 from threading import Thread
 
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-
-import pygame
-from PIL import Image
-
+import assets
+import atlas
 import constants as C
+import decisions
+import settings
 from automa import Automa
 from federation import FederationToken
+from journal import Journaled, journal
 from player import Player
 from research import Research
 from scoring import Scoring
+from stats import stats
 from universe import Universe
 
 ROOT = os.path.dirname(__file__)
 IMAGES = os.path.join(ROOT, "images")
+SETUP_CACHE = os.path.join(ROOT, "cache", "setups")
 
 
-class GaiaProject:
+class GaiaProject(Journaled):
     """Class for combining all the different parts of the game."""
 
-    def __init__(self, player_count, screen, automa=False):
+    def __init__(self, player_count, renderer, automa=False):
         """Create a new game of GaiaProject
 
         Args:
             player_count (int): Amount of players.
+            renderer: Renderer object that shows the universe, for example
+                window.PygameRenderer or render.HeadlessRenderer.
             automa (bool): whether or not the player is playing against the
                 automa.
         """
 
+        # Nothing of an earlier game can be undone.
+        journal.forget()
+
         self.player_count = player_count
-        self.screen = screen  # Pygame Universe representation.
+        self.renderer = renderer  # Shows the universe.
         self.automa = automa
         self.players = []  # A list with all the player objects in turn order.
+
+        # Booster every player used in a round and their victory points
+        # after it, as {faction name: (booster, vp)} for every round played.
+        self.history = []
         self.board_setup()
 
     def board_setup(self):
@@ -66,6 +78,10 @@ class GaiaProject:
         #    rotation of tiles) or just do it together.
         self.create_universe()
 
+        # Get the images of the universe ready while the players are busy
+        # with the rest of the setup.
+        self.renderer.preload(self.universe.image_paths())
+
         # 3. Randomly place the standard and advanced technology tiles.
         self.research_board.randomise_tech_tiles()
 
@@ -85,154 +101,100 @@ class GaiaProject:
         # TESTING uncomment line below when finished. Commented because
         #   it kept changing the img file which is not necessary right now.
         # Load the setup into an image to see it more easily as a human.
-        self.visual_setup()
+        # Nobody looks at it when the game is headless.
+        if not self.renderer.headless:
+            self.visual_setup()
 
     def visual_setup(self):
         """Visualize the board setup.
 
-        Load setup into an image for better human readability.
+        Load setup into an image for better human readability. The image is
+        named after a hash of the chosen tiles, so the same setup is only
+        made once. The path is printed so the player can find it. It's
+        composed and saved on a background thread, the decoded tiles are
+        kept in assets.images for the next game.
+
+        Returns:
+            The background Thread or False if the image already exists.
         """
 
-        # Canvas with technology track backgrounds at the top.
-        with Image.open(os.path.join(ROOT,
-                "empty_setup.png")) as canvas:
+        research = self.research_board
 
+        # Every tile with the top left corner where it goes on the canvas.
+        tiles = [
             # Terraforming setup.
             # Placing the federation token.
-            with Image.open(os.path.join(IMAGES,
-                   self.research_board.terraforming.level5.reward.img)) as fed:
-                canvas.paste(fed, (5, 35), fed)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.terraforming.advanced.img)) as adv:
-                canvas.paste(adv, (160, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.terraforming.standard.img)) as std:
-                canvas.paste(std, (158, 127), std)
+            (research.terraforming.level5.reward.img, (5, 35)),
+            # Error is corrected at runtime so i can ignore these.
+            # pylint: disable=no-member
+            (research.terraforming.advanced.img, (160, 3)),
+            (research.terraforming.standard.img, (158, 127)),
 
             # Navigation setup.
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.navigation.advanced.img)) as adv:
-                canvas.paste(adv, (330, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.navigation.standard.img)) as std:
-                canvas.paste(std, (328, 127), std)
+            (research.navigation.advanced.img, (330, 3)),
+            (research.navigation.standard.img, (328, 127)),
 
             # Artificial Intelligence setup.
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.a_i.advanced.img)) as adv:
-                canvas.paste(adv, (500, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.a_i.standard.img)) as std:
-                canvas.paste(std, (496, 127), std)
+            (research.a_i.advanced.img, (500, 3)),
+            (research.a_i.standard.img, (496, 127)),
 
             # Gaia Project setup.
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.gaia_project.advanced.img)) as adv:
-                canvas.paste(adv, (668, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.gaia_project.standard.img)) as std:
-                canvas.paste(std, (664, 127), std)
+            (research.gaia_project.advanced.img, (668, 3)),
+            (research.gaia_project.standard.img, (664, 127)),
 
             # Economy setup.
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.economy.advanced.img)) as adv:
-                canvas.paste(adv, (836, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.economy.standard.img)) as std:
-                canvas.paste(std, (832, 127), std)
+            (research.economy.advanced.img, (836, 3)),
+            (research.economy.standard.img, (832, 127)),
 
             # Science setup.
-            with Image.open(os.path.join(IMAGES,
-                    # Place the advanced tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.science.advanced.img)) as adv:
-                canvas.paste(adv, (1012, 3), adv)
-
-            with Image.open(os.path.join(IMAGES,
-                    # Place the standard tile.
-                    # Error is corrected at runtime so i can ignore this.
-                    # pylint: disable=no-member
-                    self.research_board.science.standard.img)) as std:
-                canvas.paste(std, (1008, 127), std)
-
-            # Free standard technology tiles setup.
-            x = 240
-            for free_tile in self.research_board.free_standard_technology:
-                with Image.open(os.path.join(IMAGES,
-                        free_tile.img)) as free_std:
-                    canvas.paste(free_std, (int(x), 260), free_std)
-
-                # To space the free tiles evenly apart
-                x += 240 * 1.4
-
-            # Booster tiles setup.
-            x = 30
-            for booster_tile in self.scoring_board.boosters:
-                with Image.open(os.path.join(IMAGES,
-                        booster_tile.img)) as booster:
-                    canvas.paste(booster, (int(x), 415), booster)
-
-                # To space the booster tiles evenly apart
-                x += 80 * 2.5
-
-            # Round scoring tiles setup.
-            x = 5
-            for round_tile in self.scoring_board.rounds:
-                with Image.open(os.path.join(IMAGES,
-                        round_tile.img)) as round_:
-                    canvas.paste(round_, (int(x), 745), round_)
-
-                # To space the round scoring tiles evenly apart
-                x += 100 * 1.6
-
-            # End scoring tiles setup.
-            y = 656
-            for end_tile in self.scoring_board.end_scoring:
-                with Image.open(os.path.join(IMAGES,
-                        end_tile.img)) as end:
-                    canvas.paste(end, (974, y), end)
-
-                # To space the end scoring tiles evenly apart
-                y += 140
-
-            canvas.save("Setup.png", "png")
+            (research.science.advanced.img, (1012, 3)),
+            (research.science.standard.img, (1008, 127)),
+            # pylint: enable=no-member
+        ]
+
+        # Free standard technology tiles setup.
+        x = 240
+        for free_tile in research.free_standard_technology:
+            tiles.append((free_tile.img, (int(x), 260)))
+
+            # To space the free tiles evenly apart
+            x += 240 * 1.4
+
+        # Booster tiles setup.
+        x = 30
+        for booster_tile in self.scoring_board.boosters:
+            tiles.append((booster_tile.img, (int(x), 415)))
+
+            # To space the booster tiles evenly apart
+            x += 80 * 2.5
+
+        # Round scoring tiles setup.
+        x = 5
+        for round_tile in self.scoring_board.rounds:
+            tiles.append((round_tile.img, (int(x), 745)))
+
+            # To space the round scoring tiles evenly apart
+            x += 100 * 1.6
+
+        # End scoring tiles setup.
+        y = 656
+        for end_tile in self.scoring_board.end_scoring:
+            tiles.append((end_tile.img, (974, y)))
+
+            # To space the end scoring tiles evenly apart
+            y += 140
+
+        digest = hashlib.sha1(repr(tiles).encode()).hexdigest()[:16]
+        self.setup_path = os.path.join(SETUP_CACHE, f"{digest}.png")
+        print(f"The setup of this game can be seen in {self.setup_path}")
+        if os.path.exists(self.setup_path):
+            return False
+
+        thread = Thread(
+            target=save_setup, args=(tiles, self.setup_path), daemon=True
+        )
+        thread.start()
+        return thread
 
     def create_universe(self):
         """Function for setting up the universe
@@ -241,10 +203,15 @@ class GaiaProject:
             In the future randomise the universe.
         """
 
-        self.universe = Universe(self.screen)
+        self.universe = Universe(self.renderer)
 
-    def player_setup(self):
-        """Initialise Player objects."""
+    def player_setup(self, difficulty=False):
+        """Initialise Player objects.
+
+        Args:
+            difficulty (str): One of constants.DIFFICULTY for the Automa or
+                False to ask for it.
+        """
 
         # TODO more players ask for factions here or assign randomly.
         # Choose faction (start with first player and going clockwise).
@@ -253,7 +220,7 @@ class GaiaProject:
         self.players.append(Player("Hadsch Halla"))
 
         # If playing against the Automa, ask for the desired difficulty.
-        if self.automa:
+        if self.automa and not difficulty:
             print(
                 "What difficulty do you want to set the Automa to? Please type"
                 " the corresponding number."
@@ -262,17 +229,18 @@ class GaiaProject:
                 print(f"{i}. {diff}.")
 
             while True:
-                choice = input("--> ")
+                choice = decisions.menu(C.DIFFICULTY)
 
                 if choice in [str(num + 1) for num in range(i)]:
-                    chosen_difficulty = C.DIFFICULTY[int(choice) - 1]
+                    difficulty = C.DIFFICULTY[int(choice) - 1]
                     break
                 else:
                     print("! Please only type one of the available numbers.")
                     continue
 
+        if self.automa:
             # Set desired difficulty.
-            self.players.append(Automa("Taklons", chosen_difficulty))
+            self.players.append(Automa("Taklons", difficulty))
 
         # Place players on level 0 of all researc7h boards and check if they
         # start on level 1 of any of them. Add the Level object to the Player
@@ -281,6 +249,9 @@ class GaiaProject:
         for p in self.players:
             name = p.faction.name
 
+            # Keep track of the planets within reach of the player's empire.
+            p.frontier = self.universe.add_frontier(name)
+
             p.terraforming = self.research_board.terraforming.level0
             self.research_board.terraforming.level0.players.append(name)
 
@@ -318,19 +289,19 @@ class GaiaProject:
         for player in self.players:
             player.start_mine("first", self, self.players)
             if type(player).__name__ == "Automa":
-                input("Press Enter to continue. --> ")
+                decisions.wait("Press Enter to continue. --> ")
 
         for player in reversed(self.players):
             player.start_mine("second", self, self.players)
             if type(player).__name__ == "Automa":
-                input("Press Enter to continue. --> ")
+                decisions.wait("Press Enter to continue. --> ")
 
         # Choose booster (start with last player and going counter-clockwise):
         print("\nBooster selection.")
         for player in reversed(self.players):
             player.choose_booster(self.scoring_board)
             if type(player).__name__ == "Automa":
-                input("Press Enter to continue. --> ")
+                decisions.wait("Press Enter to continue. --> ")
 
     def play(self):
         """This function will setup and allow you to start playing a game."""
@@ -339,6 +310,10 @@ class GaiaProject:
         for rnd in self.scoring_board.rounds:
             print(f"\nCurrent round {str(rnd).upper()}.")
             self.passed = 0
+            boosters = {
+                player.faction.name: str(player.booster)
+                for player in self.players
+            }
 
             # 1. Income phase followed by # 2. Gaia phase.
             for player in self.players:
@@ -349,9 +324,14 @@ class GaiaProject:
             while self.passed != len(self.players):
                 for player in self.players:
                     if not player.passed:
+                        # Every turn of this round can be undone.
+                        journal.mark(player)
                         player.action_phase(self, rnd)
                         if type(player).__name__ == "Automa":
-                            input("Press Enter to continue. --> ")
+                            decisions.wait("Press Enter to continue. --> ")
+
+            # Turns of a finished round can't be undone.
+            journal.forget()
 
             # 4. Clean up phase
             # Reset Power/Q.I.C. actions.
@@ -362,19 +342,42 @@ class GaiaProject:
             for player in self.players:
                 player.clean_up()
                 player.passed = False
+
+            self.history.append({
+                player.faction.name: (boosters[player.faction.name], player.vp)
+                for player in self.players
+            })
         else:
             # End game scoring.
             self.scoring_board.end_game_scoring(self)
 
 
-def start_game(screen):
+def save_setup(tiles, path):
+    """Compose the setup image in memory and save it.
+
+    Args:
+        tiles (list): (image name, (x, y)) for every tile on the setup.
+        path (str): Where to save the image.
+    """
+
+    # Canvas with technology track backgrounds at the top.
+    canvas = assets.images.load(os.path.join(ROOT, "empty_setup.png")).copy()
+    for img, corner in tiles:
+        tile = assets.images.load(os.path.join(IMAGES, img))
+        canvas.paste(tile, corner, tile)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    assets.write_atomic(path, canvas.save, "png")
+
+
+def start_game(renderer):
     print("Gaia Project started.\n")
     while True:
         # TODO more players ask for amount of players here and if you'll
         #   play against the automa.
         player_count = 2
         automa = True
-        new_game = GaiaProject(player_count, screen, automa=automa)
+        new_game = GaiaProject(player_count, renderer, automa=automa)
         # Choose factions after the whole setup has been done.
         print("The board has been set up. Please choose your factions.")
         new_game.player_setup()
@@ -382,7 +385,7 @@ def start_game(screen):
         new_game.play()
 
         # Pause the program to let the player recap a bit about the results.
-        input("Type enter if you are done playing the game.\n")
+        decisions.wait("Type enter if you are done playing the game.\n")
         break
 
 
@@ -401,28 +404,79 @@ if __name__ == "__main__":
         os.startfile("default_2p_map.png")
         # Research board
         os.startfile("research_board.png")
-        # Visual Setup
-        os.startfile("Setup.png")
+        # Visual Setups, named after the tiles of the game.
+        os.startfile(SETUP_CACHE)
 
 
     # Uncomment if files are opened.
     # open_stuff()
 
     # Start game
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+
+    import pygame
+
+    import window
+
     pygame.init()
-    size = (978, 1000)
-    screen = pygame.display.set_mode(size)
+    screen = pygame.display.set_mode(window.BOARD_SIZE, pygame.RESIZABLE)
     pygame.display.set_caption("Gaia Project Universe")
 
+    # Read the atlas pages (python atlas.py) at once instead of opening every
+    # image on its own during the game.
+    sprites = atlas.load()
+    if sprites:
+        assets.use_atlas(sprites)
+        for page in sprites.pages:
+            assets.surfaces.load(page)
+
     CLOCK = pygame.time.Clock()
 
-    game = Thread(target=start_game, args=(screen,), daemon=True)
+    renderer = window.PygameRenderer(screen)
+    game = Thread(target=start_game, args=(renderer,), daemon=True)
     game.start()
 
+    # Render statistics. F3 shows them on the screen and settings.stats_file
+    # writes them as lines of JSON.
+    overlay = window.Overlay()
+    stats_file = False
+    if settings.stats_file:
+        stats_file = open(settings.stats_file, "a")
+        pygame.time.set_timer(window.STATS, window.STATS_INTERVAL)
+
+    # The game thread never draws on the screen itself, it puts draw
+    # commands in window.queue and posts a REDRAW event. Sleep until
+    # something happens, then execute all waiting commands and push only the
+    # changed areas to the display.
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-
-        pygame.display.update()
-        CLOCK.tick(2)
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            sys.exit()
+        elif event.type == pygame.VIDEORESIZE:
+            # Draw the whole board again at the zoom level of the new size.
+            screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
+            window.queue.flush()
+            renderer.resize(screen)
+            overlay.forget()
+            window.draw_frame(overlay, screen)
+            pygame.display.update()
+            continue
+        elif event.type == pygame.VIDEOEXPOSE:
+            # The window was covered, so everything has to be drawn again.
+            window.draw_frame(overlay, screen)
+            pygame.display.update()
+            continue
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            overlay.toggle()
+            if not stats_file:
+                # Only wake up for the statistics while they are shown.
+                pygame.time.set_timer(
+                    window.STATS,
+                    window.STATS_INTERVAL if overlay.visible else 0
+                )
+        elif event.type == window.STATS and stats_file:
+            stats.write(stats_file)
+
+        if window.draw_frame(overlay, screen):
+            # Let commands pile up for the rest of the frame.
+            CLOCK.tick(window.FPS)
@@ -0,0 +1,229 @@
+"""Journal of every change to the game, so changes can be undone.
+
+The objects of the game inherit from Journaled. While the journal is
+recording, every property that is set on them first writes down the old
+value. Lists and dictionaries that are put on a Journaled object are turned
+into a JournalList or JournalDict, which write down their old contents the
+first time they are changed after a mark. Objects with state that is neither
+(like the Frontier) call journal.keep and have to know how to save and
+restore themselves.
+
+Going back is done per mark:
+
+    journal.mark(player)  # Start of a turn.
+    ...  # Take an action.
+    journal.undo()  # Everything since the mark is back the way it was.
+
+Marks can be nested, so a search can mark, take an action, look further and
+undo again without ever copying the game.
+"""
+
+# Marks a property that didn't exist before it was set.
+MISSING = object()
+
+
+class Journal:
+    """Changes since the first mark, newest last.
+
+    Every change is (function, arguments) that puts the old value back.
+    """
+
+    def __init__(self):
+        self.changes = []
+        self.marks = []  # (label, amount of changes when the mark was made)
+        self.recording = False
+
+        # Lists, dictionaries and other objects that saved their contents
+        # since the last mark.
+        self.kept = set()
+
+    def mark(self, label=False):
+        """Start recording and remember where this point is.
+
+        Args:
+            label: Anything to recognize the mark by, for example the player
+                whose turn starts.
+        """
+
+        self.marks.append((label, len(self.changes)))
+        self.kept = set()
+        self.recording = True
+
+    def undo(self):
+        """Undo every change since the last mark and remove the mark.
+
+        Returns:
+            The label of the removed mark.
+        """
+
+        label, position = self.marks.pop()
+
+        # Undoing changes things too, which shouldn't be written down.
+        self.recording = False
+        while len(self.changes) > position:
+            function, *arguments = self.changes.pop()
+            function(*arguments)
+        self.recording = bool(self.marks)
+        self.kept = set()
+        return label
+
+    def labels(self):
+        """Labels of the marks, oldest first."""
+
+        return [label for label, position in self.marks]
+
+    def forget(self):
+        """Stop recording and forget everything, nothing can be undone."""
+
+        self.changes.clear()
+        self.marks.clear()
+        self.kept = set()
+        self.recording = False
+
+    def setting(self, obj, name):
+        """Write down a property before it's set."""
+
+        self.changes.append((restore_attribute, obj, name,
+                             getattr(obj, name, MISSING)))
+
+    def keep(self, obj):
+        """Write down the contents of an object before it's changed.
+
+        Only the first change after a mark is written down, the contents at
+        that moment are the ones to go back to.
+
+        Args:
+            obj: JournalList, JournalDict or an object with a snapshot and
+                a restore method.
+        """
+
+        if not self.recording or id(obj) in self.kept:
+            return
+        self.kept.add(id(obj))
+
+        if isinstance(obj, JournalList):
+            self.changes.append((restore_list, obj, list(obj)))
+        elif isinstance(obj, JournalDict):
+            self.changes.append((restore_dict, obj, dict(obj)))
+        else:
+            self.changes.append((obj.restore, obj.snapshot()))
+
+
+def restore_attribute(obj, name, value):
+    if value is MISSING:
+        delattr(obj, name)
+    else:
+        setattr(obj, name, value)
+
+
+def restore_list(list_, values):
+    list.__setitem__(list_, slice(None), values)
+
+
+def restore_dict(dict_, values):
+    dict.clear(dict_)
+    dict.update(dict_, values)
+
+
+# The journal every game object writes to.
+journal = Journal()
+
+
+class JournalList(list):
+    """List that tells the journal before it's changed."""
+
+    def __setitem__(self, index, value):
+        journal.keep(self)
+        list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        journal.keep(self)
+        list.__delitem__(self, index)
+
+    def __iadd__(self, values):
+        journal.keep(self)
+        return list.__iadd__(self, values)
+
+    def __imul__(self, amount):
+        journal.keep(self)
+        return list.__imul__(self, amount)
+
+    def append(self, value):
+        journal.keep(self)
+        list.append(self, value)
+
+    def extend(self, values):
+        journal.keep(self)
+        list.extend(self, values)
+
+    def insert(self, index, value):
+        journal.keep(self)
+        list.insert(self, index, value)
+
+    def pop(self, index=-1):
+        journal.keep(self)
+        return list.pop(self, index)
+
+    def remove(self, value):
+        journal.keep(self)
+        list.remove(self, value)
+
+    def clear(self):
+        journal.keep(self)
+        list.clear(self)
+
+    def sort(self, *args, **kwargs):
+        journal.keep(self)
+        list.sort(self, *args, **kwargs)
+
+    def reverse(self):
+        journal.keep(self)
+        list.reverse(self)
+
+
+class JournalDict(dict):
+    """Dictionary that tells the journal before it's changed."""
+
+    def __setitem__(self, key, value):
+        journal.keep(self)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        journal.keep(self)
+        dict.__delitem__(self, key)
+
+    def pop(self, *args):
+        journal.keep(self)
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        journal.keep(self)
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        journal.keep(self)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        journal.keep(self)
+        dict.update(self, *args, **kwargs)
+
+    def clear(self):
+        journal.keep(self)
+        dict.clear(self)
+
+
+class Journaled:
+    """Base class for game objects whose changes can be undone."""
+
+    def __setattr__(self, name, value):
+        # Lists and dictionaries have to tell the journal themselves when
+        # they are changed in place.
+        if type(value) is list:
+            value = JournalList(value)
+        elif type(value) is dict:
+            value = JournalDict(value)
+
+        if journal.recording:
+            journal.setting(self, name)
+        object.__setattr__(self, name, value)
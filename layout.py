@@ -0,0 +1,325 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    # Without numpy layouts are validated one at a time.
+    np = None
+
+import constants as C
+from universe import (
+    CENTERS,
+    INNER_NUMS,
+    OUTER_NUMS,
+    hex_distance,
+    rotate_hexes,
+    sector_grid,
+)
+
+POSITIONS_2P = ['n', 'nw', 'c', 'sw', 'ne', 'se', 's']
+POSITIONS_4P = POSITIONS_2P + ['ene', 'e', 'ese']
+
+# Distance used when two sectors don't have a planet type in common. Larger
+# than any distance inside the universe.
+FAR = 99
+
+
+def planet_locations(hexes, rotation, position):
+    """Find where the planets of a sector end up on the universe grid.
+
+    Args:
+        hexes (dict): Hex number: planet type.
+        rotation (int): Amount of times the sector is rotated clockwise.
+        position (str): Position of the sector (n, c etc.).
+
+    Returns:
+        A dictionary with planet type: list of (x, y) locations.
+    """
+
+    grid = sector_grid(CENTERS[position])
+    nums = [10] + INNER_NUMS + OUTER_NUMS
+    locations = dict(zip(nums, grid[0] + grid[1] + grid[2]))
+
+    placed = {}
+    for num, type_ in rotate_hexes(hexes, rotation).items():
+        placed.setdefault(type_, []).append(locations[num])
+    return placed
+
+
+def min_same_type_distance(placed_a, placed_b, types):
+    """Smallest distance between two planets of the same type.
+
+    Args:
+        placed_a (dict): Planet type: locations of the first sector.
+        placed_b (dict): Planet type: locations of the second sector.
+        types (list): Planet types to look at.
+
+    Returns:
+        The smallest distance or FAR if the sectors share none of the types.
+    """
+
+    smallest = FAR
+    for type_ in types:
+        if type_ not in placed_a or type_ not in placed_b:
+            continue
+        for start in placed_a[type_]:
+            for target in placed_b[type_]:
+                smallest = min(smallest, hex_distance(start, target))
+    return smallest
+
+
+def layout_kwargs(layout):
+    """Turn a layout into keyword arguments for Universe.
+
+    Example:
+        Universe(renderer, **layout_kwargs(layout))
+    """
+
+    return {
+        f"sector{number}": placement for number, placement in layout.items()
+    }
+
+
+class LayoutGenerator:
+    """Seeded generator for random but playable universe layouts.
+
+    A layout is a dictionary with sector number: (position, rotation), the
+    same as Universe.layout. Every sector can be put on every position in 6
+    rotations. Before generating anything, the smallest distance between two
+    planets of the same type is calculated for every pair of positions that
+    are close enough to matter and every combination of sector and rotation
+    on those positions. Validating a layout is then one table lookup per
+    pair of positions, which numpy can do for big batches of layouts at once.
+
+    Layout rules:
+        - Planets of the same type in different sectors are at least
+          min_distance apart. 2 means they are never next to each other.
+        - Planets of the same home type in different sectors are at least
+          min_home_distance apart, so no player starts with a cluster of
+          their home type across a sector border.
+    """
+
+    def __init__(self,
+                 player_count=2,
+                 min_distance=2,
+                 min_home_distance=3,
+                 seed=None):
+        """Precompute the tables used for validating layouts.
+
+        Args:
+            player_count (int): 2 uses sectors 1-7 with sectors 5-7 on their
+                back side. 3 or 4 uses all 10 sectors.
+            min_distance (int): See the layout rules.
+            min_home_distance (int): See the layout rules.
+            seed: Seed for the random generator. The same seed gives the same
+                layouts.
+        """
+
+        self.random = random.Random(seed)
+        self.min_distance = min_distance
+        self.min_home_distance = min_home_distance
+
+        if player_count == 2:
+            self.sectors = list(range(1, 8))
+            self.positions = POSITIONS_2P
+            hexes = {**C.SECTORS, **C.SECTORS_BACK}
+        else:
+            self.sectors = list(range(1, 11))
+            self.positions = POSITIONS_4P
+            hexes = C.SECTORS
+
+        # Every sector in every rotation gets a state number.
+        # state = index of the sector * 6 + rotation.
+        self.states = [
+            (number, rotation)
+            for number in self.sectors
+            for rotation in range(6)
+        ]
+
+        # Only positions that are close together can break a rule. Every hex
+        # of a sector is within 2 of its center.
+        furthest = max(min_distance, min_home_distance)
+        self.pairs = []
+        for p, first in enumerate(self.positions):
+            for q in range(p + 1, len(self.positions)):
+                second = self.positions[q]
+                if hex_distance(CENTERS[first], CENTERS[second]) - 4 \
+                        < furthest:
+                    self.pairs.append((p, q))
+
+        # Planet locations of every state on every position.
+        placed = {
+            (state, position): planet_locations(
+                hexes[number], rotation, position
+            )
+            for state, (number, rotation) in enumerate(self.states)
+            for position in self.positions
+        }
+
+        # self.allowed[pair][state on p][state on q] is True if the two
+        # sectors can be next to each other like that.
+        self.allowed = []
+        for p, q in self.pairs:
+            table = []
+            for state_p, (number_p, _) in enumerate(self.states):
+                placed_p = placed[(state_p, self.positions[p])]
+                row = []
+                for state_q, (number_q, _) in enumerate(self.states):
+                    # A sector can't be in two places at once.
+                    if number_p == number_q:
+                        row.append(False)
+                        continue
+
+                    placed_q = placed[(state_q, self.positions[q])]
+                    row.append(
+                        min_same_type_distance(
+                            placed_p, placed_q, C.PLANETS
+                        ) >= min_distance
+                        and min_same_type_distance(
+                            placed_p, placed_q, C.HOME_TYPES
+                        ) >= min_home_distance
+                    )
+                table.append(row)
+            self.allowed.append(table)
+
+        if np:
+            self.allowed_array = np.array(self.allowed, dtype=bool)
+
+    def to_layout(self, states):
+        """Turn the state of every position into a layout.
+
+        Args:
+            states: State number for every position in self.positions.
+
+        Returns:
+            Dictionary with sector number: (position, rotation), sorted by
+            sector number.
+        """
+
+        layout = {}
+        for position, state in zip(self.positions, states):
+            number, rotation = self.states[int(state)]
+            layout[number] = (position, rotation)
+        return dict(sorted(layout.items()))
+
+    def to_states(self, layout):
+        """Turn a layout into the state of every position.
+
+        Args:
+            layout (dict): Sector number: (position, rotation).
+
+        Returns:
+            List with the state number for every position in self.positions.
+        """
+
+        states = [0] * len(self.positions)
+        for number, (position, rotation) in layout.items():
+            state = self.sectors.index(number) * 6 + rotation
+            states[self.positions.index(position)] = state
+        return states
+
+    def valid_states(self, states):
+        """Check one layout in state form against the layout rules."""
+
+        for table, (p, q) in zip(self.allowed, self.pairs):
+            if not table[states[p]][states[q]]:
+                return False
+        return True
+
+    def is_valid(self, layout):
+        """Check a layout against the layout rules.
+
+        Args:
+            layout (dict): Sector number: (position, rotation).
+        """
+
+        return self.valid_states(self.to_states(layout))
+
+    def validate_batch(self, states):
+        """Check many layouts against the layout rules at once.
+
+        Args:
+            states: Array or list with one row of states per layout.
+
+        Returns:
+            Boolean numpy array, or a list of booleans when numpy isn't
+            installed.
+        """
+
+        if not np:
+            return [self.valid_states(row) for row in states]
+
+        states = np.asarray(states)
+        valid = np.ones(len(states), dtype=bool)
+        for table, (p, q) in zip(self.allowed_array, self.pairs):
+            valid &= table[states[:, p], states[:, q]]
+        return valid
+
+    def random_states(self):
+        """Pick a random sector and rotation for every position."""
+
+        order = list(range(len(self.sectors)))
+        self.random.shuffle(order)
+        return [
+            index * 6 + self.random.randrange(6)
+            for index in order[:len(self.positions)]
+        ]
+
+    def random_layout(self):
+        """Generate a single random layout that follows the layout rules.
+
+        Returns:
+            Dictionary with sector number: (position, rotation).
+        """
+
+        while True:
+            states = self.random_states()
+            if self.valid_states(states):
+                return self.to_layout(states)
+
+    def generate_pool(self, size, batch_size=65536):
+        """Generate a pool of different layouts that follow the layout rules.
+
+        With numpy, candidates are generated and validated in batches. The
+        same seed gives the same pool, as long as numpy is (or isn't)
+        installed both times.
+
+        Args:
+            size (int): Amount of layouts in the pool.
+            batch_size (int): Amount of candidates validated at once.
+
+        Returns:
+            List of layouts.
+        """
+
+        pool = []
+        seen = set()
+
+        if not np:
+            while len(pool) < size:
+                states = self.random_states()
+                if tuple(states) in seen or not self.valid_states(states):
+                    continue
+                seen.add(tuple(states))
+                pool.append(self.to_layout(states))
+            return pool
+
+        rng = np.random.default_rng(self.random.randrange(2 ** 32))
+        count = len(self.positions)
+        while len(pool) < size:
+            # Random order of the sectors for every candidate, cut off at the
+            # amount of positions.
+            order = rng.random((batch_size, len(self.sectors))).argsort(axis=1)
+            rotations = rng.integers(0, 6, (batch_size, count))
+            states = order[:, :count] * 6 + rotations
+
+            for row in states[self.validate_batch(states)]:
+                key = row.tobytes()
+                if key in seen:
+                    continue
+                seen.add(key)
+                pool.append(self.to_layout(row))
+                if len(pool) == size:
+                    break
+
+        return pool
@@ -1,14 +1,17 @@
 import re
 from math import ceil
 
+import actions
 import constants as C
+import decisions
 import exceptions as e
 from faction import select_faction
+from journal import Journaled, journal
 from scoring import Booster
 from technology import AdvancedTechnology
 
 
-class Player:
+class Player(Journaled):
 
     def __init__(self, faction):
         """
@@ -35,6 +38,10 @@ class Player:
         # whether the player owns the lost planet.
         self.lost_planet = False
         self.empire = []  # List of owned planets
+
+        # Unowned planets within reach of the empire. This property is set
+        # during setup.
+        self.frontier = False
         self.federations = []  # List of federation tokens
         self.satellites = 0  # Amount fo satellites placed.
 
@@ -86,7 +93,7 @@ class Player:
         )
 
         gp.universe.place_structure(
-            gp.screen, planet, self.faction.home_type, "Mine"
+            gp.renderer, planet, self.faction.home_type, "Mine"
         )
 
         planet.owner = self.faction.name
@@ -107,7 +114,7 @@ class Player:
         for x, booster in enumerate(scoring_board.boosters, start=1):
             print(f"{x}. {booster}")
         while True:
-            choice = input(f"--> ")
+            choice = decisions.menu(scoring_board.boosters)
 
             if choice in (
                 [str(num + 1) for num in range(len(scoring_board.boosters))]
@@ -146,11 +153,9 @@ class Player:
             knowledge_rl += self.faction.research_lab_income[i]
         total_income.append(f"knowledge{knowledge_rl}")
 
-        # Knowledge from academy.
-        knowledge_a = 0
+        # Knowledge from academy. The income is a gain like "knowledge2".
         if self.faction.academy_income[0]:
-            knowledge_a += self.faction.academy_income[1]
-        total_income.append(f"knowledge{knowledge_a}")
+            total_income.append(self.faction.academy_income[1])
 
         # Income from planetary_institute.
         if self.faction.planetary_institute_built == 1:
@@ -443,9 +448,9 @@ class Player:
                         bowl = self.faction.bowl3
                         bowl_text = f"Power in bowl 3: {bowl}"
                         print(f"{filler('')}{bowl_text}")
-                        selection = input("--> ")
+                        selection = decisions.menu(power_order)
                     else:
-                        selection = input("--> ")
+                        selection = decisions.menu(power_order)
 
                     if selection in [
                         str(num + 1) for num in range(len(power_order))
@@ -545,11 +550,11 @@ class Player:
                 planet.type = "Gaia"
 
                 # Place a Gaia Planet in place of the Trans-dim planet.
-                gp.universe.place_gaia_planet(gp.screen, planet)
+                gp.universe.place_gaia_planet(gp.renderer, planet)
 
                 # Replace the Gaiaformer on the Gaia Planet.
                 gp.universe.place_structure(
-                    gp.screen,
+                    gp.renderer,
                     planet,
                     self.faction.home_type,
                     "Gaiaformer"
@@ -586,6 +591,7 @@ class Player:
         special = "7. Do a Special (Orange) action."
         pass_ = "8. Pass."
         free = "9. Free action (exchange resources)."
+        undo = "10. Undo your previous turn."
 
         # Value is a list with the function and the arguments it needs.
         options = {
@@ -597,8 +603,27 @@ class Player:
             "6": [self.pq, gp, rnd],
             "7": [self.special, gp, rnd],
             "8": [self.pass_, gp, rnd],
-            "9": [self.free]
+            "9": [self.free],
+            "10": [self.undo_turn, gp]
         }
+        menu = [
+            "mine",
+            "gaia",
+            "upgrade",
+            "federation",
+            "research",
+            "pq",
+            "special",
+            "pass",
+            "free",
+            "undo",
+        ]
+
+        # Bots don't get to undo their turns.
+        if not decisions.channel.can_undo:
+            del options["10"]
+            menu.remove("undo")
+            undo = ""
 
         while True:
             # Summary of resources
@@ -632,12 +657,13 @@ class Player:
                 f"{pq}{filler(pq)}{power_2}\n"
                 f"{special}{filler(special)}{power_3}\n"
                 f"{pass_}{filler(pass_)}{gaia_bowl}\n"
-                f"{free}"
+                f"{free}\n"
+                f"{undo}"
             )
-            print(prompt)
+            print(prompt.rstrip())
 
             if not choice or choice == "0":
-                choice = input("--> ")
+                choice = decisions.menu(menu)
 
             if not choice in options.keys():
                 print("Please type the action's corresponding number.")
@@ -656,7 +682,8 @@ class Player:
             except (
                 e.NotEnoughPowerTokensError,
                 e.NoGaiaFormerError,
-                e.InsufficientKnowledgeError
+                e.InsufficientKnowledgeError,
+                e.NoFederationPossibleError
             ) as ex:
                 print(ex)
                 choice = "0"
@@ -672,6 +699,47 @@ class Player:
                     self.free_actions.clear()
                 return
 
+    def legal_actions(self, gp, rnd):
+        """Every action the player is able to take right now.
+
+        Nothing is asked and nothing changes. See actions.Action for what
+        the actions look like.
+
+        Args:
+            gp: GaiaProject main game object.
+            rnd: Active Round object.
+
+        Returns:
+            List of actions.Action objects.
+        """
+
+        return actions.legal_actions(self, gp, rnd)
+
+    def undo_turn(self, gp):
+        """Undo everything since the start of the previous turn.
+
+        The turns the other players took since then are undone as well. Only
+        turns of the current round can be undone.
+
+        Args:
+            gp: GaiaProject main game object.
+        """
+
+        # The last mark is the start of the current turn.
+        if self not in journal.labels()[:-1]:
+            print("! You have no turn this round that can be undone.")
+            raise e.BackToActionSelection
+
+        journal.undo()
+        while journal.undo() is not self:
+            pass
+
+        # Take the previous turn again.
+        journal.mark(self)
+        gp.universe.redraw(gp.renderer, gp.players)
+        print("\nYour previous turn has been undone.")
+        raise e.BackToActionSelection
+
     def undo_free(self):
         # TODO minor print the totals only and not everything individually??
 
@@ -781,7 +849,7 @@ class Player:
             raise e.BackToActionSelection
 
         # Check if the player has enough resources to pay for the mine.
-        if not self.faction.credits >= 2 and not self.faction.ore >= 1:
+        if self.faction.credits < 2 or self.faction.ore < 1:
             print(
                 f"! You don't have enough credits ({self.faction.credits}) "
                 f"or ore ({self.faction.ore}) to build a mine. Building a mine"
@@ -790,6 +858,7 @@ class Player:
             raise e.BackToActionSelection
 
         print("\nYou want to build a Mine.")
+        planet = False
         while True:
             # Payment flags
             pay_range_qic = 0
@@ -798,6 +867,10 @@ class Player:
 
             if not p_chosen:
                 planet = self.choose_planet(gp.universe, action)
+            elif planet:
+                # The planet from scoring.ExtraRange can't get a mine, let the
+                # player choose again there instead of checking it forever.
+                raise e.ExtraRangeError
             else:
                 planet = p_chosen
 
@@ -809,11 +882,7 @@ class Player:
             # if a planet that needs terraforming was actually chosen.
             # I think you MUST place on a planet that can be terraformed, but
             # i am not sure. For now it will be like this.
-            if (
-                terraform_steps
-                and planet.type == self.faction.home_type
-                and not planet.type in C.HOME_TYPES
-            ):
+            if terraform_steps and planet.type == self.faction.home_type:
                 print(
                     "! When you gain terraform steps, you MUST build a mine on"
                     " a planet that has to be terraformed. Please choose a "
@@ -857,7 +926,7 @@ class Player:
 
                 choose_another_planet = False
                 while True:
-                    pay_qic = input("--> ").lower()
+                    pay_qic = decisions.yes_no().lower()
 
                     if not pay_qic in ['y', 'n']:
                         print("! Please type Y for yes or N for no.")
@@ -935,7 +1004,7 @@ class Player:
                     )
 
                     while True:
-                        pay_terraform_cost = input("--> ").lower()
+                        pay_terraform_cost = decisions.yes_no().lower()
 
                         if not pay_terraform_cost in ['y', 'n']:
                             print("! Please type Y for yes or N for no.")
@@ -972,7 +1041,7 @@ class Player:
             self.resolve_cost("ore1")
 
         gp.universe.place_structure(
-            gp.screen, planet, self.faction.home_type, "Mine"
+            gp.renderer, planet, self.faction.home_type, "Mine"
         )
 
         planet.owner = self.faction.name
@@ -1031,30 +1100,41 @@ class Player:
                 a mine since it won't show planets that are owned by opponents.
         """
 
-        # more players TODO only for 2p right now
-        back_to_action = "Type 8 if you want to choose a different action."
+        # The number after the last sector is used for going back.
+        sector_numbers = [str(number) for number in universe.sectors]
+        back = str(len(sector_numbers) + 1)
+        back_to_action = (
+            f"Type {back} if you want to choose a different action."
+        )
         if action.startswith("boost"):
             back_to_action = (
-                "Type 8 if you want to choose a different Special action."
+                f"Type {back} if you want to choose a different Special "
+                "action."
             )
-        choose_range = "1-8"
+        choose_range = f"1-{back}"
         if action == "start_mine":
             back_to_action = ""
-            choose_range = "1-7"
+            choose_range = f"1-{len(sector_numbers)}"
 
         sector = (
             "Please type the number of the sector your chosen planet "
             f"is in. {back_to_action}\n--> "
         )
+        sector_options = [
+            decisions.Option(number, f"Sector {number}", int(number))
+            for number in sector_numbers
+        ]
+        if not action == "start_mine":
+            sector_options.append(
+                decisions.Option(back, "Choose a different action.")
+            )
         while True:
-            sector_choice = input(sector)
+            sector_choice = decisions.ask("menu", sector_options, sector)
 
-            if sector_choice == "8" and not action == "start_mine":
+            if sector_choice == back and not action == "start_mine":
                 raise e.BackToActionSelection
 
-            if not sector_choice in C.SECTORS_2P:
-                # More players TODO make this message dynamic to the board.
-                # If playing with more players it would be 1-10 for example.
+            if not sector_choice in sector_numbers:
                 print(f"! Please only type {choose_range}.")
                 continue
 
@@ -1077,7 +1157,11 @@ class Player:
             print(f"{i + 1}. Go back to sector selection.")
 
             while True:
-                chosen_planet = input("--> ")
+                chosen_planet = decisions.menu(planets, [
+                    decisions.Option(
+                        f"{i + 1}", "Go back to sector selection."
+                    )
+                ])
                 if chosen_planet in [str(n + 1) for n in range(i)]:
                     planet = planets[int(chosen_planet) - 1]
                     return planet
@@ -1102,25 +1186,10 @@ class Player:
                 player has to the target_hex.
         """
 
-        all_distances = []
-        for owned_planet in self.empire:
-            startx = owned_planet.location[0]
-            starty = owned_planet.location[1]
-
-            targetx = target_hex.location[0]
-            targety = target_hex.location[1]
-
-            distance = universe.distance(startx, starty, targetx, targety)
-            all_distances.append(distance)
-
-            # If the distance of the planet to one of the players planets
-            # is ever smaller or equal to the amount of range the player
-            # has, the planet is close enough.
-            if distance <= available_range:
-                return True, distance
-        else:
-            distance = min(all_distances)
-            return False, distance
+        # The distance field of the frontier already knows the distance to
+        # the closest planet of the empire.
+        distance = self.frontier.distance(target_hex)
+        return distance <= available_range, distance
 
     def ask_pay_for_range(self,
                           target_hex,
@@ -1173,7 +1242,7 @@ class Player:
         )
 
         while True:
-            increase_range = input("--> ").lower()
+            increase_range = decisions.yes_no().lower()
 
             if not increase_range in ['y', 'n']:
                 print("! Please type Y for yes or N for no.")
@@ -1220,12 +1289,17 @@ class Player:
             )
 
         print("\nYou want to start a Gaia Project.")
+        planet = False
         while True:
             # Payment flag
             pay_range_qic = False
 
             if not p_chosen:
                 planet = self.choose_planet(gp.universe, action)
+            elif planet:
+                # The planet from scoring.ExtraRange is out of reach, let the
+                # player choose again there instead of checking it forever.
+                raise e.ExtraRangeError
             else:
                 planet = p_chosen
 
@@ -1268,7 +1342,7 @@ class Player:
             self.resolve_cost(f"qic{pay_range_qic}")
 
         gp.universe.place_structure(
-            gp.screen, planet, self.faction.home_type, "Gaiaformer"
+            gp.renderer, planet, self.faction.home_type, "Gaiaformer"
         )
 
         planet.owner = self.faction.name
@@ -1308,14 +1382,21 @@ class Player:
             "Research Lab": "Academy --> 6 Credits | 6 Ore"
         }
 
-        planets = [
-            planet for planet in self.empire
-                if planet.type != "Lost Planet"
-                    and planet.structure != "Planetary Institute"
-                    and planet.structure != "Academy"
-        ]
+        planets = (
+            gp.universe.index.query(
+                owner=self.faction.name,
+                structure=["Mine", "Trading Station", "Research Lab"]
+            )
+            - gp.universe.index.query(type_="Lost Planet")
+        )
+        if not planets:
+            print("! You have no structures that can be upgraded.")
+            raise e.BackToActionSelection
+
         # Sort on sector and then on planet num.
-        planets.sort(key=lambda planet: (planet.sector, planet.num))
+        planets = sorted(
+            planets, key=lambda planet: (planet.sector, planet.num)
+        )
         for i, planet in enumerate(planets, start=1):
             planet_info = (
                 f"{i}. Sector: {planet.sector} "
@@ -1339,7 +1420,9 @@ class Player:
 
         # Choose a planet
         while True:
-            chosen_planet = input("--> ")
+            chosen_planet = decisions.menu(planets, [
+                decisions.Option(f"{i + 1}", "Go back to action selection.")
+            ])
             if chosen_planet in [str(n + 1) for n in range(i)]:
                 planet_to_upgrade = planets[int(chosen_planet) - 1]
                 break
@@ -1392,7 +1475,7 @@ class Player:
             self.resolve_cost(f"ore2")
 
             gp.universe.place_structure(
-                gp.screen,
+                gp.renderer,
                 planet_to_upgrade,
                 self.faction.home_type,
                 "Trading Station"
@@ -1433,7 +1516,14 @@ class Player:
             print(f"{i + 1}. Choose a different structure.")
 
             while True:
-                chosen_structure = input("--> ")
+                chosen_structure = decisions.menu(
+                    upgrade_options["Trading Station"],
+                    [
+                        decisions.Option(
+                            f"{i + 1}", "Choose a different structure."
+                        )
+                    ]
+                )
                 if chosen_structure in [str(n + 1) for n in range(i)]:
                     new_structure = upgrade_options["Trading Station"] \
                         [int(chosen_structure) - 1]
@@ -1470,7 +1560,7 @@ class Player:
                 self.resolve_cost("ore4")
 
                 gp.universe.place_structure(
-                    gp.screen,
+                    gp.renderer,
                     planet_to_upgrade,
                     self.faction.home_type,
                     "Planetary Institute"
@@ -1525,7 +1615,7 @@ class Player:
                 self.resolve_cost("ore3")
 
                 gp.universe.place_structure(
-                    gp.screen,
+                    gp.renderer,
                     planet_to_upgrade,
                     self.faction.home_type,
                     "Research Lab"
@@ -1570,7 +1660,12 @@ class Player:
                 print(f"{i + 1}. Choose a different structure to upgrade.")
 
                 while True:
-                    chosen_side = input("--> ")
+                    chosen_side = decisions.menu(["Left", "Right"], [
+                        decisions.Option(
+                            f"{i + 1}",
+                            "Choose a different structure to upgrade."
+                        )
+                    ])
                     if chosen_side in [str(n + 1) for n in range(i)]:
                         if chosen_side == "1":
                             chosen_academy = self.faction.academy_income
@@ -1601,7 +1696,7 @@ class Player:
             self.resolve_cost("ore6")
 
             gp.universe.place_structure(
-                gp.screen,
+                gp.renderer,
                 planet_to_upgrade,
                 self.faction.home_type,
                 "Academy"
@@ -1635,7 +1730,16 @@ class Player:
             f"to {a_an} {new}."
         )
 
-    def resolve_technology_tile(self, research_board, rnd, gp, pq=False):
+    def technology_tiles(self, research_board):
+        """Technology tiles the player is able to choose from.
+
+        Args:
+            research_board: Research object.
+
+        Returns:
+            List with standard and advanced technology tiles.
+        """
+
         available = []
         for track in research_board.tech_tracks:
             # Check for available standard technology tiles connected to a
@@ -1664,6 +1768,10 @@ class Player:
                 or self.covered_standard_technology
             ):
                 available.append(tile)
+        return available
+
+    def resolve_technology_tile(self, research_board, rnd, gp, pq=False):
+        available = self.technology_tiles(research_board)
 
         # Ask the player which of the available tiles they want to pick.
         print(
@@ -1679,7 +1787,9 @@ class Player:
                 print(f"{i}. {tile}")
             print(f"{i + 1}. {abort}")
 
-            chosen_tile = input("--> ")
+            chosen_tile = decisions.menu(available, [
+                decisions.Option(f"{i + 1}", abort)
+            ])
             if chosen_tile in [str(n + 1) for n in range(i)]:
                 selected_tile = available[int(chosen_tile) - 1]
             elif chosen_tile == f"{i + 1}":
@@ -1724,7 +1834,15 @@ class Player:
                 print(f"{i + 1}. Choose a different technology tile.")
 
                 while True:
-                    chosen_std_tile = input("--> ")
+                    chosen_std_tile = decisions.menu(
+                        self.standard_technology,
+                        [
+                            decisions.Option(
+                                f"{i + 1}",
+                                "Choose a different technology tile."
+                            )
+                        ]
+                    )
                     if chosen_std_tile in [str(n + 1) for n in range(i)]:
                         selected_std_tile = (
                             self.standard_technology[int(chosen_std_tile) - 1]
@@ -1841,36 +1959,39 @@ class Player:
             rnd: Active Round object.
         """
 
-        # TODO SOMEDAY this function only gives a federation tile now.
-        #   It doesn't set the federation property of planets and doesn't place
-        #   satellites on spaces, but just keeps track of total satellites.
-        # TODO MOST STRUCTURES IN FEDERATIONS end scoring tile must be done
-        # manually right now.
         # TODO faction compatibility IVITS pay qic to pay for federations.
+        solver = gp.universe.federation_solver
+        options = solver.options(self)
+        if not options:
+            raise e.NoFederationPossibleError(
+                "! You can't form a Federation right now. You need structures "
+                "with a power value of at least 7 and enough Power Tokens to "
+                "connect them with satellites. Please pick a different action."
+            )
+
         print(
-            "\nUse your own judgement when forming a Federation as this is "
-            "not yet implemented.\nHow many satellites did forming your "
-            "federation take? Forming a Federation costs Power Tokens."
+            "\nWhich Federation do you want to form? Forming a Federation "
+            "costs a Power Token for every satellite. Please type your chosen "
+            "Federation's corresponding number."
         )
+        for i, option in enumerate(options, start=1):
+            print(f"{i}. {option}")
+        print(f"{i + 1}. Go back to action selection.")
 
         while True:
-            amount = input("--> ")
-
-            try:
-                amount = int(amount)
-            except ValueError:
-                print("! Please only type a number.")
+            federation_choice = decisions.menu(options, [
+                decisions.Option(f"{i + 1}", "Go back to action selection.")
+            ])
+            if federation_choice in [str(n + 1) for n in range(i)]:
+                chosen_federation = options[int(federation_choice) - 1]
+                break
+            elif federation_choice == f"{i + 1}":
+                raise e.BackToActionSelection
+            else:
+                print("! Please only type one of the available numbers.")
                 continue
 
-            if not self.faction.count_powertokens() >= amount:
-                print(
-                    "! You don't have enough Power Tokens to make that "
-                    "Federation. Please make a Federation that requires less "
-                    "satellites."
-                )
-                continue
-            else:
-                break
+        amount = len(chosen_federation.satellites)
 
         print(
             "\nPlease type your chosen Federation token's corresponding "
@@ -1888,7 +2009,9 @@ class Player:
         print(f"{i + 1}. Go back to action selection.")
 
         while True:
-            fed_token = input("--> ")
+            fed_token = decisions.menu(available_tokens, [
+                decisions.Option(f"{i + 1}", "Go back to action selection.")
+            ])
             if fed_token in [str(n + 1) for n in range(i)]:
                 chosen_fed_token = available_tokens[int(fed_token) - 1]
                 break
@@ -1899,6 +2022,12 @@ class Player:
                 continue
 
         self.resolve_cost(f"powertoken{amount}")
+        solver.form(self, chosen_federation)
+        for space in chosen_federation.satellites:
+            gp.universe.place_satellite(
+                gp.renderer, space, self.faction.home_type
+            )
+
         self.federations.append(chosen_fed_token)
         chosen_fed_token.count -= 1
         self.resolve_gain(
@@ -1963,7 +2092,11 @@ class Player:
         )
         while True:
             if not isinstance(tech_tile, str):
-                track_choice = input(f"{options}--> ")
+                track_choice = decisions.menu(
+                    [track.name for track in research_board.tech_tracks],
+                    [decisions.Option("7", "Go back to action selection.")],
+                    f"{options}--> "
+                )
             else:
                 track_choice = tech_tile
 
@@ -2122,7 +2255,21 @@ class Player:
                 f"{cancel}"
             )
             print(prompt)
-            action = input("--> ")
+            action = decisions.menu(
+                [
+                    knowledge3,
+                    terraform2,
+                    ore2,
+                    credits7,
+                    knowledge2,
+                    terraform1,
+                    powertoken2,
+                    tech_tile,
+                    score_fed_token,
+                    vp_for_ptypes,
+                ],
+                [decisions.Option("11", cancel)]
+            )
 
             if action == "11":
                 raise e.BackToActionSelection
@@ -2224,7 +2371,7 @@ class Player:
                     continue
 
                 try:
-                    self.mine(gp, rnd, 2, "pq")
+                    self.mine(gp, rnd, 1, "pq")
                 except e.BackToActionSelection:
                     # Player want to do a different pq action.
                     continue
@@ -2280,7 +2427,11 @@ class Player:
 
                 chosen = False
                 while True:
-                    chosen_token = input("--> ")
+                    chosen_token = decisions.menu(self.federations, [
+                        decisions.Option(
+                            f"{i + 1}", "Go back to action selection."
+                        )
+                    ])
                     if chosen_token in [str(n + 1) for n in range(i)]:
                         chosen = True
                         break
@@ -2394,7 +2545,9 @@ class Player:
         print(f"{i + 1}. Go back to action selection.")
 
         while True:
-            chosen_special = input("--> ")
+            chosen_special = decisions.menu(special_actions, [
+                decisions.Option(f"{i + 1}", "Go back to action selection.")
+            ])
             if chosen_special in [str(n + 1) for n in range(i)]:
                 special = special_actions[int(chosen_special) - 1]
                 break
@@ -2458,7 +2611,7 @@ class Player:
                 ):
                     print(f"{i}. {booster}")
 
-                booster_choice = input(f"--> ")
+                booster_choice = decisions.menu(gp.scoring_board.boosters)
                 if booster_choice in [str(n + 1) for n in range(3)]:
                     # Add old booster to the right of the unused boosters.
                     gp.scoring_board.boosters.append(self.booster)
@@ -2607,7 +2760,12 @@ class Player:
                 f"{i + 2}. Go back to action selection."
             )
 
-            chosen_free = input("--> ")
+            chosen_free = decisions.menu(list(free_actions.keys()), [
+                decisions.Option(
+                    f"{i + 1}", "Undo all Free actions taken this turn."
+                ),
+                decisions.Option(f"{i + 2}", "Go back to action selection."),
+            ])
             if chosen_free in [str(n + 1) for n in range(i)]:
                 cost = list(free_actions.keys())[int(chosen_free) - 1]
                 cost_exchange = free_actions[cost]
@@ -0,0 +1,62 @@
+class Renderer:
+    """Interface between the game and whatever shows the universe.
+
+    The game only tells the renderer which image goes where. Images are
+    identified by their path, so a renderer that doesn't show anything
+    never has to load them.
+    """
+
+    # True if nothing is shown, so images (like the universe map) don't have
+    # to be made at all.
+    headless = False
+
+    def draw_image(self, path, dest, area=None):
+        """Draw (a part of) an image.
+
+        Args:
+            path (str): Path to the image file.
+            dest: (x, y) position in pixels of the top left corner.
+            area: Optional (x, y, width, height) part of the image to draw.
+        """
+
+        raise NotImplementedError
+
+    def set_board_size(self, size):
+        """Tell the renderer how big the universe map is.
+
+        Args:
+            size: (width, height) of the map in pixels.
+        """
+
+        pass
+
+    def forget_image(self, path):
+        """Tell the renderer an image file was rewritten.
+
+        Args:
+            path (str): Path to the image file.
+        """
+
+        pass
+
+    def preload(self, paths):
+        """Start getting images ready before they are drawn.
+
+        Args:
+            paths (list): Paths to the image files.
+        """
+
+        pass
+
+
+class HeadlessRenderer(Renderer):
+    """Renderer that doesn't show anything.
+
+    Used for simulations and games on a server. Nothing is loaded or drawn
+    and pygame is never imported.
+    """
+
+    headless = True
+
+    def draw_image(self, path, dest, area=None):
+        pass
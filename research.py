@@ -3,10 +3,11 @@ import random
 import exceptions as e
 import technology as t
 from federation import FederationToken
+from journal import Journaled
 from universe import LostPlanet
 
 
-class Level:
+class Level(Journaled):
     """One single level on the technology track."""
 
     def __init__(self, name, active=False, when=False, reward=False):
@@ -38,7 +39,7 @@ class Level:
         return f"{self.name[-1]}. {players}"
 
 
-class TechTrack:
+class TechTrack(Journaled):
     """Class for most common similarities between tech track objects."""
 
     def __init__(self, name):
@@ -249,7 +250,7 @@ class Science(TechTrack):
         self.level5 = Level("level5", False, "direct", "knowledge9")
 
 
-class Research:
+class Research(Journaled):
     """Research board."""
 
     def __init__(self):
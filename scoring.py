@@ -1,10 +1,12 @@
 import random
 
 import constants as C
+import decisions
 import exceptions as e
+from journal import Journaled
 
 
-class Booster:
+class Booster(Journaled):
 
     def __init__(self, img, income1=False, income2=False,
                  special=False, vp=False):
@@ -113,7 +115,7 @@ class ExtraRange(Booster):
                 # Player wants to start a gaia Project.
                 else:
                     player.gaia(
-                        gp.universe,
+                        gp,
                         p_chosen=planet,
                         action=action,
                         extra_range=3
@@ -152,7 +154,7 @@ class EndScoring:
         return self.goal
 
 
-class Scoring:
+class Scoring(Journaled):
     """Scoring board."""
 
     def __init__(self):
@@ -233,18 +235,45 @@ class Scoring:
             # Used for determining the winner and for shared places.
             scores = []
             for player in gp.players:
+                # Planets with a structure on them. A Gaiaformer isn't a
+                # structure.
+                index = gp.universe.index
+                empire = (
+                    index.query(owner=player.faction.name)
+                    - index.query(structure="Gaiaformer")
+                )
+
+                # Amounts for the planet types, gaia planets and sectors goals.
+                amounts = (gp.universe.board or index).end_scoring(
+                    player.faction.name
+                )
+
                 if end_tile.goal == "structures_federation":
                     if type(player).__name__ == "Automa":
                         end_tile_score = len(player.empire) - 1
-                        scores.append([player, end_tile_score])
                     else:
-                        print(
-                            f"{player.faction.name}, how many structures that "
-                            "are part of a Federation do you have?"
+                        federated = gp.universe.federation_solver.federated(
+                            player
                         )
+                        end_tile_score = len(
+                            {planet.location for planet in empire} & federated
+                        )
+                    scores.append([player, end_tile_score])
+
+                elif end_tile.goal == "structures":
+                    end_tile_score = len(player.empire)
+                    scores.append([player, end_tile_score])
 
+                elif end_tile.goal in ["planet_types", "gaia_planets",
+                                       "sectors"]:
+                    end_tile_score = amounts[end_tile.goal]
+                    scores.append([player, end_tile_score])
+
+                elif end_tile.goal == "satellites":
+                    if type(player).__name__ == "Automa":
+                        print("How many satellites does the Automa have?")
                         while True:
-                            end_tile_score = input("--> ")
+                            end_tile_score = decisions.number()
 
                             try:
                                 end_tile_score = int(end_tile_score)
@@ -253,57 +282,8 @@ class Scoring:
                                 continue
                             else:
                                 break
-
-                        scores.append([player, end_tile_score])
-
-                elif end_tile.goal == "structures":
-                    end_tile_score = len(player.empire)
-                    scores.append([player, end_tile_score])
-
-                elif end_tile.goal == "planet_types":
-                    end_tile_score = len(
-                        {planet.type for planet in player.empire}
-                    )
-                    scores.append([player, end_tile_score])
-
-                elif end_tile.goal == "gaia_planets":
-                    end_tile_score = len(
-                        [
-                            planet for planet in player.empire
-                                if planet.type == "Gaia"
-                                and planet.strucure != "Gaiaformer"
-                        ]
-                    )
-                    scores.append([player, end_tile_score])
-
-                elif end_tile.goal == "sectors":
-                    end_tile_score = len(
-                        {planet.sector for planet in player.empire}
-                    )
-                    scores.append([player, end_tile_score])
-
-                elif end_tile.goal == "satellites":
-                    if type(player).__name__ == "Automa":
-                        message = (
-                            "How many satellites does the Automa have?"
-                        )
                     else:
-                        message = (
-                            f"{player.faction.name}, how many satellites do "
-                            "you have?"
-                        )
-
-                    print(message)
-                    while True:
-                        end_tile_score = input("--> ")
-
-                        try:
-                            end_tile_score = int(end_tile_score)
-                        except ValueError:
-                            print("! Please only type a number.")
-                            continue
-                        else:
-                            break
+                        end_tile_score = player.satellites
                     scores.append([player, end_tile_score])
 
             place123 = False
@@ -1,3 +1,7 @@
 """Module to keep all the customizable settings."""
 
 wait_time = 2  # Seconds
+
+# File the render statistics are written to once per second as lines of
+# JSON, or False to not write them.
+stats_file = False
@@ -0,0 +1,198 @@
+"""Play complete games against the Automa without a window or a human.
+
+Every game gets its own seed and a policy that answers all the decisions
+of the human seat. The games are spread over a pool of processes, one game
+at a time per process, and every result is written as a line of JSON as
+soon as the game is done:
+
+    python simulate.py 1000 --policy random --difficulty Automa
+
+A result looks like this:
+    {
+        "seed": 7, "policy": "random", "difficulty": "Automa",
+        "result": "finished",  # or "error"
+        "error": false,  # or the last line of the traceback
+        "decisions": 412, "seconds": 0.21,
+        "vp": {"Hadsch Halla": 61, "Taklons": 84},
+        "rounds": [{"Hadsch Halla": ["booster", 14], "Taklons": [...]}, ...]
+    }
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import time
+import traceback
+
+import constants as C
+import decisions
+import exceptions as e
+from gaia_project import GaiaProject
+from render import HeadlessRenderer
+
+# Highest amount of decisions in one game. Bots that keep going back to the
+# same menu never finish, so the game is stopped with an error.
+MAX_DECISIONS = 20000
+
+
+def random_policy(rng):
+    """Pick one of the allowed answers at random."""
+
+    def decide(decision):
+        if decision.kind == "number":
+            return str(rng.randrange(5))
+        return rng.choice(decision.options)
+    return decide
+
+
+def first_policy(rng):
+    """Always pick the first allowed answer."""
+
+    def decide(decision):
+        if decision.kind == "number":
+            return "0"
+        return decision.options[0]
+    return decide
+
+
+# Name: function that gets a random.Random and returns a function that
+# answers a Decision (see decisions.BotChannel).
+POLICIES = {
+    "random": random_policy,
+    "first": first_policy,
+}
+
+
+def limit(decide, maximum=MAX_DECISIONS):
+    """Stop a policy with an error after a maximum amount of decisions.
+
+    Returns:
+        (decide function, list with the amount of decisions made).
+    """
+
+    count = [0]
+
+    def limited(decision):
+        count[0] += 1
+        if count[0] > maximum:
+            raise e.NoMoreAnswersError(
+                f"No result after {maximum} decisions."
+            )
+        return decide(decision)
+    return limited, count
+
+
+def play_game(seed, policy="random", difficulty="Automa"):
+    """Play one game with the human seat answered by a policy.
+
+    Args:
+        seed (int): Seed for the setup, the Automa deck and the policy.
+        policy (str): Name of one of the POLICIES.
+        difficulty (str): One of constants.DIFFICULTY.
+
+    Returns:
+        The result as a dictionary, see the top of this file.
+    """
+
+    random.seed(seed)
+    decide, count = limit(POLICIES[policy](random.Random(seed)))
+    decisions.use(decisions.BotChannel(decide))
+
+    result = {
+        "seed": seed,
+        "policy": policy,
+        "difficulty": difficulty,
+        "result": "finished",
+        "error": False,
+    }
+    start = time.perf_counter()
+    game = False
+    try:
+        # Nobody reads what the game prints.
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            game = GaiaProject(2, HeadlessRenderer(), automa=True)
+            game.player_setup(difficulty)
+            game.play()
+    except Exception:
+        result["result"] = "error"
+        result["error"] = traceback.format_exc().strip().splitlines()[-1]
+
+    result["decisions"] = count[0]
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    if game:
+        result["vp"] = {
+            player.faction.name: player.vp for player in game.players
+        }
+        result["rounds"] = game.history
+    return result
+
+
+def play_job(job):
+    # Pool.imap only passes one argument.
+    return play_game(*job)
+
+
+def simulate(games, output, policy="random", difficulty="Automa",
+             first_seed=0, processes=None):
+    """Play games on all cores and write the results as lines of JSON.
+
+    Args:
+        games (int): Amount of games.
+        output (str): File the results are added to.
+        policy (str): Name of one of the POLICIES.
+        difficulty (str): One of constants.DIFFICULTY.
+        first_seed (int): Seed of the first game, the next ones count up.
+        processes (int): Amount of processes or None for one per core.
+
+    Returns:
+        Amount of finished games.
+    """
+
+    jobs = [
+        (seed, policy, difficulty)
+        for seed in range(first_seed, first_seed + games)
+    ]
+    finished = 0
+    with open(output, "a") as file, \
+            multiprocessing.Pool(processes) as pool:
+        # One game at a time per process, so a long game doesn't hold up
+        # the others. The results come in the order they finish.
+        for result in pool.imap_unordered(play_job, jobs, chunksize=1):
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+            if result["result"] == "finished":
+                finished += 1
+    return finished
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("games", type=int, help="amount of games to play")
+    parser.add_argument("--output", default="simulations.jsonl")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument(
+        "--difficulty", choices=C.DIFFICULTY, default="Automa"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    finished = simulate(
+        args.games,
+        args.output,
+        args.policy,
+        args.difficulty,
+        args.seed,
+        args.processes,
+    )
+    print(
+        f"Finished {finished} of {args.games} games in "
+        f"{time.perf_counter() - start:.1f} seconds, "
+        f"{args.games - finished} ended with an error. The results are in "
+        f"{args.output}."
+    )
@@ -0,0 +1,325 @@
+"""Snapshot of a running game without the screen.
+
+Deep copying a GaiaProject object would copy the renderer, the images of
+the universe and every cross reference between the players and the boards.
+A GameState only keeps the parts that change during a game, as tuples (and
+read-only arrays for the Board), next to references to the objects they
+belong to:
+
+    state = GameState(gp)  # Take a snapshot.
+    copy = state.clone()  # Cheap, the tuples are shared.
+    ...  # Play on.
+    state.restore(gp)  # Put the game back the way it was.
+
+Nothing in a GameState is ever changed after it's made, so clones can share
+everything and a clone costs about as much as creating an empty object.
+"""
+
+import copy
+
+import exceptions as e
+from universe import Space
+
+# Marks a property that an object doesn't have, for example the Automa
+# doesn't have lost_planet and the Player doesn't have a deck.
+MISSING = object()
+
+# Properties of Player and Automa objects that are replaced, not changed.
+PLAYER_FIELDS = [
+    "vp",
+    "passed",
+    "booster",
+    "satellites",
+    "lost_planet",
+    "terraforming",
+    "navigation",
+    "a_i",
+    "gaia_project",
+    "economy",
+    "science",
+    "support_card",
+    "action_card",
+]
+
+# Properties of Player and Automa objects that are lists.
+LIST_FIELDS = [
+    "empire",
+    "gaia_forming",
+    "standard_technology",
+    "covered_standard_technology",
+    "advanced_technology",
+    "federations",
+    "current_deck",
+    "remaining_deck",
+    "discard_deck",
+]
+
+# Properties of Faction objects that change during a game. The Automa
+# factions count the structures that are still available instead.
+FACTION_FIELDS = [
+    "credits",
+    "ore",
+    "knowledge",
+    "qic",
+    "gaiaformer",
+    "bowl1",
+    "bowl2",
+    "bowl3",
+    "gaia_bowl",
+    "mine_built",
+    "trading_station_built",
+    "research_lab_built",
+    "academy_built",
+    "planetary_institute_built",
+    "mine_available",
+    "trading_station_available",
+    "research_lab_available",
+    "academy_available",
+    "planetary_institute_available",
+    "free_actions",
+]
+
+# Lists of Faction objects with the state of the Academies.
+ACADEMY_FIELDS = ["academy_income", "academy_special"]
+
+# Fields of a planet that live in the Board arrays.
+BOARD_FIELDS = ["owner", "type", "structure", "federation"]
+
+
+class GameState:
+    """Everything that changes during a game.
+
+    Attributes:
+        players: Player objects in turn order.
+        player_states: For every player (in the same order):
+            (PLAYER_FIELDS values, LIST_FIELDS tuples, FACTION_FIELDS values,
+            Academy flags, free actions taken, Frontier state).
+        board: {field: array} when the universe has a Board, otherwise
+            ((planet, owner, type, structure, federation), ...).
+        planet_count: Amount of planets, to notice the Lost Planet.
+        planet_extras: ((planet, neighbours, gaiaformed), ...) for the planets
+            that have any.
+        satellites: ((space, satellites), ...) for the spaces that have any.
+        levels: Level objects of the research board with the faction names
+            on them.
+        pq_actions: Power/Q.I.C. actions that are still available.
+        boosters: Boosters that nobody has.
+        tokens: (FederationToken, count, side) for every token.
+        used: Boosters and technology tiles with their used flag.
+        passed: GaiaProject.passed.
+    """
+
+    def __init__(self, gp):
+        """Take a snapshot of a game.
+
+        Args:
+            gp: GaiaProject main game object.
+        """
+
+        universe = gp.universe
+        self.players = tuple(gp.players)
+        self.player_states = tuple(
+            capture_player(player) for player in gp.players
+        )
+
+        board = universe.board
+        if board:
+            self.board = {}
+            for field in BOARD_FIELDS:
+                array = getattr(board, field).copy()
+                array.flags.writeable = False
+                self.board[field] = array
+        else:
+            self.board = tuple(
+                (
+                    planet,
+                    planet.owner,
+                    planet.type,
+                    planet.structure,
+                    planet.federation,
+                )
+                for planet in universe.planet_list
+            )
+        self.planet_count = len(universe.planet_list)
+
+        self.planet_extras = tuple(
+            (
+                planet,
+                tuple(planet.neighbours),
+                getattr(planet, "gaiaformed", False),
+            )
+            for planet in universe.planet_list
+                if planet.neighbours or getattr(planet, "gaiaformed", False)
+        )
+        self.satellites = tuple(
+            (space, tuple(space.satellites))
+            for space in spaces(universe) if space.satellites
+        )
+
+        research_board = gp.research_board
+        self.levels = tuple(
+            (level, tuple(level.players)) for level in levels(research_board)
+        )
+        self.pq_actions = tuple(research_board.pq_actions.items())
+        self.boosters = tuple(gp.scoring_board.boosters)
+        self.tokens = tuple(
+            (token, token.count, token.state) for token in gp.federation_tokens
+        )
+        self.used = tuple(
+            (thing, thing.used) for thing in usable(gp)
+        )
+        self.passed = getattr(gp, "passed", 0)
+
+    def clone(self):
+        """A copy of this snapshot.
+
+        Returns:
+            GameState object that shares all its tuples with this one.
+        """
+
+        return copy.copy(self)
+
+    def restore(self, gp):
+        """Put the game back the way it was when the snapshot was taken.
+
+        Args:
+            gp: GaiaProject main game object the snapshot was taken of.
+        """
+
+        universe = gp.universe
+        if len(universe.planet_list) != self.planet_count:
+            raise e.StateRestoreError(
+                "The Lost Planet was placed after or before this snapshot. "
+                "It can't be taken off the board again."
+            )
+
+        # Planets first. Changing them updates the PlanetIndex and the
+        # frontiers, the frontiers are put back below anyway.
+        if universe.board:
+            restore_board(universe.board, self.board)
+        else:
+            for planet, *values in self.board:
+                for field, value in zip(BOARD_FIELDS, values):
+                    if getattr(planet, field) != value:
+                        setattr(planet, field, value)
+
+        extras = {planet: rest for planet, *rest in self.planet_extras}
+        for planet in universe.planet_list:
+            neighbours, gaiaformed = extras.get(planet, ((), False))
+            planet.neighbours = list(neighbours)
+            if hasattr(planet, "gaiaformed"):
+                planet.gaiaformed = gaiaformed
+
+        satellites = dict(self.satellites)
+        for space in spaces(universe):
+            space.satellites = list(satellites.get(space, ()))
+
+        gp.players[:] = self.players
+        for player, player_state in zip(self.players, self.player_states):
+            restore_player(player, player_state)
+
+        for level, players in self.levels:
+            level.players[:] = players
+        gp.research_board.pq_actions.update(self.pq_actions)
+        gp.scoring_board.boosters[:] = self.boosters
+        for token, count, state in self.tokens:
+            token.count = count
+            token.state = state
+        for thing, used in self.used:
+            thing.used = used
+        gp.passed = self.passed
+
+
+def capture_player(player):
+    """Snapshot of a Player or Automa object. See GameState.player_states."""
+
+    faction = player.faction
+    return (
+        tuple(getattr(player, name, MISSING) for name in PLAYER_FIELDS),
+        tuple(
+            tuple(getattr(player, name, ())) for name in LIST_FIELDS
+        ),
+        tuple(getattr(faction, name, MISSING) for name in FACTION_FIELDS),
+        tuple(
+            tuple(getattr(faction, name, ())) for name in ACADEMY_FIELDS
+        ),
+        tuple(tuple(action) for action in getattr(player, "free_actions", ())),
+        player.frontier.snapshot(),
+    )
+
+
+def restore_player(player, player_state):
+    fields, lists, faction_fields, academy, free, frontier_state = (
+        player_state
+    )
+
+    for name, value in zip(PLAYER_FIELDS, fields):
+        if value is not MISSING:
+            setattr(player, name, value)
+    for name, values in zip(LIST_FIELDS, lists):
+        if hasattr(player, name):
+            setattr(player, name, list(values))
+
+    faction = player.faction
+    for name, value in zip(FACTION_FIELDS, faction_fields):
+        if value is not MISSING:
+            setattr(faction, name, value)
+
+    # Other code keeps references to these lists, so change them in place.
+    for name, values in zip(ACADEMY_FIELDS, academy):
+        if hasattr(faction, name):
+            getattr(faction, name)[:] = values
+    if hasattr(player, "free_actions"):
+        player.free_actions = [list(action) for action in free]
+
+    player.frontier.restore(frontier_state)
+
+
+def restore_board(board, arrays):
+    """Change the planets whose Board fields differ from the snapshot."""
+
+    # Faction numbers never change once they are given out, so the codes in
+    # the snapshot still mean the same.
+    for field in BOARD_FIELDS:
+        saved = arrays[field]
+        for cell in (getattr(board, field) != saved).nonzero()[0]:
+            # Through the planet, so the PlanetIndex is updated as well.
+            setattr(
+                board.planets[cell], field, board.decode(field, saved[cell])
+            )
+
+
+def spaces(universe):
+    """All Space objects of the universe."""
+
+    return [
+        hex_
+        for sector in universe.sectors.values()
+            for circle in sector.hexes
+                for hex_ in circle
+                    if isinstance(hex_, Space)
+    ]
+
+
+def levels(research_board):
+    """All Level objects of the research board."""
+
+    return [
+        getattr(track, f"level{number}")
+        for track in research_board.tech_tracks
+            for number in range(6)
+    ]
+
+
+def usable(gp):
+    """Boosters and technology tiles that have a used flag."""
+
+    things = list(gp.scoring_board.boosters)
+    for player in gp.players:
+        if player.booster:
+            things.append(player.booster)
+    for track in gp.research_board.tech_tracks:
+        things.append(track.standard)
+        things.append(track.advanced)
+    things += gp.research_board.free_standard_technology
+    return [thing for thing in things if hasattr(thing, "used")]
@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+import assets
+
+# Amount of frames the frame statistics are calculated over.
+HISTORY = 300
+
+
+def percentile(values, percent):
+    """Nearest rank percentile of a sorted list.
+
+    Args:
+        values (list): Sorted numbers.
+        percent (int): 0-100.
+
+    Returns:
+        The percentile or 0 for an empty list.
+    """
+
+    if not values:
+        return 0
+    rank = max(0, -(-len(values) * percent // 100) - 1)
+    return values[min(rank, len(values) - 1)]
+
+
+class RenderStats:
+    """Timings of the render path.
+
+    The main loop reports every frame with end_frame and every blit with
+    count_blit. Functions decorated with timed, like the Universe draw
+    methods, report how long every call took. Those can run on the game
+    thread, so the timings have a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # (frame time in ms, blits, dirty rects) of the last frames.
+        self.frames = deque(maxlen=HISTORY)
+        self.blits = 0  # Blits of the frame that is being drawn.
+
+        # Name: [calls, total seconds, longest call in seconds].
+        self.timings = {}
+
+    def count_blit(self):
+        self.blits += 1
+
+    def end_frame(self, seconds, rects):
+        """Remember a finished frame.
+
+        Args:
+            seconds (float): How long the frame took.
+            rects (int): Amount of dirty rects pushed to the display.
+        """
+
+        self.frames.append((seconds * 1000, self.blits, rects))
+        self.blits = 0
+
+    def record(self, name, seconds):
+        """Add one call of something that is timed.
+
+        Args:
+            name (str): What was timed, for example "place_structure".
+            seconds (float): How long it took.
+        """
+
+        with self.lock:
+            timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def timed(self, name):
+        """Decorator that records how long every call of a function takes."""
+
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """All statistics as a dictionary that can be turned into JSON."""
+
+        frames = list(self.frames)
+        times = sorted(frame[0] for frame in frames)
+        count = len(frames) or 1
+
+        cache = assets.surfaces.stats()
+        loads = cache["hits"] + cache["misses"]
+
+        with self.lock:
+            timings = {
+                name: {
+                    "calls": calls,
+                    "total_ms": total * 1000,
+                    "mean_ms": total * 1000 / calls,
+                    "max_ms": longest * 1000,
+                }
+                for name, (calls, total, longest) in sorted(
+                    self.timings.items()
+                )
+            }
+
+        return {
+            "time": time.time(),
+            "frames": len(frames),
+            "frame_ms": {
+                "p50": percentile(times, 50),
+                "p90": percentile(times, 90),
+                "p99": percentile(times, 99),
+                "max": times[-1] if times else 0,
+            },
+            "blits_per_frame": sum(frame[1] for frame in frames) / count,
+            "rects_per_frame": sum(frame[2] for frame in frames) / count,
+            "cache": {
+                **cache,
+                "hit_rate": cache["hits"] / loads if loads else 0,
+            },
+            "timings": timings,
+        }
+
+    def lines(self):
+        """The statistics as short lines of text for the overlay."""
+
+        snapshot = self.snapshot()
+        frame = snapshot["frame_ms"]
+        cache = snapshot["cache"]
+        lines = [
+            f"frame ms  p50 {frame['p50']:.2f}  p90 {frame['p90']:.2f}  "
+            f"p99 {frame['p99']:.2f}  max {frame['max']:.2f}",
+            f"per frame  blits {snapshot['blits_per_frame']:.1f}  "
+            f"rects {snapshot['rects_per_frame']:.1f}",
+            f"cache  hit rate {cache['hit_rate']:.1%}  "
+            f"({cache['hits']} hits, {cache['misses']} misses)",
+        ]
+        for name, timing in snapshot["timings"].items():
+            lines.append(
+                f"{name}  {timing['calls']}x  mean {timing['mean_ms']:.3f} ms"
+                f"  max {timing['max_ms']:.3f} ms"
+            )
+        return lines
+
+    def write(self, file):
+        """Write the statistics as one line of JSON.
+
+        Args:
+            file: Open text file.
+        """
+
+        file.write(json.dumps(self.snapshot()) + "\n")
+        file.flush()
+
+
+# The statistics of the whole game.
+stats = RenderStats()
+
+
+def timed(name):
+    """Decorator that records every call of a function in stats."""
+
+    return stats.timed(name)
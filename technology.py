@@ -1,4 +1,7 @@
-class StandardTechnology:
+from journal import Journaled
+
+
+class StandardTechnology(Journaled):
 
     def __init__(self, img, when, reward):
         self.img = img
@@ -86,7 +89,7 @@ class TypesKnowledge(StandardTechnology):
         )
 
 
-class AdvancedTechnology:
+class AdvancedTechnology(Journaled):
 
     def __init__(self, img, when=False, effect=False, reward=False):
         self.img = img
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import os
+import random
+import sys
+
+import pytest
+
+# The modules of the game are in the folder above this one.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import decisions
+import simulate
+import universe as universe_module
+from gaia_project import GaiaProject
+from journal import journal
+from player import Player
+from render import HeadlessRenderer
+from universe import Universe
+
+
+@pytest.fixture
+def universe():
+    """The default 2 player universe, without a screen."""
+
+    return Universe(HeadlessRenderer())
+
+
+@pytest.fixture(params=[True, False], ids=["board", "no board"])
+def board(request, monkeypatch):
+    """Play with and without the numpy Board.
+
+    Without numpy the planets store their own fields, which has to give the
+    same game.
+    """
+
+    if not request.param:
+        monkeypatch.setattr(universe_module, "Board", False)
+    elif not universe_module.Board:
+        pytest.skip("numpy isn't installed")
+    return request.param
+
+
+@pytest.fixture
+def play(monkeypatch, board):
+    """Play seeded games of a random bot against the Automa.
+
+    play(seed, turn) plays one game and returns the GaiaProject object.
+    turn(player, gp, rnd, action_phase) is called instead of every action
+    phase of the bot and has to call action_phase() to take the turn.
+    """
+
+    def play(seed, turn):
+        action_phase = Player.action_phase
+
+        def wrapped(self, gp, rnd, choice=False):
+            return turn(
+                self, gp, rnd, lambda: action_phase(self, gp, rnd, choice)
+            )
+
+        monkeypatch.setattr(Player, "action_phase", wrapped)
+        gp = set_up(seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gp.play()
+        return gp
+
+    yield play
+    decisions.use(decisions.ConsoleChannel())
+    journal.forget()
+
+
+@pytest.fixture
+def game():
+    """Set up seeded games against the Automa without playing them.
+
+    game(seed) returns the GaiaProject object right after the factions are
+    chosen. A random bot answers the decisions.
+    """
+
+    yield set_up
+    decisions.use(decisions.ConsoleChannel())
+    journal.forget()
+
+
+def set_up(seed):
+    random.seed(seed)
+    decide, count = simulate.limit(
+        simulate.random_policy(random.Random(seed))
+    )
+    decisions.use(decisions.BotChannel(decide))
+
+    # Nobody reads what the game prints.
+    with contextlib.redirect_stdout(io.StringIO()):
+        gp = GaiaProject(2, HeadlessRenderer(), automa=True)
+        gp.player_setup("Automa")
+    return gp
@@ -0,0 +1,251 @@
+import decisions
+import exceptions as e
+from journal import journal
+from scoring import ExtraRange, Terraform
+from universe import Planet
+
+# Errors the action selection catches when an action can't be taken.
+REJECTED = (
+    e.BackToActionSelection,
+    e.NotEnoughPowerTokensError,
+    e.NoGaiaFormerError,
+    e.InsufficientKnowledgeError,
+    e.NoFederationPossibleError,
+)
+
+
+def follow(wanted):
+    """Bot that answers with the choices of an action.
+
+    Args:
+        wanted (list): Values the bot picks when a menu has them, in order
+            of preference. A decisions.Option is picked by its answer, only
+            once. When that menu comes back, the bot goes back.
+
+    Returns:
+        Function for a decisions.BotChannel. Menus without a wanted value
+        get the first option, except a list of planets without the wanted
+        planet, which goes back. Going back to the sector selection means
+        the planet was refused, so the second time it goes back to the
+        action selection.
+    """
+
+    wanted = list(wanted)
+    sectors = []
+    picked = []  # Menus an Option was picked in.
+    count = [0]
+
+    def decide(decision):
+        count[0] += 1
+        assert count[0] < 1000, "The action keeps asking."
+
+        if decision.kind == "yes_no":
+            return "y"
+        if decision.kind != "menu":
+            return "0"
+
+        values = [option.value for option in decision.options]
+        if decision.options[0].label.startswith("Sector "):
+            sectors.append(decision)
+            if len(sectors) > 1:
+                return decision.options[-1]
+
+        # The same menu again means the picked answer was refused.
+        labels = [option.label for option in decision.options]
+        if labels in picked:
+            return decision.options[-1]
+
+        for value in wanted:
+            if isinstance(value, decisions.Option):
+                for option in decision.options:
+                    if option.answer == value.answer:
+                        wanted.remove(value)
+                        picked.append(labels)
+                        return option
+                continue
+            for option in decision.options:
+                if option.value is value:
+                    return option
+            for option in decision.options:
+                if isinstance(value, str) and option.value == value:
+                    return option
+        if any(isinstance(value, Planet) for value in values):
+            return decision.options[-1]
+        return decision.options[0]
+    return decide
+
+
+def attempt(function, wanted, taken=lambda: True):
+    """Try an action with the follow bot and undo it again.
+
+    Args:
+        function: Function that starts the action.
+        wanted (list): See follow.
+        taken: Function that tells if the action did what was wanted,
+            called before the action is undone.
+
+    Returns:
+        True if the action was taken, False if it was refused.
+    """
+
+    channel = decisions.channel
+    decisions.use(decisions.BotChannel(follow(wanted)))
+    journal.mark("attempt")
+    try:
+        function()
+        return taken()
+    except REJECTED:
+        return False
+    finally:
+        journal.undo()
+        decisions.use(channel)
+
+
+def wanted_values(action, gp):
+    """Values the follow bot has to pick for an action."""
+
+    wanted = []
+    if action.kind == "pq":
+        # The Power/Q.I.C. actions are picked by their number.
+        wanted.append(decisions.Option(str(action.target)))
+    for part in (action.target, action.choice):
+        if part is not False:
+            wanted.append(part)
+        if hasattr(part, "sector"):
+            wanted.insert(0, part.sector)
+    if action.kind == "research":
+        wanted.append(gp.research_board.tech_tracks[action.target].name)
+    if isinstance(action.tile, tuple):
+        wanted += list(action.tile)
+    elif action.tile:
+        wanted.append(action.tile)
+    return wanted
+
+
+def action_functions(player, gp, rnd):
+    """Action kind: function that starts the action."""
+
+    return {
+        "mine": lambda: player.mine(gp, rnd),
+        "gaia": lambda: player.gaia(gp),
+        "upgrade": lambda: player.upgrade(gp, rnd),
+        "research": lambda: player.research(gp.research_board, rnd, gp),
+        "pq": lambda: player.pq(gp, rnd),
+        "special": lambda: player.special(gp, rnd),
+    }
+
+
+def built(player, planet, structure):
+    """Function that tells if the player built a structure on a planet.
+
+    The planet must not have had it before.
+    """
+
+    before = (planet.owner, planet.structure)
+    after = (player.faction.name, structure)
+    return lambda: before != after \
+        and (planet.owner, planet.structure) == after
+
+
+def effect(action, player, gp):
+    """Function that tells if an action did what it was meant to do."""
+
+    if action.kind == "mine":
+        return built(player, action.target, "Mine")
+    if action.kind == "gaia":
+        return built(player, action.target, "Gaiaformer")
+    if action.kind == "upgrade":
+        structure = action.choice
+        if structure in ("Left", "Right"):
+            structure = "Academy"
+        return built(player, action.target, structure)
+    if action.kind == "pq":
+        available = gp.research_board.pq_actions
+        used = lambda: not available[action.target]
+        if isinstance(action.choice, Planet):
+            mine = built(player, action.choice, "Mine")
+            return lambda: used() and mine()
+        return used
+    if action.kind == "special" and isinstance(action.choice, Planet):
+        mine = built(player, action.choice, "Mine")
+        gaia = built(player, action.choice, "Gaiaformer")
+        return lambda: mine() or gaia()
+    return lambda: True
+
+
+def test_legal_actions_are_accepted(play):
+    counts = {}
+
+    def turn(player, gp, rnd, action_phase):
+        functions = action_functions(player, gp, rnd)
+        for action in player.legal_actions(gp, rnd):
+            if action.kind not in functions:
+                continue
+            assert attempt(
+                functions[action.kind],
+                wanted_values(action, gp),
+                effect(action, player, gp),
+            ), str(action)
+            counts[action.kind] = counts.get(action.kind, 0) + 1
+        action_phase()
+
+    for seed in range(5):
+        play(seed, turn)
+
+    # Every kind of action came up in these games.
+    assert set(counts) == {
+        "mine", "gaia", "upgrade", "research", "pq", "special"
+    }
+
+
+def test_only_legal_planets_are_accepted(play):
+    counts = {}
+
+    def turn(player, gp, rnd, action_phase):
+        legal = player.legal_actions(gp, rnd)
+        functions = action_functions(player, gp, rnd)
+
+        # (kind, target, wanted before the planet) for every way to choose
+        # a planet.
+        ways = [("mine", False, []), ("gaia", False, [])]
+        for number in (2, 6):
+            ways.append(("pq", number, [decisions.Option(str(number))]))
+        if isinstance(player.booster, (Terraform, ExtraRange)):
+            ways.append(("special", player.booster, [player.booster]))
+
+        for kind, target, wanted in ways:
+            targets = {
+                action.target if action.kind in ("mine", "gaia")
+                else action.choice
+                for action in legal
+                    if action.kind == kind
+                    and (target is False or action.target is target)
+            }
+            for planet in gp.universe.planet_list:
+                if planet.type == "Lost Planet":
+                    continue
+
+                # A Gaia Project is started on a Trans-dim planet, the other
+                # planets get a mine.
+                structure = "Mine"
+                if kind == "gaia" or planet.type == "Trans-dim":
+                    structure = "Gaiaformer"
+
+                # The planet has to be the one that was built on, when a
+                # sector has one valid planet it's chosen without asking.
+                accepted = attempt(
+                    functions[kind],
+                    wanted + [planet.sector, planet],
+                    built(player, planet, structure),
+                )
+                assert accepted == (planet in targets), (kind, str(planet))
+                counts[kind, accepted] = counts.get((kind, accepted), 0) + 1
+        action_phase()
+
+    for seed in range(5):
+        play(seed, turn)
+
+    # Every way to choose a planet was accepted at least once.
+    assert {kind for kind, accepted in counts if accepted} == {
+        "mine", "gaia", "pq", "special"
+    }
@@ -0,0 +1,99 @@
+import os
+import random
+
+import pytest
+
+import assets
+import atlas
+
+
+def overlap(first, second):
+    (x1, y1, width1, height1), (x2, y2, width2, height2) = first, second
+    return (
+        x1 < x2 + width2 and x2 < x1 + width1
+        and y1 < y2 + height2 and y2 < y1 + height1
+    )
+
+
+def check_pack(sizes, page_size):
+    """The places of pack fit on their pages and keep their distance."""
+
+    places, pages = atlas.pack(sizes, page_size)
+    assert places.keys() == sizes.keys()
+
+    # Every rectangle with its padding around it.
+    padded = {}
+    for name, (page, x, y) in places.items():
+        width, height = sizes[name]
+        assert x >= atlas.PADDING and y >= atlas.PADDING
+        assert x + width + atlas.PADDING <= pages[page][0] <= page_size
+        assert y + height + atlas.PADDING <= pages[page][1] <= page_size
+        padded[name] = (
+            page,
+            (
+                x - atlas.PADDING,
+                y - atlas.PADDING,
+                width + 2 * atlas.PADDING,
+                height + 2 * atlas.PADDING,
+            ),
+        )
+
+    names = sorted(padded)
+    for i, name in enumerate(names):
+        page, rectangle = padded[name]
+        for other in names[i + 1:]:
+            other_page, other_rectangle = padded[other]
+            if page == other_page:
+                assert not overlap(rectangle, other_rectangle), (name, other)
+    return places, pages
+
+
+def test_pack_random_sizes():
+    rnd = random.Random(1)
+    for _ in range(20):
+        sizes = {
+            f"image{i}": (rnd.randint(1, 120), rnd.randint(1, 120))
+            for i in range(rnd.randint(1, 60))
+        }
+        check_pack(sizes, 256)
+
+
+def test_pack_starts_a_new_page():
+    # Two rows of two fit on a page, the fifth image needs another page.
+    sizes = {name: (48, 48) for name in "abcde"}
+    places, pages = check_pack(sizes, 100)
+    assert len(pages) == 2
+    assert sorted(page for page, x, y in places.values()) == [0, 0, 0, 0, 1]
+    assert pages[1] == (50, 50)
+
+
+def test_pack_exact_fit():
+    # With the padding an image of page_size - 2 fills the page exactly.
+    places, pages = check_pack({"big": (98, 98)}, 100)
+    assert places == {"big": (0, 1, 1)}
+    assert pages == [(100, 100)]
+
+
+def test_pack_too_big():
+    with pytest.raises(ValueError):
+        atlas.pack({"wide": (99, 10)}, 100)
+    with pytest.raises(ValueError):
+        atlas.pack({"small": (5, 5), "high": (10, 99)}, 100)
+
+
+def test_images_from_the_atlas_are_the_originals(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+
+    index = atlas.build(atlas_dir=str(tmp_path))
+    assert sorted(index["images"]) == atlas.find_images()
+
+    cache = assets.ImageCache()
+    cache.atlas = atlas.load(str(tmp_path))
+    for name in index["images"]:
+        path = os.path.join(atlas.IMAGES, name)
+        with Image.open(path) as original:
+            original = original.convert("RGBA")
+        cut = cache.load(path)
+        assert cut.size == original.size, name
+        assert cut.tobytes() == original.tobytes(), name
+    assert cache.misses == len(index["images"]) + len(index["pages"])
@@ -0,0 +1,128 @@
+import contextlib
+import io
+
+import constants as C
+from automa import Automa, Card
+
+
+def automa_of(gp):
+    automa, = [player for player in gp.players if isinstance(player, Automa)]
+    return automa
+
+
+def move(automa, track, level_num):
+    """Put the Automa on a level of a research track."""
+
+    automa.research_track(track, level_num)
+    attribute = C.TRACK_ATTRIBUTES[track.name]
+    assert getattr(automa, attribute) is getattr(track, f"level{level_num}")
+
+
+def support(automa, numbered_selection):
+    """Give the Automa a support card with a Numbered Selection."""
+
+    automa.support_card = Card(
+        num=0,
+        passing=[False, 1],
+        support=["top", 4, "right", numbered_selection],
+        action="research",
+        booster=1,
+        vp=1,
+    )
+
+
+def research(function, research_board):
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(research_board)
+
+
+def levels(automa):
+    return [
+        int(getattr(automa, attribute).name[-1])
+        for attribute in C.TRACK_ATTRIBUTES.values()
+    ]
+
+
+def test_can_research(game):
+    gp = game(0)
+    automa = automa_of(gp)
+    tracks = gp.research_board.tech_tracks
+    for track in tracks:
+        assert automa.can_research(track)
+
+    # At the top there is nothing left to research.
+    move(automa, tracks[0], 5)
+    assert not automa.can_research(tracks[0])
+
+    # Level 5 is only for one player.
+    tracks[1].level5.add("Hadsch Halla")
+    move(automa, tracks[1], 3)
+    assert automa.can_research(tracks[1])
+    move(automa, tracks[1], 4)
+    assert not automa.can_research(tracks[1])
+
+    move(automa, tracks[2], 4)
+    assert automa.can_research(tracks[2])
+
+
+def test_random_research_cycles_the_tracks(game):
+    gp = game(0)
+    automa = automa_of(gp)
+    research_board = gp.research_board
+    tracks = research_board.tech_tracks
+
+    # Numbered Selection 8 goes around the 6 tracks once and picks the
+    # second one.
+    support(automa, "right8")
+    research(automa.random_research, research_board)
+    assert levels(automa) == [0, 1, 0, 0, 0, 0]
+
+    research(automa.random_research, research_board)
+    assert levels(automa) == [0, 2, 0, 0, 0, 0]
+
+    # From the other side.
+    support(automa, "left2")
+    research(automa.random_research, research_board)
+    assert levels(automa) == [0, 2, 0, 0, 1, 0]
+
+    # Tracks the Automa can't go up on are skipped while counting.
+    move(automa, tracks[5], 5)
+    move(automa, tracks[4], 5)
+    research(automa.random_research, research_board)
+    assert levels(automa) == [0, 2, 1, 0, 5, 5]
+
+
+def test_random_research_without_tracks(game):
+    gp = game(0)
+    automa = automa_of(gp)
+    for track in gp.research_board.tech_tracks:
+        move(automa, track, 5)
+    support(automa, "right3")
+    research(automa.random_research, gp.research_board)
+    research(automa.highest_research, gp.research_board)
+    assert levels(automa) == [5] * 6
+
+
+def test_highest_research_skips_blocked_tracks(game):
+    gp = game(0)
+    automa = automa_of(gp)
+    research_board = gp.research_board
+    tracks = research_board.tech_tracks
+    support(automa, "right1")
+
+    move(automa, tracks[3], 4)
+    move(automa, tracks[4], 3)
+    research(automa.highest_research, research_board)
+    assert levels(automa) == [0, 0, 0, 5, 3, 0]
+
+    # The highest track is taken, so the next highest goes up.
+    research(automa.highest_research, research_board)
+    assert levels(automa) == [0, 0, 0, 5, 4, 0]
+
+    # Level 5 of Economy is taken by the opponent.
+    tracks[4].level5.add("Hadsch Halla")
+    move(automa, tracks[0], 2)
+    move(automa, tracks[2], 2)
+    support(automa, "left1")
+    research(automa.highest_research, research_board)
+    assert levels(automa) == [2, 0, 3, 5, 4, 0]
@@ -0,0 +1,81 @@
+import pytest
+
+import exceptions as e
+
+ACTIONS = ["start_mine", "mine", "pq", "boost_range", "upgrade", "gaia"]
+
+
+def index_valid_planets(universe, player, sector, action):
+    """Universe.valid_planets the way it goes without a Board."""
+
+    board = universe.board
+    universe.board = False
+    try:
+        return universe.valid_planets(player, sector, action)
+    finally:
+        universe.board = board
+
+
+def check_board(gp):
+    """The Board gives the same answers as the PlanetIndex."""
+
+    universe = gp.universe
+    for player in gp.players:
+        name = player.faction.name
+        assert universe.board.end_scoring(name) == (
+            universe.index.end_scoring(name)
+        )
+
+        actions = ACTIONS
+        if type(player).__name__ == "Automa":
+            actions = ACTIONS + ["automa_mine"]
+        for sector in universe.sectors:
+            for action in actions:
+                try:
+                    planets = universe.valid_planets(player, sector, action)
+                except e.NoValidMinePlanetsError:
+                    with pytest.raises(e.NoValidMinePlanetsError):
+                        index_valid_planets(universe, player, sector, action)
+                else:
+                    assert planets == index_valid_planets(
+                        universe, player, sector, action
+                    )
+
+
+@pytest.mark.parametrize("board", [True], indirect=True)
+def test_board_agrees_with_the_index(play):
+    checked = []
+
+    def turn(player, gp, rnd, action_phase):
+        check_board(gp)
+        checked.append(player)
+        action_phase()
+
+    for seed in range(5):
+        gp = play(seed, turn)
+        check_board(gp)
+    assert len(checked) > 100
+
+
+def test_board_after_claims(universe):
+    if not universe.board:
+        pytest.skip("numpy isn't installed")
+
+    planets = sorted(universe.planet_list, key=lambda planet: planet.location)
+    for planet in planets[::2]:
+        planet.owner = "Taklons"
+        planet.structure = "Mine"
+    for planet in planets[::5]:
+        planet.structure = "Gaiaformer"
+    planets[2].type = "Gaia"
+
+    amounts = universe.board.end_scoring("Taklons")
+    assert amounts == universe.index.end_scoring("Taklons")
+    mines = [planet for planet in planets if planet.structure == "Mine"]
+    assert amounts["structures"] == len(mines)
+    assert amounts["gaia_planets"] == len([
+        planet for planet in mines if planet.type == "Gaia"
+    ]) > 0
+    assert universe.board.end_scoring("Nobody") == {
+        "structures": 0, "planet_types": 0, "gaia_planets": 0, "sectors": 0
+    }
@@ -0,0 +1,146 @@
+import itertools
+import random
+
+import constants as C
+from federation import FEDERATION_POWER
+from player import Player
+from universe import hex_distance
+
+STRUCTURES = ["Mine", "Mine", "Trading Station", "Research Lab", "Academy"]
+
+
+def claim_area(universe, player, seed):
+    """Give the player structures on some planets close to each other.
+
+    Returns:
+        Dictionary with location: power value of the structures.
+    """
+
+    rng = random.Random(seed)
+    planets = [
+        planet for planet in universe.planet_list
+            if planet.type != "Trans-dim"
+    ]
+    center = rng.choice(planets)
+    nearby = [
+        planet for planet in planets
+            if hex_distance(center.location, planet.location) <= 3
+    ]
+    powers = {}
+    for planet in rng.sample(nearby, min(len(nearby), 6)):
+        planet.owner = player.faction.name
+        planet.structure = rng.choice(STRUCTURES)
+        powers[planet.location] = C.STRUCTURE_POWER_VALUES[planet.structure]
+    return powers
+
+
+def connected(start, nodes):
+    """Locations in nodes that can be reached from start through nodes."""
+
+    found = {start}
+    todo = [start]
+    while todo:
+        location = todo.pop()
+        for other in nodes:
+            if other not in found and hex_distance(location, other) == 1:
+                found.add(other)
+                todo.append(other)
+    return found
+
+
+def brute_force(universe, powers, tokens):
+    """Fewest satellites for every set of structures a federation can have.
+
+    Tries every set of up to tokens satellites on the Spaces close enough to
+    the structures.
+
+    Returns:
+        Dictionary with frozenset of structure locations: satellites.
+    """
+
+    spaces = [
+        location for location in universe.hex_locations
+            if location not in universe.planets
+            and any(
+                hex_distance(location, structure) <= tokens
+                for structure in powers
+            )
+    ]
+    best = {}
+    for structure in powers:
+        group = frozenset(connected(structure, set(powers)))
+        best[group] = 0
+
+    for amount in range(1, tokens + 1):
+        for satellites in itertools.combinations(spaces, amount):
+            nodes = set(powers) | set(satellites)
+            found = connected(satellites[0], nodes)
+            if not found.issuperset(satellites):
+                continue
+            group = frozenset(found & set(powers))
+            if group and group not in best:
+                best[group] = amount
+
+    return {
+        group: amount for group, amount in best.items()
+            if sum(powers[location] for location in group) >= FEDERATION_POWER
+    }
+
+
+def test_options_match_brute_force(universe):
+    player = Player("Hadsch Halla")
+    solver = universe.federation_solver
+    checked = 0
+    for seed in range(12):
+        for planet in universe.planet_list:
+            planet.owner = False
+            planet.structure = False
+        powers = claim_area(universe, player, seed)
+        tokens = 3
+        player.faction.bowl1, player.faction.bowl2 = tokens, 0
+        player.faction.bowl3 = 0
+
+        best = brute_force(universe, powers, tokens)
+        options = solver.options(player)
+
+        # Every option is a real federation with the fewest satellites.
+        for federation in options:
+            planets = {planet.location for planet in federation.planets}
+            satellites = [space.location for space in federation.satellites]
+            assert len(satellites) <= tokens
+            assert all(
+                universe.planets.get(location) is None
+                for location in satellites
+            )
+            start = satellites[0] if satellites else min(planets)
+            nodes = set(powers) | set(satellites)
+            assert connected(start, nodes) & set(powers) == planets
+            assert federation.power == sum(powers[l] for l in planets)
+            assert best[frozenset(planets)] == len(satellites)
+
+        # Every smallest group of clusters that reaches the power value is
+        # in one of the options, with the fewest satellites possible.
+        clusters = {
+            frozenset(connected(location, set(powers))) for location in powers
+        }
+        value = lambda cluster: sum(powers[l] for l in cluster)
+        for size in range(1, len(clusters) + 1):
+            for group in itertools.combinations(clusters, size):
+                power = sum(map(value, group))
+                if power < FEDERATION_POWER \
+                        or power - min(map(value, group)) >= FEDERATION_POWER:
+                    continue
+                members = frozenset().union(*group)
+                amounts = [
+                    amount for planets, amount in best.items()
+                        if planets >= members
+                ]
+                if not amounts:
+                    continue
+                assert any(
+                    {planet.location for planet in fed.planets} >= members
+                    and len(fed.satellites) == min(amounts)
+                    for fed in options
+                ), (seed, sorted(members))
+                checked += 1
+    assert checked > 10
@@ -0,0 +1,69 @@
+INFINITE = float("inf")
+
+
+def check_frontier(frontier):
+    """The frontier knows the same as measuring everything again."""
+
+    universe = frontier.universe
+    empire = {
+        planet for planet in universe.planet_list
+            if planet.owner == frontier.faction_name
+            and planet.structure not in (False, "Gaiaformer")
+    }
+    assert frontier.empire == empire
+
+    rows = [
+        universe.distances[universe.hex_index[planet.location]]
+        for planet in empire
+    ]
+    field = [min(column, default=INFINITE) for column in zip(*rows)]
+    if not rows:
+        field = [INFINITE] * len(universe.hex_locations)
+    assert frontier.field == field
+
+    nearest = {}
+    if empire:
+        for planet in universe.planet_list:
+            if not planet.owner:
+                nearest[planet] = frontier.distance(planet)
+    assert frontier.nearest == nearest
+
+    reach = {}
+    for planet, distance in nearest.items():
+        reach.setdefault(distance, set()).add(planet)
+    assert {
+        distance: planets for distance, planets in frontier.reach.items()
+            if planets
+    } == reach
+
+
+def test_frontier_follows_claims(universe):
+    frontier = universe.add_frontier("Taklons")
+    other = universe.add_frontier("Hadsch Halla")
+    check_frontier(frontier)
+
+    planets = sorted(universe.planet_list, key=lambda planet: planet.location)
+    for i, planet in enumerate(planets[::4]):
+        planet.owner = "Taklons" if i % 2 else "Hadsch Halla"
+        planet.structure = "Mine"
+        check_frontier(frontier)
+        check_frontier(other)
+
+    # A Gaiaformer doesn't count for range, the mine built on it later does.
+    planets[1].owner = "Taklons"
+    planets[1].structure = "Gaiaformer"
+    check_frontier(frontier)
+    planets[1].structure = "Mine"
+    planets[4].structure = "Trading Station"
+    check_frontier(frontier)
+    check_frontier(other)
+
+
+def test_frontier_follows_seeded_games(play):
+    def turn(player, gp, rnd, action_phase):
+        action_phase()
+        for someone in gp.players:
+            check_frontier(someone.frontier)
+
+    for seed in range(5):
+        play(seed, turn)
@@ -0,0 +1,57 @@
+from journal import journal
+from state import GameState
+from test_state import check_state
+
+
+def test_undo_goes_back_to_the_start_of_every_turn(play):
+    undone = []
+
+    def turn(player, gp, rnd, action_phase):
+        before = GameState(gp)
+        legal = [str(action) for action in player.legal_actions(gp, rnd)]
+        action_phase()
+
+        # Placing the Lost Planet forgets the journal.
+        if not journal.marks or journal.labels()[-1] is not player:
+            return
+
+        after = GameState(gp)
+        journal.undo()
+        check_state(gp, before)
+        assert [
+            str(action) for action in player.legal_actions(gp, rnd)
+        ] == legal
+        undone.append(player)
+
+        # Go on with the game as if the turn was never undone.
+        journal.mark(player)
+        after.restore(gp)
+        check_state(gp, after)
+
+    for seed in range(10):
+        play(seed, turn)
+    assert len(undone) > 300
+
+
+def test_look_ahead_inside_a_turn(play):
+    looked = []
+
+    def turn(player, gp, rnd, action_phase):
+        before = GameState(gp)
+        labels = journal.labels()
+
+        # Take the turn once inside a mark of its own, undo it and take it
+        # for real, the way a search would.
+        journal.mark("look ahead")
+        action_phase()
+        if journal.labels()[-1:] != ["look ahead"]:
+            return
+        assert journal.undo() == "look ahead"
+        assert journal.labels() == labels
+        check_state(gp, before)
+        looked.append(player)
+        action_phase()
+
+    for seed in range(3):
+        play(seed, turn)
+    assert len(looked) > 100
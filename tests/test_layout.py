@@ -0,0 +1,57 @@
+import constants as C
+from layout import LayoutGenerator, layout_kwargs
+from render import HeadlessRenderer
+from universe import Universe, hex_distance
+
+
+def follows_rules(layout, min_distance=2, min_home_distance=3):
+    """Check the layout rules on the planets of a real Universe."""
+
+    universe = Universe(HeadlessRenderer(), **layout_kwargs(layout))
+    for planet in universe.planet_list:
+        for other in universe.planet_list:
+            if planet.sector == other.sector or planet.type != other.type:
+                continue
+            distance = hex_distance(planet.location, other.location)
+            if distance < min_distance:
+                return False
+            if planet.type in C.HOME_TYPES and distance < min_home_distance:
+                return False
+    return True
+
+
+def test_random_layouts_are_valid():
+    for player_count in (2, 4):
+        generator = LayoutGenerator(player_count, seed=7)
+        for _ in range(5):
+            layout = generator.random_layout()
+            assert generator.is_valid(layout)
+            positions = [position for position, rotation in layout.values()]
+            assert sorted(positions) == sorted(generator.positions)
+            assert follows_rules(layout)
+
+
+def test_pool_is_valid_and_different():
+    generator = LayoutGenerator(4, seed=3)
+    pool = generator.generate_pool(50, batch_size=4096)
+    assert len(pool) == 50
+    assert len({tuple(layout.items()) for layout in pool}) == 50
+    for layout in pool:
+        assert generator.is_valid(layout)
+        assert generator.to_layout(generator.to_states(layout)) == layout
+    for layout in pool[:5]:
+        assert follows_rules(layout)
+
+    # The same seed gives the same pool.
+    again = LayoutGenerator(4, seed=3).generate_pool(50, batch_size=4096)
+    assert again == pool
+
+
+def test_batch_agrees_with_single_checks():
+    generator = LayoutGenerator(2, seed=11)
+    candidates = [generator.random_states() for _ in range(500)]
+    valid = generator.validate_batch(candidates)
+    assert list(valid) == [generator.valid_states(row) for row in candidates]
+    assert any(valid) and not all(valid)
+    for row, ok in list(zip(candidates, valid))[:20]:
+        assert follows_rules(generator.to_layout(row)) == ok
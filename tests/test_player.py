@@ -0,0 +1,19 @@
+import contextlib
+import io
+
+from player import Player
+
+
+def test_academy_income(game):
+    gp = game(0)
+    player, = [player for player in gp.players if isinstance(player, Player)]
+
+    def income():
+        before = player.faction.knowledge
+        with contextlib.redirect_stdout(io.StringIO()):
+            player.income_phase()
+        return player.faction.knowledge - before
+
+    without = income()
+    player.faction.academy_income[0] = True
+    assert income() == without + 2
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter, the other tests import pygame and PIL.
+PLAY = """
+import json
+import sys
+
+import simulate
+
+results = [simulate.play_game(seed) for seed in [0, 1, 2, 0]]
+print(json.dumps({
+    "results": results,
+    "imported": [name for name in ["pygame", "PIL"] if name in sys.modules],
+}))
+"""
+
+
+def test_play_game():
+    done = subprocess.run(
+        [sys.executable, "-c", PLAY],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    found = json.loads(done.stdout)
+    assert found["imported"] == []
+
+    results = found["results"]
+    for result in results:
+        assert result["result"] == "finished", result["error"]
+        assert result["error"] is False
+        assert len(result["vp"]) == 2
+        assert result["rounds"]
+
+    # The same seed plays the same game.
+    first, *others, again = results
+    del first["seconds"], again["seconds"]
+    assert first == again
+    for other in others:
+        del other["seconds"]
+        assert other != dict(first, seed=other["seed"])
+
+
+def test_simulate_batch(tmp_path):
+    output = tmp_path / "results.jsonl"
+    done = subprocess.run(
+        [
+            sys.executable, "simulate.py", "6", "--seed", "10",
+            "--processes", "2", "--output", str(output),
+        ],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert done.stdout.startswith("Finished 6 of 6 games")
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(result["seed"] for result in results) == list(range(10, 16))
+    assert all(result["result"] == "finished" for result in results)
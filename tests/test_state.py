@@ -0,0 +1,91 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import exceptions as e
+from state import GameState
+from test_frontier import check_frontier
+from test_universe import check_index
+
+
+def same(first, second):
+    """Whether two parts of GameState objects hold the same things."""
+
+    if isinstance(first, dict):
+        return first.keys() == second.keys() and all(
+            same(first[key], second[key]) for key in first
+        )
+    if np and isinstance(first, np.ndarray):
+        return np.array_equal(first, second)
+    if isinstance(first, (tuple, list)):
+        return len(first) == len(second) and all(
+            same(one, other) for one, other in zip(first, second)
+        )
+    return first is second or first == second
+
+
+def check_state(gp, state):
+    """The game is exactly the way it was when the snapshot was taken."""
+
+    now = GameState(gp)
+    for name, value in vars(state).items():
+        assert same(value, vars(now)[name]), name
+    check_index(gp.universe)
+    for player in gp.players:
+        check_frontier(player.frontier)
+
+
+def test_restore_goes_back_to_every_turn(play):
+    snapshots = []
+
+    def turn(player, gp, rnd, action_phase):
+        legal = [str(action) for action in player.legal_actions(gp, rnd)]
+        snapshots.append((GameState(gp), player, rnd, legal))
+        action_phase()
+
+    restored = 0
+    for seed in range(5):
+        snapshots.clear()
+        gp = play(seed, turn)
+
+        # Newest first, the game goes back further and further.
+        for state, player, rnd, legal in reversed(snapshots):
+            if state.planet_count != len(gp.universe.planet_list):
+                # The Lost Planet can't be taken off the board again.
+                with pytest.raises(e.StateRestoreError):
+                    state.restore(gp)
+                break
+
+            state.clone().restore(gp)
+            check_state(gp, state)
+            assert [
+                str(action) for action in player.legal_actions(gp, rnd)
+            ] == legal
+            restored += 1
+
+        # And forward again to the last turn.
+        last = snapshots[-1][0]
+        last.restore(gp)
+        check_state(gp, last)
+    assert restored > 100
+
+
+def test_snapshots_never_change(play):
+    snapshots = []
+
+    def turn(player, gp, rnd, action_phase):
+        state = GameState(gp)
+        snapshots.append((state, state.clone()))
+        action_phase()
+
+    gp = play(3, turn)
+    for state, clone in snapshots:
+        for name, value in vars(state).items():
+            assert same(value, vars(clone)[name]), name
+    if gp.universe.board:
+        first = snapshots[0][0]
+        for array in first.board.values():
+            assert not array.flags.writeable
@@ -0,0 +1,45 @@
+import random
+
+from stats import percentile
+
+
+def test_percentile_nearest_rank():
+    values = [15, 20, 35, 40, 50]
+    assert percentile(values, 5) == 15
+    assert percentile(values, 30) == 20
+    assert percentile(values, 40) == 20
+    assert percentile(values, 50) == 35
+    assert percentile(values, 100) == 50
+
+    values = [3, 6, 7, 8, 8, 10, 13, 15, 16, 20]
+    assert percentile(values, 25) == 7
+    assert percentile(values, 50) == 8
+    assert percentile(values, 75) == 15
+    assert percentile(values, 100) == 20
+
+
+def test_percentile_edges():
+    assert percentile([], 50) == 0
+    assert percentile([7], 0) == 7
+    assert percentile([7], 99) == 7
+    assert percentile([1, 2], 0) == 1
+    assert percentile([1, 2], 50) == 1
+    assert percentile([1, 2], 51) == 2
+
+
+def test_percentile_is_the_smallest_value_with_enough_below():
+    rnd = random.Random(1)
+    for _ in range(200):
+        values = sorted(rnd.randint(0, 50) for _ in range(rnd.randint(1, 40)))
+        for percent in range(1, 101):
+            found = percentile(values, percent)
+            # At least percent % of the values are at most the percentile,
+            # and that isn't true for any smaller value.
+            assert sum(value <= found for value in values) * 100 >= (
+                percent * len(values)
+            )
+            smaller = [value for value in values if value < found]
+            if smaller:
+                assert sum(value <= smaller[-1] for value in values) * 100 < (
+                    percent * len(values)
+                )
@@ -0,0 +1,73 @@
+from layout import LayoutGenerator, layout_kwargs
+from render import HeadlessRenderer
+from universe import Universe, hex_distance
+
+
+def walk_distance(start, target):
+    """The stepwise walk hex_distance replaced, as it was in Universe."""
+
+    x, y = start
+    distance = 0
+    while (x, y) != target:
+        if x == target[0]:
+            y += 2 if y < target[1] else -2
+        elif y == target[1]:
+            x += 1 if x < target[0] else -1
+        else:
+            x += 1 if x < target[0] else -1
+            y += 1 if y < target[1] else -1
+        distance += 1
+    return distance
+
+
+def test_hex_distance_is_the_walk(universe):
+    for start in universe.hex_locations:
+        for target in universe.hex_locations:
+            assert hex_distance(start, target) == walk_distance(start, target)
+
+
+def test_hex_distance_on_a_10_sector_map():
+    layout = LayoutGenerator(4, seed=1).random_layout()
+    universe = Universe(HeadlessRenderer(), **layout_kwargs(layout))
+    for i, start in enumerate(universe.hex_locations):
+        for j, target in enumerate(universe.hex_locations):
+            assert universe.distances[i][j] == walk_distance(start, target)
+
+
+def check_index(universe):
+    """Every planet is in exactly the sets of its current fields."""
+
+    index = universe.index
+    for field in index.fields:
+        groups = getattr(index, field)
+        assert sum(map(len, groups.values())) == len(universe.planet_list)
+        for planet in universe.planet_list:
+            assert planet in groups[getattr(planet, field)]
+
+
+def test_index_follows_claims_and_upgrades(universe):
+    planets = sorted(universe.planet_list, key=lambda planet: planet.location)
+    for planet in planets[::3]:
+        planet.owner = "Taklons"
+        planet.structure = "Mine"
+    for planet in planets[::6]:
+        planet.structure = "Trading Station"
+    planets[1].structure = "Gaiaformer"
+    planets[1].owner = "Hadsch Halla"
+    planets[1].type = "Gaia"
+    check_index(universe)
+
+    found = universe.index.query(owner="Taklons", structure="Mine")
+    assert found == {
+        planet for planet in planets
+            if planet.owner == "Taklons" and planet.structure == "Mine"
+    }
+
+
+def test_index_follows_seeded_games(play):
+    def turn(player, gp, rnd, action_phase):
+        action_phase()
+        check_index(gp.universe)
+
+    for seed in range(5):
+        play(seed, turn)
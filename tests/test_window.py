@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+window = pytest.importorskip("window")
+
+WINDOWS = [
+    (978, 1000), (977, 1000), (800, 600), (1920, 1080), (3000, 4000),
+    (100, 100), (5000, 5000), (1279, 1066), (2558, 2132),
+]
+BOARDS = [window.BOARD_SIZE, (1279, 1066)]
+
+
+def test_zoom_is_the_largest_that_fits():
+    for board in BOARDS:
+        for size in WINDOWS:
+            transform = window.Transform(size, board)
+            zoom = transform.zoom
+            assert zoom in window.ZOOM_LEVELS
+
+            fits = [
+                level for level in window.ZOOM_LEVELS
+                if board[0] * level <= size[0] and board[1] * level <= size[1]
+            ]
+            if fits:
+                assert zoom == max(fits), (board, size)
+            else:
+                # Nothing fits, the board is shown as small as it gets.
+                assert zoom == window.ZOOM_LEVELS[0]
+
+
+def test_board_is_centred():
+    for board in BOARDS:
+        for width, height in WINDOWS:
+            transform = window.Transform((width, height), board)
+            left, top = transform.point(0, 0)
+            scaled_width = round(board[0] * transform.zoom)
+            scaled_height = round(board[1] * transform.zoom)
+            right = width - left - scaled_width
+            bottom = height - top - scaled_height
+            assert left in (right, right - 1)
+            assert top in (bottom, bottom - 1)
+
+
+def test_rect_covers_the_scaled_area():
+    rnd = random.Random(1)
+    for zoom_window in [(400, 400), (978, 1000), (2000, 2000), (4000, 4000)]:
+        transform = window.Transform(zoom_window)
+        zoom = transform.zoom
+
+        x, y, width, height = transform.rect(0, 0, *window.BOARD_SIZE)
+        assert (x, y) == (0, 0)
+        assert width >= window.BOARD_SIZE[0] * zoom
+        assert height >= window.BOARD_SIZE[1] * zoom
+
+        for _ in range(200):
+            x, y = rnd.randint(0, 900), rnd.randint(0, 900)
+            width, height = rnd.randint(1, 90), rnd.randint(1, 90)
+            left, top, scaled_width, scaled_height = transform.rect(
+                x, y, width, height
+            )
+            assert left <= x * zoom and top <= y * zoom
+            assert left + scaled_width >= (x + width) * zoom
+            assert top + scaled_height >= (y + height) * zoom
+
+            # The window pixel of the corner is the corner of the rect.
+            offset = (transform.offset_x, transform.offset_y)
+            assert transform.point(x, y) == (
+                left + offset[0], top + offset[1]
+            )
+
+            # Next to each other on the board is next to each other in the
+            # window, without a gap.
+            right = transform.rect(x + width, y, 10, height)
+            assert right[0] <= left + scaled_width
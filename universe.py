@@ -1,16 +1,354 @@
+import hashlib
 import os
 
-import pygame
-from PIL import Image
-
+import assets
 import constants as C
+import decisions
 import exceptions as e
+import stats
+from federation import FederationSolver
+from frontier import Frontier
+from journal import Journaled, journal
+
+try:
+    from board import Board
+except ImportError:
+    # The Board needs numpy. Without it, planets store their own fields.
+    Board = False
 
 ROOT = os.path.dirname(__file__)
 IMAGES = os.path.join(ROOT, "images")
 
+# Folder with the stitched together universe maps.
+MAP_CACHE = os.path.join(ROOT, "cache", "maps")
+
+# Top left corner in pixels of every position a sector can be on.
+SECTOR_CORNERS = {
+    'c': (301, 326),  # Center
+    'n': (339, 0),  # North
+    'ne': (602, 196),  # North East
+    'se': (564, 522),  # South East
+    's': (263, 652),  # South
+    'sw': (0, 456),  # South West
+    'nw': (38, 130),  # North West
+    'ene': (903, 66),  # East North East
+    'e': (865, 392),  # East
+    'ese': (827, 718),  # East South East
+}
+
+# Size of a sector image in pixels (width, length).
+SECTOR_SIZE = (376, 348)
+
+
+def hex_distance(start, target):
+    """Calculate the distance between two hexes on the universe grid.
+
+    The universe grid uses doubled coordinates. Moving one hex to the left
+    or right changes y by 2 and moving one hex diagonally changes both x and
+    y by 1. That means the distance is the vertical difference plus whatever
+    horizontal difference is left after moving diagonally.
+
+    Args:
+        start (tuple): (x, y) of the starting hex.
+        target (tuple): (x, y) of the target hex.
+
+    Returns:
+        An integer that is the distance between the two hexes.
+    """
+
+    dx = abs(start[0] - target[0])
+    dy = abs(start[1] - target[1])
+    return dx + max(0, (dy - dx) // 2)
+
+
+# Hex numbers of the inner and outer circle of a sector, clockwise. In the same
+# order as Sector.hexes.
+INNER_NUMS = [5, 6, 11, 15, 14, 9]
+OUTER_NUMS = [1, 2, 3, 7, 12, 16, 19, 18, 17, 13, 8, 4]
+
+# Offsets from the center hex of a sector to the hexes of its inner and outer
+# circle. In the same order as Sector.hexes.
+INNER_OFFSETS = [(-1, -1), (-1, 1), (0, 2), (1, 1), (1, -1), (0, -2)]
+OUTER_OFFSETS = [
+    (-2, -2), (-2, 0), (-2, 2), (-1, 3), (0, 4), (1, 3),
+    (2, 2), (2, 0), (2, -2), (1, -3), (0, -4), (-1, -3)
+]
+
+
+# Universe grid location of the center hex of every position a sector can be
+# placed on (left ruler (x), top ruler (y)).
+CENTERS = {
+    'n': (3, 14),  # North
+    'nw': (5, 6),  # North West
+    'c': (8, 13),  # Center
+    'sw': (10, 5),  # South West
+    'ne': (6, 21),  # North East
+    'se': (11, 20),  # South East
+    's': (13, 12),  # South
+    # The 3 and 4 player map adds a column of sectors on the east.
+    'ene': (4, 29),  # East North East
+    'e': (9, 28),  # East
+    'ese': (14, 27),  # East South East
+}
+
+# The default 2 player map. Sector number: (position, rotation).
+DEFAULT_2P_LAYOUT = {
+    1: ('n', 0),
+    2: ('nw', 0),
+    3: ('c', 0),
+    4: ('sw', 0),
+    5: ('ne', 0),
+    6: ('se', 0),
+    7: ('s', 0),
+}
+
+
+def rotate_hexes(hexes, rotation):
+    """Rotate the planets of a sector clockwise.
+
+    Example:
+
+             1     2     3
+
+          4     5     6     7
+
+        8    9     10    11    12
+
+          13    14    15    16
+
+             17    18    19
+
+        hex_nums = [
+            [10],  # Center
+            [5, 6, 11, 15, 14, 9],  # Inner circle
+            [1, 2, 3, 7, 12, 16, 19, 18, 17, 13, 8, 4]  # Outer circle
+        ]
+
+        Moving every planet of the inner circle one place further and every
+        planet of the outer circle two places further completes a rotation.
+        After one rotation the hexes look like this:
+
+              8     4     1
+
+           13    9    5     2
+
+        17    14    10    6     3
+
+           18    15    11    7
+
+              19    16    12
+
+    Args:
+        hexes (dict): Hex number: planet type.
+        rotation (int): Amount of times to rotate. Can be 0-5.
+
+    Returns:
+        A new dictionary with the hex number each planet ends up on.
+    """
+
+    rotated = {}
+    for num, type_ in hexes.items():
+        if num in INNER_NUMS:
+            i = INNER_NUMS.index(num)
+            num = INNER_NUMS[(i + rotation) % 6]
+        elif num in OUTER_NUMS:
+            i = OUTER_NUMS.index(num)
+            num = OUTER_NUMS[(i + rotation * 2) % 12]
+        rotated[num] = type_
+    return rotated
+
+
+def sector_grid(center):
+    """Calculate the universe grid locations of all the hexes of a sector.
+
+    Args:
+        center (tuple): (x, y) of the center hex of the sector.
+
+    Returns:
+        A list with the location of the center, the inner circle and the outer
+        circle like the universe grid tables in Universe.
+    """
+
+    x, y = center
+    return [
+        [(x, y)],
+        [(x + dx, y + dy) for dx, dy in INNER_OFFSETS],
+        [(x + dx, y + dy) for dx, dy in OUTER_OFFSETS],
+    ]
+
+
+class Stored:
+    """Planet attribute that lives in the Board arrays if there is a Board.
+
+    Without a Board (numpy isn't installed) the value is simply stored on the
+    planet itself.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.attribute = f"_{name}"
+
+    def __get__(self, planet, owner=None):
+        if planet is None:
+            return self
+        if planet.board:
+            return planet.board.get(planet.cell, self.name)
+        return getattr(planet, self.attribute)
+
+    def __set__(self, planet, value):
+        if planet.board:
+            planet.board.set(planet.cell, self.name, value)
+        else:
+            # Past Journaled.__setattr__, only the public field is written
+            # down. Otherwise undo would put this one back first, behind the
+            # back of the PlanetIndex.
+            planet.__dict__[self.attribute] = value
+
+
+class Indexed(Stored):
+    """Planet attribute that keeps the Universe's PlanetIndex up to date.
+
+    Assigning to an Indexed attribute (planet.owner = "Taklons") moves the
+    planet to the right set in the index as soon as the value is stored, so
+    the index can never be out of date with the planets.
+    """
+
+    def __set__(self, planet, value):
+        index = getattr(planet, "index", False)
+        if not index:
+            Stored.__set__(self, planet, value)
+            return
+
+        old = self.__get__(planet)
+        Stored.__set__(self, planet, value)
+        index.update(planet, self.name, old, value)
+
+
+class PlanetIndex:
+    """Sets of planets grouped by owner, type, sector and structure.
+
+    Example:
+        self.owner = {False: {Planet, Planet}, "Taklons": {Planet}}
+        self.type = {"Swamp": {Planet, Planet}, "Gaia": {Planet}}
+    """
+
+    fields = ["owner", "type", "sector", "structure"]
+
+    def __init__(self):
+        self.owner = {}
+        self.type = {}
+        self.sector = {}
+        self.structure = {}
+
+        # Functions that are called with the planet whenever a planet is
+        # added or changed. For example Frontier.planet_changed.
+        self.listeners = []
+
+    def add(self, planet):
+        """Start keeping track of a planet.
+
+        Args:
+            planet: Planet or LostPlanet object.
+        """
+
+        for field in self.fields:
+            group = getattr(self, field)
+            group.setdefault(getattr(planet, field), set()).add(planet)
+        planet.index = self
+
+        for listener in self.listeners:
+            listener(planet)
+
+    def update(self, planet, field, old, new):
+        """Move a planet to a different set when one of its fields changes.
+
+        Args:
+            planet: Planet object that changed.
+            field (str): Name of the attribute that changed.
+            old: Previous value of the attribute.
+            new: New value of the attribute.
+        """
+
+        if old == new:
+            return
+
+        group = getattr(self, field)
+        group[old].discard(planet)
+        group.setdefault(new, set()).add(planet)
+
+        for listener in self.listeners:
+            listener(planet)
+
+    def query(self, **criteria):
+        """Find the planets that match all the given criteria.
+
+        Args:
+            criteria: owner, type_, sector and/or structure. Every value can
+                be a single value or a list of allowed values. For example:
+                query(owner=False, type_=["Gaia", "Trans-dim"], sector=3)
+
+        Returns:
+            A set with the matching planets.
+        """
+
+        found = None
+        for field, value in criteria.items():
+            group = getattr(self, field.rstrip("_"))
+            if isinstance(value, (list, tuple, set)):
+                planets = set()
+                for single in value:
+                    planets |= group.get(single, set())
+            else:
+                planets = group.get(value, set())
+
+            if found is None:
+                found = set(planets)
+            else:
+                found &= planets
+
+            # No need to look any further if nothing matches anymore.
+            if not found:
+                break
+
+        return found
+
+    def count_groups(self, field, planets):
+        """Count how many different values a field has among some planets.
+
+        Args:
+            field (str): "type" or "sector" for example.
+            planets (set): Planets to look at.
+
+        Returns:
+            The amount of groups that contain at least one of the planets.
+        """
+
+        return sum(
+            1 for group in getattr(self, field).values()
+                if not group.isdisjoint(planets)
+        )
+
+    def end_scoring(self, owner):
+        """Amounts used by the end scoring tiles for a faction.
+
+        The same as Board.end_scoring, for when there is no Board.
+
+        Returns:
+            Dictionary with structures, planet_types, gaia_planets and
+            sectors.
+        """
+
+        # A Gaiaformer isn't a structure.
+        empire = self.query(owner=owner) - self.query(structure="Gaiaformer")
+        return {
+            "structures": len(empire),
+            "planet_types": self.count_groups("type", empire),
+            "gaia_planets": len(self.query(type_="Gaia") & empire),
+            "sectors": self.count_groups("sector", empire),
+        }
+
 
-class Space:
+class Space(Journaled):
     """Empty spaces on the sector tiles.
     """
 
@@ -35,9 +373,18 @@ class Space:
         )
 
 
-class Planet:
+class Planet(Journaled):
     """Planet inside a sector."""
 
+    owner = Indexed()
+    type = Indexed()
+    structure = Indexed()
+    federation = Stored()
+
+    # Board the fields above are stored in. This property is set when the
+    # planet is attached to the Board.
+    board = False
+
     def __init__(self, sector, type_, location, num, pixel_x, pixel_y):
         self.sector = sector  # Number of the sector this planet is in.
         self.type = type_  # Oxide, Desert, Gaia, Trans-dim etc.
@@ -65,7 +412,16 @@ class Planet:
         # f"Federation: {self.federation}"
 
 
-class LostPlanet:
+class LostPlanet(Journaled):
+    owner = Indexed()
+    type = Indexed()
+    structure = Indexed()
+    federation = Stored()
+
+    # Board the fields above are stored in. This property is set when the
+    # planet is attached to the Board.
+    board = False
+
     def __init__(self):
         self.sector = False  # Number of the sector this planet is in.
         self.type = "Lost Planet"
@@ -75,6 +431,7 @@ class LostPlanet:
         self.structure = "Mine"  # Type of building built
         self.federation = False  # Part of federation? True or False
         self.neighbours = []  # List of opponents that are within range 2.
+        self.gaiaformed = False  # Never, but the screen code checks it.
 
     def place(self, player, gp, rnd):
         # TODO faction compatibility ivits space station check.
@@ -85,18 +442,20 @@ class LostPlanet:
             "Satellite or Space Station."
         )
 
-        # TODO more players only for 2p right now
-        choose_range = "1-7"
+        sector_numbers = [str(number) for number in gp.universe.sectors]
+        sector_options = [
+            decisions.Option(number, f"Sector {number}", int(number))
+            for number in sector_numbers
+        ]
+        choose_range = f"1-{len(sector_numbers)}"
         while True:
             print(
                 "Please type the number of the sector you want to place the "
                 "Lost Planet in."
             )
 
-            sector_choice = input("--> ")
-            if not sector_choice in C.SECTORS_2P:
-                # More players TODO make this message dynamic to the board.
-                # If playing with more players it would be 1-10 for example.
+            sector_choice = decisions.ask("menu", sector_options)
+            if not sector_choice in sector_numbers:
                 print(f"! Please only type {choose_range}.")
                 continue
 
@@ -118,7 +477,11 @@ class LostPlanet:
                 print(f"{i + 1}. Go back to sector selection.")
 
                 while True:
-                    space_choice = input("--> ")
+                    space_choice = decisions.menu(spaces, [
+                        decisions.Option(
+                            f"{i + 1}", "Go back to sector selection."
+                        )
+                    ])
                     if space_choice in [str(n + 1) for n in range(i)]:
                         chosen_space = spaces[int(space_choice) - 1]
                         break
@@ -154,24 +517,8 @@ class LostPlanet:
 
             break
 
-        # Turn the Space object into the Lost Planet object. Find the chosen
-        # Hex inside the Universe.sector.hexes list.
-        found = False
-        old_space = chosen_space
-        for i, circle in enumerate(eval(f"gp.universe.sector{sector_choice}"
-                                        ".hexes")):
-            for x, hex_ in enumerate(circle):
-                if hex_ is chosen_space:
-                    exec(
-                        f"gp.universe.sector{sector_choice}.hexes[{i}][{x}]"
-                        f" = self"
-                    )
-                    found = True
-                    break
-            if found:
-                break
-
         # Set Lost Planet parameters
+        old_space = chosen_space
         self.sector = old_space.sector
         self.location = old_space.location
         self.num = old_space.num
@@ -179,18 +526,20 @@ class LostPlanet:
         self.pixel_x = old_space.pixel_x
         self.pixel_y = old_space.pixel_y
 
+        # Turn the Space object into the Lost Planet object.
+        gp.universe.sectors[self.sector].replace_hex(old_space, self)
+
         # Place the lost planet on the screen.
         img_dir = os.path.join(IMAGES, "Miscellaneous")
         img_path = os.path.join(img_dir, "Lost Planet.png")
 
-        structure = pygame.image.load(img_path).convert_alpha()
         x = self.pixel_x - C.PLACE["Lost Planet"][0] // 2
         y = self.pixel_y - C.PLACE["Lost Planet"][1] // 2
 
-        gp.screen.blit(structure, (x, y))
+        gp.renderer.draw_image(img_path, (x, y))
 
         gp.universe.place_structure(
-            gp.screen,
+            gp.renderer,
             self,
             player.faction.home_type,
             "Mine"
@@ -202,6 +551,10 @@ class LostPlanet:
         # Put the Lost Planet into the Universe.planets dictionary.
         gp.universe.sort_planets(self)
 
+        # The sectors and planet lists aren't journaled, so nothing before
+        # this can be undone anymore.
+        journal.forget()
+
         print(
             f"You have placed the Lost Planet in sector "
             f"{self.sector} on number {self.num}."
@@ -264,7 +617,8 @@ class Sector:
                  rotation,
                  planet_list,
                  pixel_x,
-                 pixel_y):
+                 pixel_y,
+                 position):
         """Initialising the sector object.
 
         Args:
@@ -272,15 +626,16 @@ class Sector:
             hexes (dict): Hex number: planet type.
             img (path): Absolute path to the image file.
             universe_grid (list): Location of planets and spaces in the sector.
-            rotation (int): Rotated amount. Can be 1-5.
+            rotation (int): Amount of times the sector is rotated clockwise.
+                Can be 0-5.
             planet_list (List): All the planets in the Universe.
             pixel_x (Tuple): x coordinate in pixels of the center.
             pixel_y (Tuple): y coordinate in pixels of the center.
-
-        TODO:
-            Right now the rotation does nothing really.
+            position (str): Position of the sector in the universe (n, c etc.).
         """
 
+        hexes = rotate_hexes(hexes, rotation)
+
         # All middle points in pixels of all the 19 hexes relative to the
         # center.
         pixel_coords = {
@@ -322,12 +677,12 @@ class Sector:
 
         self.universe_grid = universe_grid
         self.rotation = rotation
+        self.position = position
 
         # Populate the Program representation with planets and empty spaces.
         self.inner = []
         self.outer = []
-        inner = [5, 6, 11, 15, 14, 9]
-        for i, num in enumerate(inner):
+        for i, num in enumerate(INNER_NUMS):
             # If num is in the hexes dictionary, that means it was provided to
             # the instance and that a planet is there.
 
@@ -353,8 +708,7 @@ class Sector:
                     pixel_y=pixel_coords[num][1])
                 )
 
-        outer = [1, 2, 3, 7, 12, 16, 19, 18, 17, 13, 8, 4]
-        for i, num in enumerate(outer):
+        for i, num in enumerate(OUTER_NUMS):
             # If num is in the hexes dictionary, that means it was provided to
             # the instance and that a planet is there.
 
@@ -368,7 +722,7 @@ class Sector:
                     pixel_x=pixel_coords[num][0],
                     pixel_y=pixel_coords[num][1]
                 )
-                self.inner.append(new_planet)
+                self.outer.append(new_planet)
                 self.planets.append(new_planet)
                 planet_list.append(new_planet)
             else:
@@ -387,85 +741,37 @@ class Sector:
         self.hexes.append(self.inner)
         self.hexes.append(self.outer)
 
-    def rotate_sector(self, x=1):
-        """Rotate a sector x times.
-
-        TODO:
-            If i ever use rotation, rotate first before creating planet and
-            empty space instances.
-
-        Example:
-
-             1     2     3
-
-          4     5     6     7
-
-        8    9     10    11    12
-
-          13    14    15    16
-
-             17    18    19
-
-        hex_nums = [
-            [10],  # Center
-            [5, 6, 11, 15, 14, 9],  # Inner circle
-            [1, 2, 3, 7, 12, 16, 19, 18, 17, 13, 8, 4]  # Outer circle
-        ]
-
-        universe grid mapping = center sector = [
-            [(8, 13)],
-            [(7, 12), (7, 14), (8, 15), (9, 14), (9, 12), (8, 11)],
-            [(6, 11), (6, 13), (6, 15), (7, 16), (8, 17), (9, 16),
-            (10, 15), (10, 13), (10, 11), (9, 10), (8, 9), (7, 10)]
-        ]
-
-        Moving the last number of the inner circle to the beginning and
-        moving the last 2 numbers of the outer circle to the beginning,
-        completes a rotation.
-
-        hex_nums = [
-            [10],  # Center
-            [9, 5, 6, 11, 15, 14],  # Inner circle
-            [8, 4, 1, 2, 3, 7, 12, 16, 19, 18, 17, 13]  # Outer circle
-        ]
-
-              8     4     1
+        # Where every hex is inside self.hexes.
+        # Hex number: (circle, index inside the circle).
+        self.slots = {}
+        for i, circle in enumerate(self.hexes):
+            for x, hex_ in enumerate(circle):
+                self.slots[hex_.num] = (i, x)
 
-           13    9    5     2
+    def replace_hex(self, old, new):
+        """Put a different object on the hex of an existing one.
 
-        17    14    10    6     3
+        Used for turning a Space into the Lost Planet.
 
-           18    15    11    7
-
-              19    16    12
+        Args:
+            old: Space or Planet object that is currently on the hex.
+            new: Object that takes its place.
         """
 
-        for _ in range(x):
-            self.hexes[1] = self.hexes[1][-1:] + self.hexes[1][:-1]
-            self.hexes[2] = self.hexes[2][-2:] + self.hexes[2][:-2]
-
-            self.universe_grid[1] = (self.universe_grid[1][-1:]
-                            + self.universe_grid[1][:-1])
-            self.universe_grid[2] = (self.universe_grid[2][-2:]
-                            + self.universe_grid[2][:-2])
-
-            self.rotation += 1
-            if self.rotation == 6:
-                self.rotation = 0
+        i, x = self.slots[old.num]
+        self.hexes[i][x] = new
+        if old in self.planets:
+            self.planets.remove(old)
+        if not isinstance(new, Space):
+            self.planets.append(new)
+            self.planets.sort(key=lambda planet: planet.num)
 
     def __str__(self):
-        center = [10]
-        inner = [5, 6, 11, 15, 14, 9]
-        outer = [1, 2, 3, 7, 12, 16, 19, 18, 17, 13, 8, 4]
         output = []
 
         for x in range(1, 20):
-            if x in center:
-                output.append(f"{x}: {str(self.hexes[0][0])}\n")
-            elif x in inner:
-                output.append(f"{x}: {str(self.hexes[1][inner.index(x)])}\n")
-            elif x in outer:
-                output.append(f"{x}: {str(self.hexes[2][outer.index(x)])}\n")
+            i, index = self.slots[x]
+            output.append(f"{x}: {str(self.hexes[i][index])}\n")
 
         return ''.join(output)
 
@@ -473,7 +779,7 @@ class Sector:
 class Universe:
 
     def __init__(self,
-                 screen,
+                 renderer,
                  sector1=('n', 0),
                  sector2=('nw', 0),
                  sector3=('c', 0),
@@ -488,70 +794,29 @@ class Universe:
         """Generate the universe.
 
         Args:
+            renderer: Renderer object that shows the universe.
             sector(x): (location, rotation).
                 location can be n, nw, c, sw (North, North West, Center etc.).
+                The 3 and 4 player map also uses ene, e and ese.
                 rotation can be 0-5.
+                sector8, sector9 and sector10 are False when they are not
+                part of the map.
         """
 
         # List with [[(x, y), Planet], [(x, y), Planet]]
         self.planet_list = []
 
-        # Universe grid tables (left ruler (x), top ruler (y))
-        # Center
-        self.c = [
-            [(8, 13)],
-            [(7, 12), (7, 14), (8, 15), (9, 14), (9, 12), (8, 11)],
-            [(6, 11), (6, 13), (6, 15), (7, 16), (8, 17), (9, 16),
-             (10, 15), (10, 13), (10, 11), (9, 10), (8, 9), (7, 10)]
-        ]
-
-        # North
-        self.n = [
-            [(3, 14)],
-            [(2, 13), (2, 15), (3, 16), (4, 15), (4, 13), (3, 12)],
-            [(1, 12), (1, 14), (1, 16), (2, 17), (3, 18), (4, 17),
-             (5, 16), (5, 14), (5, 12), (4, 11), (3, 10), (2, 11)]
-        ]
-
-        # North East
-        self.ne = [
-            [(6, 21)],
-            [(5, 20), (5, 22), (6, 23), (7, 22), (7, 20), (6, 19)],
-            [(4, 19), (4, 21), (4, 23), (5, 24), (6, 25), (7, 24),
-             (8, 23), (8, 21), (8, 19), (7, 18), (6, 17), (5, 18)]
-        ]
-
-        # South East
-        self.se = [
-            [(11, 20)],
-            [(10, 19), (10, 21), (11, 22), (12, 21), (12, 19), (11, 18)],
-            [(9, 18), (9, 20), (9, 22), (10, 23), (11, 24), (12, 23),
-             (13, 22), (13, 20), (13, 18), (12, 17), (11, 16), (10, 17)]
-        ]
-
-        # South
-        self.s = [
-            [(13, 12)],
-            [(12, 11), (12, 13), (13, 14), (14, 13), (14, 11), (13, 10)],
-            [(11, 10), (11, 12), (11, 14), (12, 15), (13, 16), (14, 15),
-             (15, 14), (15, 12), (15, 10), (14, 9), (13, 8), (12, 9)]
-        ]
-
-        # South West
-        self.sw = [
-            [(10, 5)],
-            [(9, 4), (9, 6), (10, 7), (11, 6), (11, 4), (10, 3)],
-            [(8, 3), (8, 5), (8, 7), (9, 8), (10, 9), (11, 8),
-             (12, 7), (12, 5), (12, 3), (11, 2), (10, 1), (9, 2)]
-        ]
-
-        # North West
-        self.nw = [
-            [(5, 6)],
-            [(4, 5), (4, 7), (5, 8), (6, 7), (6, 5), (5, 4)],
-            [(3, 4), (3, 6), (3, 8), (4, 9), (5, 10), (6, 9),
-             (7, 8), (7, 6), (7, 4), (6, 3), (5, 2), (4, 3)]
-        ]
+        # Universe grid tables with the location of every hex of a sector on
+        # that position. For example self.grid['c'] = [
+        #     [(8, 13)],
+        #     [(7, 12), (7, 14), (8, 15), (9, 14), (9, 12), (8, 11)],
+        #     [(6, 11), (6, 13), (6, 15), (7, 16), (8, 17), (9, 16),
+        #      (10, 15), (10, 13), (10, 11), (9, 10), (8, 9), (7, 10)]
+        # ]
+        self.grid = {
+            position: sector_grid(center)
+            for position, center in CENTERS.items()
+        }
 
         # The center x and y pixel of the sector region for the screen that
         # displays the universe.
@@ -563,170 +828,159 @@ class Universe:
             'ne': (789, 369),
             'se': (752, 695),
             's': (451, 826),
+            'ene': (1089, 238),
+            'e': (1052, 564),
+            'ese': (1015, 890),
         }
 
-        self.sector1 = Sector(
-            hexes = {
-            4: "Desert",
-            5: "Swamp",
-            11: "Terra",
-            16: "Trans-dim",
-            17: "Oxide",
-            18: "Volcanic"
-        },
-            number=1,
-            img=os.path.join(IMAGES, "sector1.png"),
-            universe_grid=eval(f"self.{sector1[0]}"),
-            rotation=sector1[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector1[0]][0],
-            pixel_y = self.center_pixels[sector1[0]][1]
-        )
-
-        self.sector2 = Sector(
-            hexes={
-            2: "Volcanic",
-            3: "Titanium",
-            9: "Swamp",
-            11: "Ice",
-            13: "Oxide",
-            16: "Desert",
-            18: "Trans-dim"
-        },
-            number=2,
-            img=os.path.join(IMAGES, "sector2.png"),
-            universe_grid=eval(f"self.{sector2[0]}"),
-            rotation=sector2[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector2[0]][0],
-            pixel_y = self.center_pixels[sector2[0]][1]
-        )
-
-        self.sector3 = Sector(
-            hexes={
-            3: "Trans-dim",
-            5: "Gaia",
-            13: "Terra",
-            15: 'Ice',
-            16: "Titanium",
-            17: "Desert"
-        },
-            number=3,
-            img=os.path.join(IMAGES, "sector3.png"),
-            universe_grid=eval(f"self.{sector3[0]}"),
-            rotation=sector3[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector3[0]][0],
-            pixel_y = self.center_pixels[sector3[0]][1]
-        )
+        # Sectors 5, 6 and 7 are played on their back side, unless the map
+        # has all 10 sectors.
+        back_side = not (sector8 or sector9 or sector10)
+
+        placements = [
+            sector1,
+            sector2,
+            sector3,
+            sector4,
+            sector5,
+            sector6,
+            sector7,
+            sector8,
+            sector9,
+            sector10,
+        ]
 
-        self.sector4 = Sector(
-            hexes={
-            3: "Titanium",
-            4: "Ice",
-            6: "Oxide",
-            9: "Volcanic",
-            15: "Swamp",
-            19: "Terra"
-        },
-            number=4,
-            img=os.path.join(IMAGES, "sector4.png"),
-            universe_grid=eval(f"self.{sector4[0]}"),
-            rotation=sector4[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector4[0]][0],
-            pixel_y = self.center_pixels[sector4[0]][1]
-        )
+        # Sector registry. Sector number: Sector object.
+        self.sectors = {}
+        # Sector number: (position, rotation).
+        self.layout = {}
+        for number, placement in enumerate(placements, start=1):
+            if not placement:
+                continue
 
-        # CAREFUL THESE ARE THE BACK SIDE!! Possible solution something like
-        # this:
-        # if 2p or something:
-        self.sector5 = Sector(
-            hexes={
-            3: "Ice",
-            5: "Gaia",
-            12: "Trans-dim",
-            13: "Volcanic",
-            16: "Oxide"
-        },
-            number=5,
-            img=os.path.join(IMAGES, "sector5b.png"),
-            universe_grid=eval(f"self.{sector5[0]}"),
-            rotation=sector5[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector5[0]][0],
-            pixel_y = self.center_pixels[sector5[0]][1]
-        )
+            position, rotation = placement
+            self.layout[number] = (position, rotation)
+            if back_side and number in C.SECTORS_BACK:
+                hexes = C.SECTORS_BACK[number]
+                img = f"sector{number}b.png"
+            else:
+                hexes = C.SECTORS[number]
+                img = f"sector{number}.png"
+
+            self.sectors[number] = Sector(
+                hexes=hexes,
+                number=number,
+                img=os.path.join(IMAGES, img),
+                universe_grid=self.grid[position],
+                rotation=rotation,
+                planet_list=self.planet_list,
+                pixel_x=self.center_pixels[position][0],
+                pixel_y=self.center_pixels[position][1],
+                position=position
+            )
 
-        # else:
-        # self.sector5 = Sector(
-        #     hexes={
-        #     3: "Ice",
-        #     5: "Gaia",
-        #     12: "Trans-dim",
-        #     13: "Volcanic",
-        #     16: "Oxide"
-        # },
-        # number="sector5",
-        # img=os.path.join(IMAGES, "sector5.png"),
-        #     universe_grid=eval(f"self.{sector5[0]}"),
-        #     rotation=sector5[1],
-        #     planet_list=self.planet_list,
-        #     pixel_x = self.center_pixels[sector5[0]][0],
-        #     pixel_y = self.center_pixels[sector5[0]][1]
-        # )
-
-        # CAREFUL THESE ARE THE BACK SIDE!!
-        self.sector6 = Sector(
-            hexes={
-            7: "Trans-dim",
-            11: "Terra",
-            14: "Gaia",
-            18: "Trans-dim",
-            19: "Desert"
-        },
-            number=6,
-            img=os.path.join(IMAGES, "sector6b.png"),
-            universe_grid=eval(f"self.{sector6[0]}"),
-            rotation=sector6[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector6[0]][0],
-            pixel_y = self.center_pixels[sector6[0]][1]
-        )
+        # Secondary indexes for finding planets by owner, type etc.
+        self.index = PlanetIndex()
+        for planet in self.planet_list:
+            self.index.add(planet)
 
-        # CAREFUL THESE ARE THE BACK SIDE!!
-        self.sector7 = Sector(
-            hexes={
-            1: "Trans-dim",
-            6: "Gaia",
-            9: "Gaia",
-            15: "Swamp",
-            17: "Titanium"
-        },
-            number=7,
-            img=os.path.join(IMAGES, "sector7b.png"),
-            universe_grid=eval(f"self.{sector7[0]}"),
-            rotation=sector7[1],
-            planet_list=self.planet_list,
-            pixel_x = self.center_pixels[sector7[0]][0],
-            pixel_y = self.center_pixels[sector7[0]][1]
-        )
+        # This property is set right after the distance table is built.
+        self.board = False
 
         self.sort_planets()
-        # self.generate()
+        self.build_distance_table()
+        self.build_ring_index()
+
+        # Array version of the board for vectorized queries.
+        if Board:
+            self.board = Board(self)
+        self.federation_solver = FederationSolver(self)
+
+        # The default 2 player map is shipped with the game. Other maps are
+        # stitched together the first time they are needed and kept in the
+        # map cache.
+        default_map = os.path.join(ROOT, "default_2p_map.png")
+        if self.layout == DEFAULT_2P_LAYOUT and os.path.exists(default_map):
+            self.map_path = default_map
+        else:
+            self.map_path = os.path.join(MAP_CACHE, f"{self.map_key()}.png")
+        # A headless renderer doesn't show the map, so don't make it either.
+        self.renderer = renderer
+        if not renderer.headless and not os.path.exists(self.map_path):
+            self.generate()
 
         # Draw the generated universe on the screen.
-        background = pygame.image.load("default_2p_map.png").convert_alpha()
-        screen.blit(background, (0, 0))
+        renderer.set_board_size(self.map_size())
+        renderer.draw_image(self.map_path, (0, 0))
 
         # Draw a colour wheel in the bottom left as a reminder.
         # color_wheel = pygame.image.load("default_2p_map.png").convert_alpha()
         # screen.blit(color_wheel, (0, 0))
 
 
+    def map_size(self):
+        """Size of the map image in pixels.
+
+        For the 2 player map it's 978, 1000 (width, length), maps with more
+        sectors are bigger.
+
+        Returns:
+            (width, height) of the map.
+        """
+
+        corners = [
+            SECTOR_CORNERS[sector.position] for sector in self.sectors.values()
+        ]
+        return (
+            max(x for x, y in corners) + SECTOR_SIZE[0],
+            max(y for x, y in corners) + SECTOR_SIZE[1],
+        )
+
+    def map_key(self):
+        """Name of the map image of this universe in the map cache.
+
+        Two universes get the same name when the same sector images are on
+        the same positions with the same rotations. An image counts as
+        changed when its size or modification time changed.
+
+        Returns:
+            Hexadecimal hash as a string.
+        """
+
+        parts = []
+        for number, sector in sorted(self.sectors.items()):
+            stat = os.stat(sector.img)
+            parts.append((
+                number,
+                os.path.basename(sector.img),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sector.position,
+                sector.rotation,
+            ))
+        return hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+    def add_frontier(self, faction_name):
+        """Start keeping track of the planets within reach of a faction.
+
+        Args:
+            faction_name (str): Name of the faction of the player.
+
+        Returns:
+            The Frontier object of the faction.
+        """
+
+        frontier = Frontier(self, faction_name)
+        self.index.listeners.append(frontier.planet_changed)
+        return frontier
+
     def sort_planets(self, lost_planet=False):
         if lost_planet:
             self.planet_list.append(lost_planet)
+            if self.board:
+                self.board.attach(lost_planet)
+            self.index.add(lost_planet)
+            self.add_to_ring_index(lost_planet)
 
         # Sort the planet_list in order of x and than y.
         self.planet_list.sort(
@@ -737,71 +991,98 @@ class Universe:
         # are sorted, insert them in order for directional selection.
         self.planets = {planet.location: planet for planet in self.planet_list}
 
+        # Position of every planet in directional selection order.
+        self.rank = {planet: i for i, planet in enumerate(self.planet_list)}
+
+    def directional_selection(self, candidates, direction):
+        """Pick one planet with the Automa's directional selection.
+
+        Planets are ordered by their universe grid location, which is the
+        same order as self.planets.
+
+        Args:
+            candidates (list): Planet objects to choose from.
+            direction (str): Direction on the support card. "left" picks the
+                last planet in the order and "right" the first.
+
+        Returns:
+            The selected Planet object.
+        """
+
+        if direction == "left":
+            return max(candidates, key=self.rank.__getitem__)
+        return min(candidates, key=self.rank.__getitem__)
+
+    @stats.timed("Universe.generate")
     def generate(self):
         """Assemble the universe into an image."""
 
-        self.universe = "default_2p_map"
-
-        pos = {
-            'c': (301, 326),  # Center
-            'n': (339, 0),  # North
-            'ne': (602, 196),  # North East
-            'se': (564, 522),  # South East
-            's': (263, 652),  # South
-            'sw': (0, 456),  # South West
-            'nw': (38, 130)  # North West
-        }
+        # Only needed when the universe is shown, so a headless game doesn't
+        # need PIL.
+        from PIL import Image
 
         # TODO find better way to do this, maybe don't have the images open in
         # the sector and open them here somehow. Also figure out exactly how to
         # generate the map when it's not the default after everything works
         # with the default.
 
-        # Stitching together the tiles to form the map for 2 players.
-        # (width, height)
-        map_ = Image.new("RGBA", (978, 1000), "white")
+        map_ = Image.new("RGBA", self.map_size(), "white")
 
-        with (
-            Image.open(self.sector1.img) as s1,
-            Image.open(self.sector2.img) as s2,
-            Image.open(self.sector3.img) as s3,
-            Image.open(self.sector4.img) as s4,
-            Image.open(self.sector5.img) as s5,
-            Image.open(self.sector6.img) as s6,
-            Image.open(self.sector7.img) as s7
-        ):
-
-            # Canvas size is 978, 1000 (width, length)
-            # Sector size is 376, 348 (width, length)
-
-            # Center (301, 326)
-            map_.paste(s3, (301, 326), s3)
-
-            # North (339, 0)
-            map_.paste(s1, (339, 0), s1)
-
-            # North East (602, 196)
-            map_.paste(s5, (602, 196), s5)
+        # Stitching together the tiles to form the map.
+        for sector in self.sectors.values():
+            with Image.open(sector.img) as tile:
+                # PIL rotates counterclockwise and the hexes of a Sector are
+                # rotated clockwise.
+                if sector.rotation:
+                    tile = tile.rotate(
+                        -60 * sector.rotation, resample=Image.BICUBIC
+                    )
+                map_.paste(tile, SECTOR_CORNERS[sector.position], tile)
 
-            # South East (564, 522)
-            map_.paste(s6, (564, 522), s6)
+        # Different games can stitch the same map at the same time. Every
+        # one of them writes its own temporary file, so the map in the cache
+        # is always complete.
+        os.makedirs(os.path.dirname(self.map_path), exist_ok=True)
+        assets.write_atomic(self.map_path, map_.save, "png")
+        self.renderer.forget_image(self.map_path)
 
-            # South (263, 652)
-            map_.paste(s7, (263, 652), s7)
+    def image_paths(self, home_types=C.HOME_TYPES):
+        """Paths of all the images the universe can draw during the game.
 
-            # South West (0, 456)
-            map_.paste(s4, (0, 456), s4)
+        Args:
+            home_types (list): Home types of the factions that can play.
 
-            # North West (38, 130)
-            map_.paste(s2, (38, 130), s2)
+        Returns:
+            List with the paths to the image files.
+        """
 
-            map_.save("default_2p_map.png", "png")
+        misc = os.path.join(IMAGES, "Miscellaneous")
+        paths = [
+            self.map_path,
+            os.path.join(misc, "Gaia Planet.png"),
+            os.path.join(misc, "Lost Planet.png"),
+        ]
+        for place in [
+            "Mine",
+            "Trading Station",
+            "Research Lab",
+            "Academy",
+            "Planetary Institute",
+            "Gaiaformer",
+            "Satellite",
+        ]:
+            for home_type in home_types:
+                paths.append(
+                    os.path.join(IMAGES, place, f"{home_type} {place}.png")
+                )
+        return paths
 
-    def place_structure(self, screen, planet, home_type, place):
+    @stats.timed("Universe.place_structure")
+    def place_structure(self, renderer, planet, home_type, place):
         """Place structure image on the screen.
 
         Args:
-            screen: pygame display.
+            renderer: Renderer object that shows the universe.
             planet: Planet object to display the structure on.
             home_type (str): home type of the player's faction to determine
                 the colour of the structure.
@@ -810,10 +1091,6 @@ class Universe:
 
         # First remove the old structure if applicable.
         if place not in ["Mine", "Gaiaformer"]:
-            background = pygame.image.load(
-                os.path.join(ROOT, "default_2p_map.png")
-            ).convert_alpha()
-
             planet_x = planet.pixel_x
             planet_y = planet.pixel_y
 
@@ -821,8 +1098,8 @@ class Universe:
             img_y = C.PLACE[planet.structure][1]
 
             # Blit the background over the area the old building was taking up.
-            screen.blit(
-                background,
+            renderer.draw_image(
+                self.map_path,
                 (planet_x - img_x // 2, planet_y - img_y // 2),
                 (planet_x - img_x // 2, planet_y - img_y // 2, img_x, img_y)
             )
@@ -830,31 +1107,164 @@ class Universe:
         # If the planet was gaiaformed, the background will contain the
         # Trans-dim planet, so place a Gaia Planet again first.
         if planet.gaiaformed:
-            self.place_gaia_planet(screen, planet)
+            self.place_gaia_planet(renderer, planet)
 
         # Place the new structure
         img_dir = os.path.join(IMAGES, place)
         img_path = os.path.join(img_dir, f"{home_type} {place}.png")
 
-        structure = pygame.image.load(img_path).convert_alpha()
         x = planet.pixel_x - C.PLACE[place][0] // 2
         y = planet.pixel_y - C.PLACE[place][1] // 2
 
-        screen.blit(structure, (x, y))
+        renderer.draw_image(img_path, (x, y))
+
+    def redraw(self, renderer, players):
+        """Draw the map and everything on it again.
 
-    def place_gaia_planet(self, screen, planet):
+        Used after undoing turns, the screen still shows what was undone.
+
+        Args:
+            renderer: Renderer object that shows the universe.
+            players (list): Player and Automa objects, for the colours.
+        """
+
+        home_types = {
+            player.faction.name: player.faction.home_type
+            for player in players
+        }
+        renderer.draw_image(self.map_path, (0, 0))
+
+        misc = os.path.join(IMAGES, "Miscellaneous")
+        for planet in self.planet_list:
+            if planet.type == "Lost Planet":
+                x = planet.pixel_x - C.PLACE["Lost Planet"][0] // 2
+                y = planet.pixel_y - C.PLACE["Lost Planet"][1] // 2
+                renderer.draw_image(
+                    os.path.join(misc, "Lost Planet.png"), (x, y)
+                )
+            elif planet.type == "Gaia" and planet.gaiaformed:
+                self.place_gaia_planet(renderer, planet)
+
+            if planet.structure and planet.owner:
+                self.place_structure(
+                    renderer,
+                    planet,
+                    home_types[planet.owner],
+                    planet.structure
+                )
+
+        for sector in self.sectors.values():
+            for circle in sector.hexes:
+                for hex_ in circle:
+                    if isinstance(hex_, Space):
+                        for home_type in hex_.satellites:
+                            self.place_satellite(renderer, hex_, home_type)
+
+    @stats.timed("Universe.place_gaia_planet")
+    def place_gaia_planet(self, renderer, planet):
         # Place the Gaia Planet over the Trans-dim planet.
         img_dir = os.path.join(IMAGES, "Miscellaneous")
         img_path = os.path.join(img_dir, "Gaia Planet.png")
 
-        gaia_planet = pygame.image.load(img_path).convert_alpha()
         x = planet.pixel_x - C.PLACE["Gaia Planet"][0] // 2
         y = planet.pixel_y - C.PLACE["Gaia Planet"][1] // 2
 
-        screen.blit(gaia_planet, (x, y))
+        renderer.draw_image(img_path, (x, y))
+
+    @stats.timed("Universe.place_satellite")
+    def place_satellite(self, renderer, space, home_type):
+        """Place a satellite image on the screen.
+
+        Args:
+            renderer: Renderer object that shows the universe.
+            space: Space object the satellite is placed on.
+            home_type (str): home type of the player's faction to determine
+                the colour of the satellite.
+        """
+
+        img_dir = os.path.join(IMAGES, "Satellite")
+        img_path = os.path.join(img_dir, f"{home_type} Satellite.png")
+
+        x = space.pixel_x - C.PLACE["Satellite"][0] // 2
+        y = space.pixel_y - C.PLACE["Satellite"][1] // 2
+
+        renderer.draw_image(img_path, (x, y))
+
+    def build_distance_table(self):
+        """Precompute the distance between every pair of hexes.
+
+        Every hex of every sector gets a dense index in self.hex_index and
+        self.distances[i][j] is the distance between hex i and hex j. This
+        way every distance question during the game is a single lookup.
+        """
+
+        # Dense list of the locations of all the hexes in the universe.
+        self.hex_locations = []
+        for sector in self.sectors.values():
+            for circle in sector.hexes:
+                for hex_ in circle:
+                    self.hex_locations.append(hex_.location)
+
+        self.hex_index = {
+            location: i for i, location in enumerate(self.hex_locations)
+        }
+
+        self.distances = [
+            [hex_distance(start, target) for target in self.hex_locations]
+            for start in self.hex_locations
+        ]
+
+    def build_ring_index(self):
+        """Precompute which planets are around every hex.
+
+        self.rings[location][d] is a list of the planets that are at exactly
+        distance d of the hex at location. Spaces are left out so looking for
+        planets within a certain range only visits hexes that hold a planet.
+        The rings go all the way to the edge of the universe, so they cover
+        any navigation range plus whatever range is bought with Q.I.C.'s.
+        """
+
+        self.rings = {}
+        for i, location in enumerate(self.hex_locations):
+            row = self.distances[i]
+            rings = [[] for _ in range(max(row) + 1)]
+
+            # self.planet_list is sorted on location so every ring is too.
+            for planet in self.planet_list:
+                rings[row[self.hex_index[planet.location]]].append(planet)
+            self.rings[location] = rings
+
+    def add_to_ring_index(self, planet):
+        """Add a planet that is placed during the game to the ring index.
+
+        Args:
+            planet: Planet object that now sits on a former Space (the Lost
+                Planet).
+        """
+
+        row = self.distances[self.hex_index[planet.location]]
+        for location, rings in self.rings.items():
+            ring = rings[row[self.hex_index[location]]]
+            ring.append(planet)
+            ring.sort(key=lambda planet: planet.location)
+
+    def planets_within(self, location, max_range):
+        """Iterate over all the planets within range of a hex.
+
+        Args:
+            location (tuple): (x, y) of the hex in the middle.
+            max_range (int): Maximum distance from the hex.
+
+        Yields:
+            Planet objects from the nearest ring outwards. The planet on the
+            hex itself (distance 0) is not included.
+        """
+
+        for ring in self.rings[location][1:max_range + 1]:
+            yield from ring
 
     def distance(self, startx, starty, targetx, targety):
-        """Using the universe grid to calculate distance between two planets.
+        """Look up the distance between two hexes.
 
         See the file -- Universe grid.png -- for an example of the coordinates.
 
@@ -868,52 +1278,40 @@ class Universe:
             An integer that is the distance between the two planets
         """
 
-        traversex = startx
-        traversey = starty
+        start = self.hex_index.get((startx, starty))
+        target = self.hex_index.get((targetx, targety))
 
-        distance = 0
-        # Keep going until the target planet has been reached.
-        while traversex != targetx or traversey != targety:
+        # Coordinates outside of the universe aren't in the table so calculate
+        # those directly.
+        if start is None or target is None:
+            return hex_distance((startx, starty), (targetx, targety))
+        return self.distances[start][target]
 
-            # If the traversal is now on the same horizontal line as the
-            # target, only keep traversing horizontally. Move horizontally in
-            # steps of 2 because of how the grid works.
-            if traversex == targetx:
-                if traversey > targety:
-                    traversey -= 2
-                    distance += 1
-                    continue
-                else:
-                    traversey += 2
-                    distance += 1
-                    continue
-
-            # If the traversal is now on the same vertical line as the target,
-            # only keep traversing vertically. Move vertically in steps of 1
-            # because of how the grid works.
-            elif traversey == targety:
-                if traversex > targetx:
-                    traversex -= 1
-                    distance += 1
-                    continue
-                else:
-                    traversex += 1
-                    distance += 1
-                    continue
+    def action_types(self, player, action):
+        """Planet types that can be chosen for an action.
 
-            if traversex > targetx:
-                traversex -= 1
-            else:
-                traversex += 1
+        Args:
+            player: Player object.
+            action (str): Name of the action, see self.valid_planets.
 
-            if traversey > targety:
-                traversey -= 1
-            else:
-                traversey += 1
+        Returns:
+            List with the planet types.
+        """
 
-            distance += 1
-        else:
-            return distance
+        if action == "start_mine":
+            return [player.faction.home_type]
+        elif action == "mine":
+            return C.MINE_TYPES
+        elif action == "pq" or action == "boost_terraform":
+            # When gaining terraforming steps i think you are not allowed to
+            # build on gaia planets so it will be like that.
+            return C.HOME_TYPES
+        elif action == "automa_mine" or action == "boost_range":
+            return C.PLANETS
+        elif action == "upgrade":
+            return [player.faction.home_type]
+        elif action == "gaia":
+            return ["Trans-dim"]
 
     def valid_planets(self, player, sector, action):
         """
@@ -926,35 +1324,31 @@ class Universe:
             action (str): Name of the action to check valid planets for.
         """
 
-        if action == "start_mine":
-            types = [player.faction.home_type]
-        elif action == "mine":
-            types = C.MINE_TYPES
-        elif action == "pq" or action == "boost_terraform":
-            # When gaining terraforming steps i think you are not allowed to
-            # build on gaia planets so it will be like that.
-            types = C.HOME_TYPES
-        elif action == "automa_mine" or action == "boost_range":
-            types = C.PLANETS
-        elif action == "upgrade":
-            types = [player.faction.home_type]
-        elif action == "gaia":
-            types = ["Trans-dim"]
+        types = self.action_types(player, action)
+
+        if self.board:
+            planets = self.board.valid_planets(
+                player.faction.name, sector, types, free=action != "upgrade"
+            )
+            if not planets:
+                raise e.NoValidMinePlanetsError(types, action)
+            return sorted(planets, key=lambda planet: planet.num)
 
         # Filter out unnecessary planets.
-        planets = []
-        for planet in eval(f"self.sector{sector}.planets"):
-            if planet.type in types:
-                if not planet.owner \
-                        or planet.owner == player.faction.name \
-                        and planet.structure == "Gaiaformer" \
-                        or action == "upgrade":
-                    planets.append(planet)
+        planets = self.index.query(sector=sector, type_=types)
+        if action != "upgrade":
+            planets = (
+                planets & self.index.query(owner=False)
+                | planets & self.index.query(
+                    owner=player.faction.name, structure="Gaiaformer"
+                )
+            )
 
         if not planets:
             raise e.NoValidMinePlanetsError(types, action)
 
-        return planets
+        # Sort the planets based on their num.
+        return sorted(planets, key=lambda planet: planet.num)
 
     def valid_spaces(self, player, sector):
         """Return a list of valid planets for placing the Lost Planet.
@@ -965,7 +1359,7 @@ class Universe:
         """
 
         spaces = []
-        for circle in eval(f"self.sector{sector}.hexes"):
+        for circle in self.sectors[sector].hexes:
             for hex_ in circle:
                 if not isinstance(hex_, Space):
                     continue
@@ -1009,51 +1403,16 @@ class Universe:
         # highest power value they may charge.
         neighbours = {}
 
-        start_x = planet_to_check.location[0]
-        start_y = planet_to_check.location[1]
-
-        # Coordinates to check.
-        coords = [
-            # First ring.
-            (start_x, start_y - 2),
-            (start_x - 1, start_y - 1),
-            (start_x - 1, start_y + 1),
-            (start_x, start_y + 2),
-            (start_x + 1, start_y + 1),
-            (start_x + 1, start_y - 1),
-
-            # Second ring.
-            (start_x, start_y - 4),
-            (start_x - 1, start_y - 3),
-            (start_x - 2, start_y - 2),
-            (start_x - 2, start_y),
-            (start_x - 2, start_y + 2),
-            (start_x - 1, start_y + 3),
-            (start_x, start_y + 4),
-            (start_x + 1, start_y + 3),
-            (start_x + 2, start_y + 2),
-            (start_x + 2, start_y),
-            (start_x + 2, start_y - 2),
-            (start_x + 1, start_y - 3),
-        ]
-
-        for location in coords:
-            # Coordinate is a Space or is outside of the universe.
-            if not location in self.planets:
-                continue
-
+        for planet in self.planets_within(planet_to_check.location, 2):
             # Planet belongs to no one or to the active player or has a
             # gaiaformer on it.
-            if not self.planets[location].owner \
-                    or self.planets[location].owner \
-                        == active_player.faction.name \
-                    or self.planets[location].structure == "Gaiaformer":
+            if not planet.owner \
+                    or planet.owner == active_player.faction.name \
+                    or planet.structure == "Gaiaformer":
                 continue
 
-            # Opponent that is a neighbour is found.
-            planet = self.planets[location]
-
-            # Add the active player to the list of neighbours of the planet.
+            # Opponent that is a neighbour is found. Add the active player to
+            # the list of neighbours of the planet.
             if not active_player in planet.neighbours:
                 planet.neighbours.append(active_player)
 
@@ -1117,7 +1476,7 @@ class Universe:
             f"Power in bowl 3: {charging_player.faction.bowl3}"
         )
         while True:
-            charge_chosen = input("--> ").lower()
+            charge_chosen = decisions.yes_no().lower()
 
             if not charge_chosen in ['y', 'n']:
                 print("! Please type Y for yes or N for no.")
@@ -0,0 +1,383 @@
+import math
+import threading
+import time
+
+import pygame
+
+import assets
+from render import Renderer
+from stats import stats
+
+# Event that wakes up the main loop when there is something to draw.
+REDRAW = pygame.USEREVENT + 1
+
+# Event that comes every STATS_INTERVAL milliseconds while the statistics
+# are shown or written.
+STATS = pygame.USEREVENT + 2
+STATS_INTERVAL = 1000
+
+# Highest amount of times per second the main loop draws.
+FPS = 60
+
+# Size of the 2 player universe map in pixels, the board size until the
+# universe tells the renderer the size of its map (Universe.map_size). All
+# the pixel coordinates of the game (Universe.center_pixels, constants.PLACE
+# etc.) are board pixels.
+BOARD_SIZE = (978, 1000)
+
+# Zoom levels of the sprite pyramid. The window uses the largest level at
+# which the whole board fits, so every image is only scaled once per level.
+ZOOM_LEVELS = [0.25, 0.5, 0.75, 1, 1.25, 1.5, 2, 2.5, 3, 4]
+
+
+class DrawImage:
+    """Command to draw (a part of) an image of the universe.
+
+    dest and area are in board pixels, the renderer turns them into window
+    pixels when the command is executed.
+    """
+
+    def __init__(self, renderer, path, dest, area=None):
+        self.renderer = renderer  # PygameRenderer that draws the image.
+        self.path = path  # Path to the image file.
+        self.dest = dest  # (x, y) position on the board.
+        self.area = area  # Optional part of the image to draw.
+
+    def draw(self):
+        """Execute the command.
+
+        Returns:
+            The changed area of the screen as a pygame Rect.
+        """
+
+        return self.renderer.blit_image(self.path, self.dest, self.area)
+
+
+class ForgetImage:
+    """Command to drop an image that was rewritten from the surface cache.
+
+    It goes through the queue as well, so the cache is only ever used by
+    the main thread.
+    """
+
+    def __init__(self, path):
+        self.path = path  # Path to the image file.
+
+    def draw(self):
+        assets.surfaces.forget(self.path)
+        return None
+
+
+class BoardSize:
+    """Command to fit a board of another size in the window."""
+
+    def __init__(self, renderer, size):
+        self.renderer = renderer  # PygameRenderer of the window.
+        self.size = size  # (width, height) of the board in pixels.
+
+    def draw(self):
+        renderer = self.renderer
+        if renderer.board_size == self.size:
+            return None
+
+        renderer.board_size = self.size
+        renderer.transform = Transform(renderer.screen.get_size(), self.size)
+        return renderer.screen.fill((0, 0, 0))
+
+
+class Preload:
+    """Command to put decoded images in the surface cache.
+
+    The images are converted and scaled to the zoom level of the window, so
+    drawing them for the first time is as fast as every other time.
+    """
+
+    def __init__(self, renderer, paths):
+        self.renderer = renderer  # PygameRenderer the images are for.
+        self.paths = paths  # Paths to the image files.
+
+    def draw(self):
+        for path in self.paths:
+            assets.surfaces.load(path, self.renderer.transform.zoom)
+        return None
+
+
+class CommandQueue:
+    """Draw commands from the game thread waiting for the display thread.
+
+    The game logic runs on its own thread and never touches the screen
+    itself. It puts commands in this queue instead and the main loop, which
+    owns the screen, executes all waiting commands at once and then pushes
+    only the changed areas to the display. Putting a command in an empty
+    queue posts a REDRAW event, so the main loop can sleep in
+    pygame.event.wait() until there is something to draw.
+    """
+
+    def __init__(self):
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def put(self, command):
+        """Add a command and wake up the main loop.
+
+        Args:
+            command: DrawImage object or anything else with a draw method.
+        """
+
+        with self.lock:
+            wake = not self.commands
+            self.commands.append(command)
+
+        # One REDRAW event is enough for everything added before the main
+        # loop takes the commands.
+        if wake and pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(REDRAW))
+
+    def take(self):
+        """Get all waiting commands and start over with an empty queue."""
+
+        with self.lock:
+            commands, self.commands = self.commands, []
+        return commands
+
+    def flush(self):
+        """Execute all waiting commands. Only call this from the main thread.
+
+        Returns:
+            List with the changed areas as pygame Rects.
+        """
+
+        rects = [command.draw() for command in self.take()]
+        return [rect for rect in rects if rect]
+
+
+# Draw commands for the game screen.
+queue = CommandQueue()
+
+
+class Transform:
+    """Mapping from board pixels to window pixels.
+
+    window pixel = board pixel * zoom + offset. It only changes when the
+    window is resized.
+    """
+
+    def __init__(self, window_size, board_size=BOARD_SIZE):
+        """Pick the zoom level for a window size.
+
+        Args:
+            window_size: (width, height) of the window in pixels.
+            board_size: (width, height) of the board in pixels.
+        """
+
+        width, height = window_size
+        board_width, board_height = board_size
+        fit = min(width / board_width, height / board_height)
+        fitting = [zoom for zoom in ZOOM_LEVELS if zoom <= fit]
+        self.zoom = fitting[-1] if fitting else ZOOM_LEVELS[0]
+
+        # Put the board in the middle of the window.
+        self.offset_x = (width - round(board_width * self.zoom)) // 2
+        self.offset_y = (height - round(board_height * self.zoom)) // 2
+
+    def point(self, x, y):
+        """Window pixel of the top left corner of a board pixel."""
+
+        return (
+            math.floor(x * self.zoom) + self.offset_x,
+            math.floor(y * self.zoom) + self.offset_y,
+        )
+
+    def rect(self, x, y, width, height):
+        """Smallest rectangle of window pixels that covers board pixels.
+
+        Returns:
+            (x, y, width, height) without the offset, so it can be used for
+            a part of a scaled image as well.
+        """
+
+        left = math.floor(x * self.zoom)
+        top = math.floor(y * self.zoom)
+        right = math.ceil((x + width) * self.zoom)
+        bottom = math.ceil((y + height) * self.zoom)
+        return left, top, right - left, bottom - top
+
+
+class PygameRenderer(Renderer):
+    """Renderer that shows the universe in the pygame window.
+
+    The game thread only puts commands in the queue. The main loop executes
+    them, which loads the images through the surface cache at the zoom level
+    of the window and draws them. Every executed command is remembered, so
+    the board can be drawn again at another zoom level after the window is
+    resized.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen  # pygame display.
+        self.board_size = BOARD_SIZE  # (width, height) of the map in pixels.
+        self.transform = Transform(screen.get_size(), self.board_size)
+
+        # DrawImage commands in the order they were drawn.
+        self.drawn = []
+
+    def draw_image(self, path, dest, area=None):
+        queue.put(DrawImage(self, path, dest, area))
+
+    def set_board_size(self, size):
+        queue.put(BoardSize(self, size))
+
+    def forget_image(self, path):
+        queue.put(ForgetImage(path))
+
+    def preload(self, paths):
+        """Decode images on a worker thread.
+
+        The main loop converts them once they are all decoded, which happens
+        while the game is waiting for the players during the setup.
+
+        Args:
+            paths (list): Paths to the image files.
+        """
+
+        def decode():
+            for path in paths:
+                assets.surfaces.decode(path)
+            queue.put(Preload(self, paths))
+
+        threading.Thread(target=decode, daemon=True).start()
+
+    def blit_image(self, path, dest, area=None):
+        """Draw an image on the screen. Only call this from the main thread.
+
+        Args:
+            path (str): Path to the image file.
+            dest: (x, y) position in board pixels.
+            area: Optional (x, y, width, height) part of the image in board
+                pixels.
+
+        Returns:
+            The changed area of the screen as a pygame Rect.
+        """
+
+        # The map covers everything that was drawn before.
+        if dest == (0, 0) and area is None:
+            self.drawn.clear()
+        self.drawn.append(DrawImage(self, path, dest, area))
+
+        transform = self.transform
+        start = time.perf_counter()
+        surface = assets.surfaces.load(path, transform.zoom)
+        loaded = time.perf_counter()
+        if area:
+            area = transform.rect(*area)
+        rect = self.screen.blit(surface, transform.point(*dest), area)
+
+        stats.record("asset load", loaded - start)
+        stats.record("blit", time.perf_counter() - loaded)
+        stats.count_blit()
+        return rect
+
+    def resize(self, screen):
+        """Draw everything again for a new window size.
+
+        Args:
+            screen: pygame display with the new size.
+        """
+
+        self.screen = screen
+        self.transform = Transform(screen.get_size(), self.board_size)
+
+        drawn, self.drawn = self.drawn, []
+        screen.fill((0, 0, 0))
+        for command in drawn:
+            command.draw()
+
+
+class Overlay:
+    """Box with the render statistics in the top left of the window.
+
+    The part of the screen under the box is kept, so the box can be removed
+    again before anything else is drawn.
+    """
+
+    def __init__(self):
+        self.visible = False
+
+        # (Rect, Surface) with the part of the screen under the box.
+        self.under = False
+
+        # This property is set the first time the box is drawn.
+        self.font = False
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def erase(self, screen):
+        """Put back what was under the box.
+
+        Returns:
+            List with the changed area.
+        """
+
+        if not self.under:
+            return []
+
+        rect, under = self.under
+        self.under = False
+        return [screen.blit(under, rect)]
+
+    def forget(self):
+        """Forget what was under the box, because the screen was redrawn."""
+
+        self.under = False
+
+    def draw(self, screen):
+        """Draw the box if it's visible.
+
+        Returns:
+            List with the changed area.
+        """
+
+        if not self.visible:
+            return []
+
+        if not self.font:
+            self.font = pygame.font.Font(None, 20)
+
+        texts = [
+            self.font.render(line, True, (255, 255, 255))
+            for line in stats.lines()
+        ]
+        width = max(text.get_width() for text in texts) + 10
+        height = sum(text.get_height() for text in texts) + 10
+        rect = pygame.Rect(0, 0, width, height).clip(screen.get_rect())
+
+        self.under = (rect, screen.subsurface(rect).copy())
+        screen.fill((0, 0, 0), rect)
+        y = 5
+        for text in texts:
+            screen.blit(text, (5, y))
+            y += text.get_height()
+        return [rect]
+
+
+def draw_frame(overlay, screen):
+    """Execute the waiting commands and push the changed areas.
+
+    Args:
+        overlay: Overlay object.
+        screen: pygame display.
+
+    Returns:
+        List with the changed areas as pygame Rects.
+    """
+
+    start = time.perf_counter()
+    rects = overlay.erase(screen)
+    rects += queue.flush()
+    if rects or overlay.visible:
+        rects += overlay.draw(screen)
+        pygame.display.update(rects)
+        stats.end_frame(time.perf_counter() - start, len(rects))
+    return rects